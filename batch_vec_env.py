@@ -0,0 +1,51 @@
+from stable_baselines3.common.vec_env import VecEnv
+
+# Base común de los VecEnv nativos (RouletteVecEnv, ConnectFourVecEnv, PongVecEnv). En
+# todos ellos un solo objeto simula los num_envs entornos con arrays de NumPy, así que
+# los métodos de VecEnv que piden atributos, métodos o wrappers de cada entorno se
+# resuelven aquí sobre ese objeto. Los arrays con una fila por entorno (env_arrays) se
+# leen y escriben por índice; el resto de atributos es común a todos los entornos y
+# solo se puede cambiar en todos a la vez.
+
+
+class BatchVecEnv(VecEnv):
+    """
+    VecEnv cuyos entornos viven todos en el mismo objeto.
+    """
+    # Atributos que son arrays con una fila por entorno (saldo, tablero, puntos...)
+    env_arrays = ()
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        value = getattr(self, attr_name)
+        indices = self._get_indices(indices)
+        if attr_name in self.env_arrays:
+            return [value[i] for i in indices]
+        return [value] * len(indices)
+
+    def set_attr(self, attr_name, value, indices=None):
+        indices = self._get_indices(indices)
+        if attr_name in self.env_arrays:
+            getattr(self, attr_name)[list(indices)] = value
+        elif set(indices) == set(range(self.num_envs)):
+            setattr(self, attr_name, value)
+        else:
+            raise ValueError(f"{attr_name} es común a todos los entornos de {type(self).__name__}: "
+                             f"solo se puede cambiar en todos a la vez")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        # Todos los entornos comparten el mismo objeto: el método se llama una sola vez
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(self._get_indices(indices))
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._get_indices(indices))
+
+    def _get_indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
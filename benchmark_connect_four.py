@@ -0,0 +1,97 @@
+import argparse
+import time
+import numpy as np
+
+from connect_four_env import ConnectFourEnv
+from connect_four_bitboard import BitBoard, COLS
+
+# Benchmark y verificación del motor de bitboards de Cuatro en Raya.
+#  - perft: cuenta las posiciones alcanzables a cada profundidad (sin seguir
+#    jugando tras una victoria) con el tablero NumPy original y con el BitBoard.
+#  - cruce: juega partidas aleatorias con los dos motores en paralelo y comprueba
+#    que observaciones, recompensas, fin de partida y ganador coinciden siempre.
+
+
+def perft_bitboard(bitboard, depth, player):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for col in range(COLS):
+        if bitboard.can_play(col):
+            bitboard.play(col, player)
+            if bitboard.is_win(player) or depth == 1:
+                nodes += 1
+            else:
+                nodes += perft_bitboard(bitboard, depth - 1, -player)
+            bitboard.undo(col, player)
+    return nodes
+
+
+def perft_array(env, depth, player):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for col in range(COLS):
+        if env._is_valid_location(col):
+            row = env._get_next_open_row(col)
+            env.board[row][col] = player
+            if env._is_winning_move(player) or depth == 1:
+                nodes += 1
+            else:
+                nodes += perft_array(env, depth - 1, -player)
+            env.board[row][col] = 0
+    return nodes
+
+
+def run_perft(max_depth):
+    print(f"{'prof.':>5} | {'posiciones':>10} | {'NumPy (nodos/s)':>16} | {'BitBoard (nodos/s)':>19} | {'mejora':>7}")
+    print("-" * 70)
+    for depth in range(1, max_depth + 1):
+        env = ConnectFourEnv()
+        env.reset()
+        start = time.perf_counter()
+        nodes_array = perft_array(env, depth, 1)
+        array_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        nodes_bitboard = perft_bitboard(BitBoard(), depth, 1)
+        bitboard_time = time.perf_counter() - start
+
+        assert nodes_array == nodes_bitboard, f"perft({depth}) distinto: {nodes_array} != {nodes_bitboard}"
+        print(f"{depth:>5} | {nodes_bitboard:>10} | {nodes_array / array_time:>16.0f} | "
+              f"{nodes_bitboard / bitboard_time:>19.0f} | {array_time / bitboard_time:>6.1f}x")
+
+
+def cross_check(num_games, seed=0):
+    rng = np.random.default_rng(seed)
+    reference = ConnectFourEnv()
+    bitboard_env = ConnectFourEnv(use_bitboard=True)
+    start = time.perf_counter()
+    for game in range(num_games):
+        obs_ref, _ = reference.reset()
+        obs_bit, _ = bitboard_env.reset()
+        terminated = False
+        while not terminated:
+            valid = reference._get_valid_locations()
+            assert valid == bitboard_env._get_valid_locations()
+            action = valid[rng.integers(len(valid))]
+            obs_ref, reward_ref, terminated, _, info_ref = reference.step(action)
+            obs_bit, reward_bit, terminated_bit, _, info_bit = bitboard_env.step(action)
+            if not (np.array_equal(obs_ref, obs_bit) and reward_ref == reward_bit
+                    and terminated == terminated_bit and info_ref == info_bit):
+                raise AssertionError(f"Diferencia en la partida {game}:\n{obs_ref}\n{obs_bit}")
+        if (game + 1) % 10000 == 0:
+            print(f"  {game + 1} partidas comprobadas...")
+    elapsed = time.perf_counter() - start
+    print(f"Cruce correcto: {num_games} partidas aleatorias idénticas en {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del motor de bitboards de Cuatro en Raya")
+    parser.add_argument("--depth", type=int, default=6, help="Profundidad máxima de perft")
+    parser.add_argument("--games", type=int, default=10000, help="Partidas aleatorias para el cruce")
+    args = parser.parse_args()
+
+    run_perft(args.depth)
+    print()
+    cross_check(args.games)
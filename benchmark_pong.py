@@ -0,0 +1,100 @@
+import argparse
+import itertools
+import random
+import time
+import numpy as np
+
+from pong_core import PongMatch, WIDTH, HEIGHT, BALL_SIZE
+from tournament_runner import RIVAL_OPTIONS, create_ia
+
+# Benchmark de PongMatch (fotogramas por segundo sin pantalla).
+#  - una bola: partidas entre parejas de IA, con semilla y con max_balls=1, y las mismas
+#    partidas normales (IAJ lanza hasta 5 bolas). Es el caso de los torneos, del
+#    entrenamiento evolutivo y de PongEnv.
+#  - caos: una partida con muchas bolas a la vez. Hasta LOOP_MAX_BALLS bolas se
+#    recorren una a una; con más se usan máscaras.
+#  - cruce: comprueba que el recorrido bola a bola y las máscaras dan la misma partida.
+
+NUM_BALLS = [2, 10, 50, 100, 1000]
+# Fotogramas simulados en cada medición del modo caos
+CHAOS_FRAMES = 200
+
+
+def make_match(name1, name2, seed, max_balls=5, time_limit=60, score_limit=5):
+    random.seed(seed)
+    return PongMatch(create_ia(name1), create_ia(name2), name1, name2, time_limit=time_limit,
+                     consecutive_score_limit=score_limit, point_score_limit=score_limit, rng=random.Random(seed),
+                     verbose=False, max_balls=max_balls)
+
+
+def match_frames_per_second(pairings, max_balls):
+    frames = 0
+    start = time.perf_counter()
+    for seed, (name1, name2) in enumerate(pairings):
+        match = make_match(name1, name2, seed, max_balls=max_balls)
+        match.run()
+        frames += match.frame
+    return frames, frames / (time.perf_counter() - start)
+
+
+def chaos_frames_per_second(num_balls, seed=0):
+    """
+    Fotogramas por segundo con `num_balls` bolas repartidas por el centro del campo.
+    Las bolas que marcan desaparecen, así que también se devuelve la media de bolas.
+    """
+    match = make_match("IAM", "IAM", seed, max_balls=num_balls, time_limit=1000, score_limit=10 ** 9)
+    rng = np.random.default_rng(seed)
+    match.ball_pos = np.column_stack((rng.uniform(WIDTH / 4, 3 * WIDTH / 4, num_balls),
+                                      rng.uniform(0, HEIGHT - BALL_SIZE, num_balls)))
+    match.ball_vel = rng.choice((-match.ball_speed, match.ball_speed), size=(num_balls, 2)).astype(np.float64)
+    match.ball_size = np.full(num_balls, BALL_SIZE, dtype=np.float64)
+    balls = 0
+    start = time.perf_counter()
+    for _ in range(CHAOS_FRAMES):
+        match.step()
+        balls += match.num_balls
+    return balls / CHAOS_FRAMES, CHAOS_FRAMES / (time.perf_counter() - start)
+
+
+def match_trace(name1, name2, seed, max_balls, arrays_only):
+    match = make_match(name1, name2, seed, max_balls=max_balls, time_limit=30, score_limit=8)
+    if arrays_only:
+        match._update_balls = match._update_ball_arrays
+    trace = []
+    while not match.step():
+        trace.append((match.ball_pos.tobytes(), match.ball_vel.tobytes(), match.score_player1, match.score_player2,
+                      match.consecutive_score_player1, match.consecutive_score_player2))
+    return trace, match.result
+
+
+def cross_check(seeds):
+    checked = 0
+    for name1, name2 in itertools.product(RIVAL_OPTIONS, repeat=2):
+        for seed in range(seeds):
+            for max_balls in (1, 5, 50):
+                if match_trace(name1, name2, seed, max_balls, True) != match_trace(name1, name2, seed, max_balls, False):
+                    raise AssertionError(f"Diferencia en {name1} contra {name2} (semilla {seed}, max_balls {max_balls})")
+                checked += 1
+    print(f"Cruce correcto: {checked} partidas idénticas bola a bola y con máscaras")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la simulación de Pong sin pantalla")
+    parser.add_argument("--pairings", type=int, default=18, help="Parejas de IA en la medición de una bola")
+    parser.add_argument("--seeds", type=int, default=2, help="Semillas por pareja en el cruce")
+    args = parser.parse_args()
+
+    pairings = list(itertools.combinations(RIVAL_OPTIONS, 2))[:args.pairings]
+    for label, max_balls in (("Una bola", 1), ("Normales", 5)):
+        frames, fps = match_frames_per_second(pairings, max_balls)
+        print(f"{label}: {len(pairings)} partidas, {frames} fotogramas, {fps:.0f} fotogramas/s")
+
+    print()
+    print(f"{'bolas':>6} | {'media':>7} | {'fotogramas/s':>13}")
+    print("-" * 33)
+    for num_balls in NUM_BALLS:
+        mean_balls, fps = chaos_frames_per_second(num_balls)
+        print(f"{num_balls:>6} | {mean_balls:>7.1f} | {fps:>13.0f}")
+
+    print()
+    cross_check(args.seeds)
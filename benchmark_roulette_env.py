@@ -0,0 +1,90 @@
+import time
+import numpy as np
+from collections import deque
+from roulette_env import RouletteEnv
+from roulette_vec_env import RouletteVecEnv
+
+# Benchmark de RouletteEnv: compara el cálculo de frecuencias original (recorriendo
+# todo el historial en cada paso) con el contador incremental actual.
+
+HISTORY_SIZES = [100, 1000, 10000, 100000, 1000000]
+VEC_NUM_ENVS = [1, 16, 256, 1024]
+# Presupuesto aproximado de tiempo por medición, en segundos
+TIME_BUDGET = 1.0
+
+
+class LegacyRouletteEnv(RouletteEnv):
+    """
+    Versión original de _get_obs: recorre el deque completo en cada paso.
+    """
+    def _get_obs(self):
+        number_frequencies = np.zeros(37, dtype=np.float32)
+        if self.winning_numbers_history:
+            for number in self.winning_numbers_history:
+                number_frequencies[number] += 1
+            number_frequencies /= len(self.winning_numbers_history)
+
+        observation = np.concatenate(([self.balance], number_frequencies)).astype(np.float32)
+        return observation
+
+
+def make_env(env_class, history_size, seed=0):
+    env = env_class(initial_balance=1e9, history_size=history_size, history_file=None)
+    # Rellenar el historial hasta su tamaño máximo para medir el peor caso
+    rng = np.random.default_rng(seed)
+    env.winning_numbers_history = deque(rng.integers(0, 37, size=history_size).tolist(), maxlen=history_size)
+    env.number_counts = np.bincount(np.asarray(env.winning_numbers_history, dtype=np.int64), minlength=37)
+    env.reset(seed=seed)
+    return env
+
+
+def steps_per_second(env_class, history_size):
+    env = make_env(env_class, history_size)
+    action = np.ones(16, dtype=np.int8)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_BUDGET:
+        env.step(action)
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def vec_steps_per_second(num_envs):
+    env = RouletteVecEnv(num_envs, initial_balance=1e9, seed=0, history_file=None)
+    env.reset()
+    actions = np.ones((num_envs, 16), dtype=np.int8)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_BUDGET:
+        env.step(actions)
+        steps += num_envs
+    return steps / (time.perf_counter() - start)
+
+
+def check_identical(history_size, steps=200):
+    legacy = make_env(LegacyRouletteEnv, history_size)
+    current = make_env(RouletteEnv, history_size)
+    rng = np.random.default_rng(1)
+    for _ in range(steps):
+        action = rng.integers(0, 2, size=16)
+        obs_legacy = legacy.step(action)[0]
+        obs_current = current.step(action)[0]
+        if obs_legacy.tobytes() != obs_current.tobytes():
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    print(f"{'historial':>10} | {'original (pasos/s)':>20} | {'incremental (pasos/s)':>22} | {'mejora':>8} | idéntico")
+    print("-" * 80)
+    for size in HISTORY_SIZES:
+        legacy_sps = steps_per_second(LegacyRouletteEnv, size)
+        current_sps = steps_per_second(RouletteEnv, size)
+        identical = check_identical(size, steps=20 if size >= 100000 else 200)
+        print(f"{size:>10} | {legacy_sps:>20.1f} | {current_sps:>22.1f} | {current_sps / legacy_sps:>7.1f}x | {identical}")
+
+    print()
+    print(f"{'mesas':>10} | {'RouletteVecEnv (pasos/s)':>26}")
+    print("-" * 40)
+    for num_envs in VEC_NUM_ENVS:
+        print(f"{num_envs:>10} | {vec_steps_per_second(num_envs):>26.1f}")
@@ -0,0 +1,72 @@
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from roulette_history import SessionRecorder
+
+# Benchmark del registro de jugadas de una sesión: el deque de diccionarios original
+# (con list(action) y la marca de tiempo repetida en cada jugada) frente a
+# SessionRecorder. Mide el tiempo de grabar las jugadas y de pasarlas a DataFrame, y la
+# memoria máxima reservada durante todo el proceso.
+
+STEP_COUNTS = [10000, 100000, 500000]
+
+
+def make_steps(num_steps, seed=0):
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 2, size=(num_steps, 16)).astype(np.float32)
+    rewards = rng.normal(size=num_steps).astype(np.float32)
+    balances = np.cumsum(rewards) + 100000
+    results = rng.integers(0, 37, size=num_steps)
+    return actions, rewards, balances, results
+
+
+def record_legacy(actions, rewards, balances, results, timestamp="2025-01-01_00-00-00"):
+    history = deque(maxlen=len(actions))
+    for i in range(len(actions)):
+        history.append({
+            "timestamp": timestamp,
+            "step": i + 1,
+            "action": list(actions[i]),
+            "reward": rewards[i],
+            "balance": balances[i],
+            "roulette_result": results[i],
+        })
+    # El script original crea el DataFrame dos veces (CSV y gráfico)
+    pd.DataFrame(list(history))
+    return history, pd.DataFrame(list(history))
+
+
+def record_recorder(actions, rewards, balances, results):
+    recorder = SessionRecorder(capacity=len(actions))
+    for i in range(len(actions)):
+        recorder.append(i + 1, actions[i], rewards[i], balances[i], results[i])
+    return recorder, recorder.to_dataframe()
+
+
+def measure(record, steps):
+    tracemalloc.start()
+    start = time.perf_counter()
+    record(*steps)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del registro de jugadas de la ruleta")
+    parser.add_argument("--steps", type=int, nargs="*", default=STEP_COUNTS, help="Número de jugadas a grabar")
+    args = parser.parse_args()
+
+    print(f"{'jugadas':>10} | {'deque (s)':>10} | {'deque (MiB)':>12} | {'recorder (s)':>12} | {'recorder (MiB)':>15}")
+    print("-" * 72)
+    for num_steps in args.steps:
+        steps = make_steps(num_steps)
+        legacy_time, legacy_mem = measure(record_legacy, steps)
+        recorder_time, recorder_mem = measure(record_recorder, steps)
+        print(f"{num_steps:>10} | {legacy_time:>10.2f} | {legacy_mem:>12.1f} | {recorder_time:>12.2f} | {recorder_mem:>15.1f}")
@@ -0,0 +1,145 @@
+import numpy as np
+
+# Representación del tablero de Cuatro en Raya con bitboards.
+#
+# Cada jugador tiene un entero de 64 bits. La columna c ocupa los bits c*7 .. c*7+6:
+# los 6 primeros son las filas (fila 0 = abajo, igual que en ConnectFourEnv) y el
+# séptimo es un bit centinela siempre vacío que evita que las líneas "salten" de una
+# columna a la siguiente al desplazar.
+
+ROWS = 6
+COLS = 7
+COLUMN_BITS = ROWS + 1
+
+BOTTOM_MASK = sum(1 << (c * COLUMN_BITS) for c in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# Desplazamientos para vertical, horizontal y las dos diagonales
+DIRECTIONS = (1, COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1)
+
+
+def has_four(bitboard):
+    """
+    Devuelve True si el bitboard contiene cuatro fichas en línea.
+    """
+    for shift in DIRECTIONS:
+        pairs = bitboard & (bitboard >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def player_index(player):
+    return 0 if player == 1 else 1
+
+
+def mirror(bitboard):
+    """
+    Refleja un bitboard de izquierda a derecha (la columna c pasa a ser la 6 - c).
+    """
+    column_mask = (1 << COLUMN_BITS) - 1
+    mirrored = 0
+    for c in range(COLS):
+        column = (bitboard >> (c * COLUMN_BITS)) & column_mask
+        mirrored |= column << ((COLS - 1 - c) * COLUMN_BITS)
+    return mirrored
+
+
+class BitBoard:
+    """
+    Tablero de Cuatro en Raya como dos enteros de 64 bits más la altura de cada columna.
+    """
+    def __init__(self):
+        self.bitboards = [0, 0]  # [jugador 1, jugador -1]
+        # Siguiente bit libre de cada columna
+        self.heights = [c * COLUMN_BITS for c in range(COLS)]
+        self.moves = 0
+
+    @classmethod
+    def from_array(cls, board):
+        """
+        Construye el bitboard a partir de un tablero (filas x columnas) con 1, -1 y 0.
+        """
+        bitboard = cls()
+        for c in range(COLS):
+            for r in range(ROWS):
+                if board[r][c] != 0:
+                    bitboard.bitboards[player_index(board[r][c])] |= 1 << (c * COLUMN_BITS + r)
+                    bitboard.heights[c] = c * COLUMN_BITS + r + 1
+                    bitboard.moves += 1
+        return bitboard
+
+    @classmethod
+    def from_bitboards(cls, player1_bits, player2_bits):
+        bitboard = cls()
+        bitboard.bitboards = [player1_bits, player2_bits]
+        occupied = player1_bits | player2_bits
+        for c in range(COLS):
+            while occupied >> bitboard.heights[c] & 1:
+                bitboard.heights[c] += 1
+        bitboard.moves = bin(occupied).count("1")
+        return bitboard
+
+    def key(self):
+        """
+        Clave única de la posición: fichas del jugador 1 + casillas ocupadas + fila inferior.
+        A quién le toca mover se deduce de la paridad del número de fichas.
+        """
+        return self.bitboards[0] + (self.bitboards[0] | self.bitboards[1]) + BOTTOM_MASK
+
+    def canonical_key(self):
+        """
+        Devuelve (clave, reflejada): la menor entre la clave de la posición y la de su
+        reflejo izquierda-derecha, y si la elegida es la del reflejo.
+        """
+        key = self.key()
+        mirrored_key = mirror(self.bitboards[0]) + mirror(self.bitboards[0] | self.bitboards[1]) + BOTTOM_MASK
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    def can_play(self, col):
+        return self.heights[col] < col * COLUMN_BITS + ROWS
+
+    def next_row(self, col):
+        """
+        Fila libre más baja de la columna, o -1 si está llena.
+        """
+        if not self.can_play(col):
+            return -1
+        return self.heights[col] - col * COLUMN_BITS
+
+    def play(self, col, player):
+        """
+        Coloca una ficha del jugador en la columna y devuelve la fila ocupada.
+        """
+        bit = self.heights[col]
+        self.bitboards[player_index(player)] |= 1 << bit
+        self.heights[col] = bit + 1
+        self.moves += 1
+        return bit - col * COLUMN_BITS
+
+    def undo(self, col, player):
+        bit = self.heights[col] - 1
+        self.bitboards[player_index(player)] &= ~(1 << bit)
+        self.heights[col] = bit
+        self.moves -= 1
+
+    def is_win(self, player):
+        # Solo la última ficha puede crear una línea nueva, así que basta con
+        # comprobar el bitboard del jugador que acaba de mover.
+        return has_four(self.bitboards[player_index(player)])
+
+    def is_full(self):
+        return self.moves == ROWS * COLS
+
+    def to_array(self):
+        board = np.zeros((ROWS, COLS), dtype=int)
+        for c in range(COLS):
+            for r in range(ROWS):
+                bit = 1 << (c * COLUMN_BITS + r)
+                if self.bitboards[0] & bit:
+                    board[r][c] = 1
+                elif self.bitboards[1] & bit:
+                    board[r][c] = -1
+        return board
@@ -0,0 +1,209 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+from connect_four_bitboard import BitBoard, COLS, mirror
+from connect_four_solver import ConnectFourSolver
+
+# Libro de aperturas y caché de posiciones resueltas para Cuatro en Raya.
+#
+# Las posiciones se identifican con la clave canónica de BitBoard: se pliega la
+# simetría izquierda-derecha, así que una posición y su reflejo comparten entrada y
+# la jugada guardada se refleja al consultarla si hace falta.
+#
+# El libro es una tabla hash de direccionamiento abierto guardada como .npy, que se
+# abre con memoria mapeada: consultar una posición lee solo unas pocas entradas del
+# archivo, sin cargarlo entero. La caché de posiciones resueltas es un archivo binario
+# de solo añadir que crece entre sesiones con cada posición que el buscador resuelve.
+
+BOOK_FILE = "connect_four_book.npy"
+SOLVED_CACHE_FILE = "connect_four_solved.bin"
+
+ENTRY_DTYPE = np.dtype([("key", "<u8"), ("move", "i1"), ("score", "<i2")])
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def _slot(key, bits):
+    return ((key * _HASH_MULTIPLIER) & _MASK64) >> (64 - bits)
+
+
+def build_hash_table(entries):
+    """
+    Crea la tabla hash del libro a partir de tuplas (clave, jugada, puntuación).
+    Las claves nunca valen 0, así que 0 marca las casillas vacías.
+    """
+    bits = max(4, (2 * len(entries) - 1).bit_length())
+    table = np.zeros(1 << bits, dtype=ENTRY_DTYPE)
+    mask = len(table) - 1
+    for key, move, score in entries:
+        slot = _slot(key, bits)
+        while table["key"][slot] != 0:
+            slot = (slot + 1) & mask
+        table[slot] = (key, move, score)
+    return table
+
+
+class OpeningBook:
+    """
+    Libro de aperturas en memoria mapeada. Si el archivo no existe, el libro está vacío.
+    """
+    def __init__(self, path=BOOK_FILE):
+        self.table = np.load(path, mmap_mode="r") if os.path.exists(path) else None
+        if self.table is not None:
+            self.bits = len(self.table).bit_length() - 1
+            self.mask = len(self.table) - 1
+
+    def __len__(self):
+        return 0 if self.table is None else int(np.count_nonzero(self.table["key"]))
+
+    def lookup(self, key):
+        if self.table is None:
+            return None
+        slot = _slot(key, self.bits)
+        while True:
+            entry = self.table[slot]
+            stored_key = int(entry["key"])
+            if stored_key == key:
+                return int(entry["move"]), int(entry["score"])
+            if stored_key == 0:
+                return None
+            slot = (slot + 1) & self.mask
+
+
+class SolvedCache:
+    """
+    Posiciones resueltas de forma exacta por el buscador, persistidas entre sesiones.
+    """
+    def __init__(self, path=SOLVED_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            # Se ignora un posible registro incompleto al final del archivo
+            usable = len(data) - len(data) % ENTRY_DTYPE.itemsize
+            for key, move, score in np.frombuffer(data[:usable], dtype=ENTRY_DTYPE).tolist():
+                self.entries[key] = (move, score)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        return self.entries.get(key)
+
+    def add(self, key, move, score):
+        if key in self.entries:
+            return
+        self.entries[key] = (move, score)
+        with open(self.path, "ab") as f:
+            f.write(np.array([(key, move, score)], dtype=ENTRY_DTYPE).tobytes())
+
+
+class BookPlayer:
+    """
+    IA de Cuatro en Raya que consulta primero el libro de aperturas, después la caché
+    de posiciones resueltas y solo si no encuentra la posición lanza la búsqueda.
+    """
+    def __init__(self, solver=None, book_path=BOOK_FILE, cache_path=SOLVED_CACHE_FILE):
+        self.solver = solver if solver is not None else ConnectFourSolver()
+        self.book = OpeningBook(book_path)
+        self.cache = SolvedCache(cache_path)
+        self.last_source = None
+
+    def choose_move(self, board, player):
+        bitboard = BitBoard.from_array(board)
+        key, mirrored = bitboard.canonical_key()
+
+        for source, store in (("libro", self.book), ("caché", self.cache)):
+            entry = store.lookup(key)
+            if entry is not None:
+                self.last_source = source
+                move = entry[0]
+                return COLS - 1 - move if mirrored else move
+
+        self.last_source = "búsqueda"
+        move = self.solver.search(bitboard, player)
+        if self.solver.exact:
+            canonical_move = COLS - 1 - move if mirrored else move
+            self.cache.add(key, canonical_move, self.solver.last_score)
+        return move
+
+
+# --- Generación del libro ---
+
+_worker_solver = None
+
+
+def _init_worker(time_budget, tt_bits):
+    global _worker_solver
+    _worker_solver = ConnectFourSolver(time_budget=time_budget, tt_bits=tt_bits)
+
+
+def _solve_position(bitboards):
+    bitboard = BitBoard.from_bitboards(*bitboards)
+    player = 1 if bitboard.moves % 2 == 0 else -1
+    move = _worker_solver.search(bitboard, player)
+    return bitboard.key(), move, _worker_solver.last_score
+
+
+def enumerate_positions(max_plies):
+    """
+    Posiciones canónicas no terminales con menos de `max_plies` fichas, como pares de bitboards.
+    """
+    root = BitBoard()
+    frontier = {root.key(): tuple(root.bitboards)}
+    positions = []
+    for ply in range(max_plies):
+        positions.extend(frontier.values())
+        if ply == max_plies - 1:
+            break
+        next_frontier = {}
+        player = 1 if ply % 2 == 0 else -1
+        for bitboards in frontier.values():
+            bitboard = BitBoard.from_bitboards(*bitboards)
+            for col in range(COLS):
+                if not bitboard.can_play(col):
+                    continue
+                bitboard.play(col, player)
+                if not bitboard.is_win(player):
+                    key, mirrored = bitboard.canonical_key()
+                    if key not in next_frontier:
+                        if mirrored:
+                            next_frontier[key] = (mirror(bitboard.bitboards[0]), mirror(bitboard.bitboards[1]))
+                        else:
+                            next_frontier[key] = tuple(bitboard.bitboards)
+                bitboard.undo(col, player)
+        frontier = next_frontier
+    return positions
+
+
+def build_book(max_plies=8, workers=None, time_budget=0.5, tt_bits=18, path=BOOK_FILE):
+    positions = enumerate_positions(max_plies)
+    workers = workers or cpu_count()
+    print(f"Resolviendo {len(positions)} posiciones canónicas con {workers} procesos...")
+
+    start = time.time()
+    entries = []
+    with Pool(workers, initializer=_init_worker, initargs=(time_budget, tt_bits)) as pool:
+        for i, entry in enumerate(pool.imap_unordered(_solve_position, positions, chunksize=16), 1):
+            entries.append(entry)
+            if i % 1000 == 0:
+                print(f"  {i}/{len(positions)} posiciones ({time.time() - start:.0f}s)")
+
+    np.save(path, build_hash_table(entries))
+    print(f"Libro de aperturas guardado en {path} ({len(entries)} posiciones, {time.time() - start:.0f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el libro de aperturas de Cuatro en Raya")
+    parser.add_argument("--plies", type=int, default=8, help="Número de jugadas iniciales cubiertas")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--time", type=float, default=0.5, help="Segundos de búsqueda por posición")
+    parser.add_argument("--out", default=BOOK_FILE, help="Archivo de salida")
+    args = parser.parse_args()
+
+    build_book(args.plies, args.workers, args.time, path=args.out)
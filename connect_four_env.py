@@ -2,16 +2,25 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import pygame
+from connect_four_bitboard import BitBoard
 
 class ConnectFourEnv(gym.Env):
     # ¡IMPORTANTE! Hemos añadido 'rgb_array' aquí
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 1}
 
-    def __init__(self, render_mode=None):
+    def __init__(self, render_mode=None, use_bitboard=False, opponent=None):
         super().__init__()
         self.rows = 6
         self.cols = 7
         self.board = np.zeros((self.rows, self.cols), dtype=int)
+        # Con use_bitboard la detección de victoria y las alturas de columna se calculan
+        # sobre un BitBoard; self.board se sigue actualizando para las observaciones.
+        self.use_bitboard = use_bitboard
+        self.bitboard = BitBoard() if use_bitboard else None
+        # Política opcional para el jugador -1 (por ejemplo un ConnectFourSolver). Debe
+        # tener un método choose_move(board, player). Si se indica, cada step juega la
+        # acción recibida como jugador 1 y a continuación responde el oponente.
+        self.opponent = opponent
         self.current_player = 1  # 1 for player 1 (red), -1 for player 2 (yellow)
         self.winner = 0
 
@@ -28,6 +37,8 @@ class ConnectFourEnv(gym.Env):
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
         self.board = np.zeros((self.rows, self.cols), dtype=int)
+        if self.use_bitboard:
+            self.bitboard = BitBoard()
         self.current_player = 1
         self.winner = 0
         observation = self._get_obs()
@@ -35,21 +46,25 @@ class ConnectFourEnv(gym.Env):
         return observation, info
 
     def step(self, action):
-        row = self._get_next_open_row(action)
-        self.board[row][action] = self.current_player
-        
-        # Verificar si hay un ganador o un empate
-        if self._is_winning_move(self.current_player):
-            self.winner = self.current_player
-            reward = self._get_reward(self.winner)
-            terminated = True
-        elif len(self._get_valid_locations()) == 0:
-            self.winner = 0  # Empate
+        observation, reward, terminated, truncated, info = self._play_move(action)
+        if self.opponent is not None and not terminated:
+            opponent_action = self.opponent.choose_move(self.board, self.current_player)
+            observation, reward, terminated, truncated, info = self._play_move(opponent_action)
+        return observation, reward, terminated, truncated, info
+
+    def _play_move(self, action):
+        if not self._is_valid_location(action):
+            # Columna llena: el tablero no cambia y la partida termina con victoria del
+            # rival, igual que en ConnectFourVecEnv
+            self.winner = -self.current_player
             reward = self._get_reward(self.winner)
             terminated = True
         else:
-            reward = 0
-            terminated = False
+            row = self._get_next_open_row(action)
+            self.board[row][action] = self.current_player
+            if self.use_bitboard:
+                self.bitboard.play(action, self.current_player)
+            reward, terminated = self._check_end()
 
         # Cambiar de jugador
         self.current_player *= -1
@@ -62,6 +77,21 @@ class ConnectFourEnv(gym.Env):
 
         return observation, reward, terminated, False, info
 
+    def _check_end(self):
+        # Verificar si hay un ganador o un empate
+        if self._is_winning_move(self.current_player):
+            self.winner = self.current_player
+            reward = self._get_reward(self.winner)
+            terminated = True
+        elif len(self._get_valid_locations()) == 0:
+            self.winner = 0  # Empate
+            reward = self._get_reward(self.winner)
+            terminated = True
+        else:
+            reward = 0
+            terminated = False
+        return reward, terminated
+
     def _get_obs(self):
         return self.board.copy()
 
@@ -69,9 +99,13 @@ class ConnectFourEnv(gym.Env):
         return {"current_player": self.current_player, "winner": self.winner}
 
     def _is_valid_location(self, col):
+        if self.use_bitboard:
+            return self.bitboard.can_play(col)
         return self.board[self.rows - 1][col] == 0
 
     def _get_next_open_row(self, col):
+        if self.use_bitboard:
+            return self.bitboard.next_row(col)
         for r in range(self.rows):
             if self.board[r][col] == 0:
                 return r
@@ -81,6 +115,9 @@ class ConnectFourEnv(gym.Env):
         return [col for col in range(self.cols) if self._is_valid_location(col)]
 
     def _is_winning_move(self, player):
+        if self.use_bitboard:
+            return self.bitboard.is_win(player)
+
         # Comprobar movimientos horizontales
         for c in range(self.cols - 3):
             for r in range(self.rows):
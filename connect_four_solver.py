@@ -0,0 +1,203 @@
+import random
+import time
+
+from connect_four_bitboard import BitBoard, ROWS, COLS, COLUMN_BITS, player_index
+
+# Orden de exploración: primero las columnas centrales, que suelen ser las mejores
+CENTER_ORDER = [3, 2, 4, 1, 5, 0, 6]
+CENTER_MASK = ((1 << ROWS) - 1) << (3 * COLUMN_BITS)
+
+# Las victorias valen WIN_SCORE menos el número de fichas en el tablero, así que
+# ganar antes puntúa más. Cualquier puntuación por encima de WIN_THRESHOLD es una
+# victoria (o derrota) demostrada.
+WIN_SCORE = 1000
+WIN_THRESHOLD = WIN_SCORE - ROWS * COLS - 1
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class ConnectFourSolver:
+    """
+    Oponente de búsqueda para Cuatro en Raya.
+
+    Negamax con poda alfa-beta, columnas centrales primero, profundización iterativa
+    limitada por tiempo y una tabla de transposiciones de tamaño fijo indexada por
+    claves Zobrist. Cada entrada guarda profundidad, puntuación, tipo de cota y mejor
+    jugada; ante una colisión se conserva la búsqueda más profunda.
+    """
+    def __init__(self, time_budget=1.0, tt_bits=20, max_depth=ROWS * COLS, seed=0):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+
+        rng = random.Random(seed)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(COLS * COLUMN_BITS)] for _ in range(2)]
+
+        self.tt_size = 1 << tt_bits
+        self.tt_mask = self.tt_size - 1
+        self.clear_table()
+        self._reset_stats()
+
+    def clear_table(self):
+        self.tt_keys = [None] * self.tt_size
+        self.tt_depth = [0] * self.tt_size
+        self.tt_score = [0] * self.tt_size
+        self.tt_flag = [EXACT] * self.tt_size
+        self.tt_move = [-1] * self.tt_size
+
+    def _reset_stats(self):
+        self.nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.search_time = 0.0
+        self.completed_depth = 0
+        self.last_score = 0
+        self.exact = False
+
+    def stats(self):
+        """
+        Estadísticas de la última búsqueda.
+        """
+        return {
+            "nodes": self.nodes,
+            "nodes_per_second": self.nodes / self.search_time if self.search_time else 0.0,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.tt_hits / self.tt_probes if self.tt_probes else 0.0,
+            "tt_entries": self.tt_size,
+            "depth": self.completed_depth,
+            "score": self.last_score,
+            "exact": self.exact,
+            "time": self.search_time,
+        }
+
+    def choose_move(self, board, player):
+        """
+        Devuelve la mejor columna para `player` (1 o -1) en un tablero (filas x columnas)
+        con el formato de ConnectFourEnv.
+        """
+        return self.search(BitBoard.from_array(board), player)
+
+    def search(self, bitboard, player):
+        self._reset_stats()
+        self.bitboard = bitboard
+        self.key = self._compute_key(bitboard)
+        self.deadline = time.perf_counter() + self.time_budget
+        start = time.perf_counter()
+
+        valid_moves = [col for col in CENTER_ORDER if bitboard.can_play(col)]
+        best_move = valid_moves[0]
+        remaining = ROWS * COLS - bitboard.moves
+
+        try:
+            for depth in range(1, min(self.max_depth, remaining) + 1):
+                score, move = self._root(depth, player, valid_moves, best_move)
+                best_move, self.last_score, self.completed_depth = move, score, depth
+                # Una victoria demostrada, o una búsqueda hasta llenar el tablero, es definitiva
+                if abs(score) > WIN_THRESHOLD or depth == remaining:
+                    self.exact = True
+                    break
+        except _SearchTimeout:
+            pass
+
+        self.search_time = time.perf_counter() - start
+        return best_move
+
+    def _root(self, depth, player, valid_moves, previous_best):
+        ordered = [previous_best] + [col for col in valid_moves if col != previous_best]
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        best_score, best_move = -WIN_SCORE - 1, ordered[0]
+        for col in ordered:
+            score = self._score_move(col, depth, alpha, beta, player)
+            if score > best_score:
+                best_score, best_move = score, col
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def _compute_key(self, bitboard):
+        key = 0
+        for slot in range(2):
+            for bit in range(COLS * COLUMN_BITS):
+                if bitboard.bitboards[slot] >> bit & 1:
+                    key ^= self.zobrist[slot][bit]
+        return key
+
+    def _score_move(self, col, depth, alpha, beta, player):
+        bitboard = self.bitboard
+        slot = player_index(player)
+        bit = bitboard.heights[col]
+        bitboard.play(col, player)
+        self.key ^= self.zobrist[slot][bit]
+        try:
+            if bitboard.is_win(player):
+                return WIN_SCORE - bitboard.moves
+            return -self._negamax(depth - 1, -beta, -alpha, -player)
+        finally:
+            bitboard.undo(col, player)
+            self.key ^= self.zobrist[slot][bit]
+
+    def _negamax(self, depth, alpha, beta, player):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise _SearchTimeout()
+
+        bitboard = self.bitboard
+        if bitboard.moves == ROWS * COLS:
+            return 0
+        if depth == 0:
+            return self._evaluate(player)
+
+        alpha_orig = alpha
+        index = self.key & self.tt_mask
+        self.tt_probes += 1
+        tt_move = -1
+        if self.tt_keys[index] == self.key:
+            self.tt_hits += 1
+            tt_move = self.tt_move[index]
+            if self.tt_depth[index] >= depth:
+                score, flag = self.tt_score[index], self.tt_flag[index]
+                if flag == EXACT:
+                    return score
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                elif flag == UPPER_BOUND:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        best_score, best_move = -WIN_SCORE - 1, -1
+        moves = CENTER_ORDER if tt_move == -1 else [tt_move] + [c for c in CENTER_ORDER if c != tt_move]
+        for col in moves:
+            if not bitboard.can_play(col):
+                continue
+            score = self._score_move(col, depth, alpha, beta, player)
+            if score > best_score:
+                best_score, best_move = score, col
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        # Reemplazo por profundidad: no se pisa una entrada más profunda de otra posición
+        if self.tt_keys[index] is None or self.tt_keys[index] == self.key or self.tt_depth[index] <= depth:
+            self.tt_keys[index] = self.key
+            self.tt_depth[index] = depth
+            self.tt_score[index] = best_score
+            self.tt_flag[index] = flag
+            self.tt_move[index] = best_move
+        return best_score
+
+    def _evaluate(self, player):
+        # Heurística simple para posiciones sin resolver: fichas en la columna central
+        own = self.bitboard.bitboards[player_index(player)]
+        other = self.bitboard.bitboards[player_index(-player)]
+        return bin(own & CENTER_MASK).count("1") - bin(other & CENTER_MASK).count("1")
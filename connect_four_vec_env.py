@@ -0,0 +1,106 @@
+import numpy as np
+from gymnasium import spaces
+
+from batch_vec_env import BatchVecEnv
+from connect_four_bitboard import ROWS, COLS, COLUMN_BITS, DIRECTIONS
+
+_SHIFTS = [(np.uint64(shift), np.uint64(2 * shift)) for shift in DIRECTIONS]
+
+
+class ConnectFourVecEnv(BatchVecEnv):
+    """
+    B partidas de Cuatro en Raya en un solo proceso, avanzadas a la vez con NumPy.
+
+    Los tableros se guardan en un array (B, 6, 7) int8 (la observación, con el mismo
+    formato que ConnectFourEnv) y además como dos bitboards uint64 por partida, sobre
+    los que se detecta la victoria para todas las partidas con unas pocas operaciones
+    vectorizadas. Igual que en ConnectFourEnv, cada llamada a step juega una ficha del
+    jugador al que le toca y la recompensa es 1 si gana el jugador 1, -1 si gana el
+    jugador -1 y 0 en otro caso. Jugar en una columna llena termina la partida con
+    victoria del rival, también en ConnectFourEnv. Las partidas terminadas se reinician
+    automáticamente. El juego no tiene azar: la semilla solo fija el muestreo del
+    espacio de acciones (la exploración de DQN).
+    """
+    env_arrays = ("boards", "bitboards", "heights", "moves", "current_player")
+
+    def __init__(self, num_envs, seed=None):
+        self.render_mode = None
+        observation_space = spaces.Box(low=-1, high=1, shape=(ROWS, COLS), dtype=np.int8)
+        action_space = spaces.Discrete(COLS)
+        super().__init__(num_envs, observation_space, action_space)
+        self.action_space.seed(seed)
+
+        self._env_indices = np.arange(num_envs)
+        self.boards = np.zeros((num_envs, ROWS, COLS), dtype=np.int8)
+        self.bitboards = np.zeros((num_envs, 2), dtype=np.uint64)  # [jugador 1, jugador -1]
+        self.heights = np.zeros((num_envs, COLS), dtype=np.int64)
+        self.moves = np.zeros(num_envs, dtype=np.int64)
+        self.current_player = np.ones(num_envs, dtype=np.int8)
+        self._actions = None
+
+    def _reset_games(self, mask):
+        self.boards[mask] = 0
+        self.bitboards[mask] = 0
+        self.heights[mask] = 0
+        self.moves[mask] = 0
+        self.current_player[mask] = 1
+
+    def reset(self):
+        self._reset_games(slice(None))
+        if self._seeds[0] is not None:
+            self.action_space.seed(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        return self.boards.copy()
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        actions = np.asarray(self._actions, dtype=np.int64).reshape(self.num_envs)
+        players = self.current_player.copy()
+        player_slot = (players == -1).astype(np.int64)
+
+        rows = self.heights[self._env_indices, actions]
+        invalid = rows >= ROWS
+        valid = ~invalid
+
+        # Dejar caer las fichas en las partidas con jugada válida
+        idx, cols, rows_v = self._env_indices[valid], actions[valid], rows[valid]
+        self.boards[idx, rows_v, cols] = players[valid]
+        bits = np.left_shift(np.uint64(1), (cols * COLUMN_BITS + rows_v).astype(np.uint64))
+        self.bitboards[idx, player_slot[valid]] |= bits
+        self.heights[idx, cols] += 1
+        self.moves[idx] += 1
+
+        # Cuatro en línea sobre el bitboard del jugador que acaba de mover
+        mover = self.bitboards[self._env_indices, player_slot]
+        wins = np.zeros(self.num_envs, dtype=bool)
+        for shift, double_shift in _SHIFTS:
+            pairs = mover & (mover >> shift)
+            wins |= (pairs & (pairs >> double_shift)) != 0
+        wins &= valid
+        draws = valid & ~wins & (self.moves == ROWS * COLS)
+
+        winners = np.where(wins, players, 0) - np.where(invalid, players, 0)
+        rewards = winners.astype(np.float32)
+        dones = wins | draws | invalid
+
+        self.current_player = -players
+        observation = self.boards.copy()
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = observation[i].copy()
+                infos[i]["winner"] = int(winners[i])
+                infos[i]["TimeLimit.truncated"] = False
+            self._reset_games(dones)
+            observation[dones] = 0
+
+        return observation, rewards, dones, infos
+
+    def valid_actions_mask(self):
+        """
+        Máscara (B, 7) con las columnas donde todavía se puede jugar.
+        """
+        return self.heights < ROWS
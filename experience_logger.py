@@ -1,47 +1,221 @@
+import argparse
+import atexit
 import json
+import os
+import time
+
+# Registro de experiencias de las IA en formato NDJSON (un objeto JSON por linea).
+#
+# Cada registro se serializa al llamar a log() y se guarda en un bufer pequeño que se
+# añade al final del archivo cuando pasa flush_interval segundos, cuando se acumulan
+# max_buffered registros o al llamar a save_log(). No se guarda en memoria el historial
+# completo y cada escritura cuesta lo mismo, sin importar lo largo que sea el registro.
+# Además se mantienen agregados por IA (ver IAAggregate), así que el informe no depende
+# del tamaño del historial. Cuando el archivo supera max_bytes se rota: game_log.ndjson
+# pasa a game_log.1.ndjson, la .1 a la .2, etc., y se conservan como mucho backup_count
+# copias. Al cerrar el registro (close(), o al salir del programa si no se ha cerrado)
+# se escribe lo que quede en el búfer.
+
+
+def _to_json(value):
+    # El estado de las IA (ia_state.IAState) se convierte a dict solo al escribirlo
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _backup_name(filename, index):
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{index}{ext}"
+
+
+def _read_records(filename):
+    """
+    Lee los registros de un archivo, tanto NDJSON como los .json antiguos (una lista).
+    """
+    with open(filename, "r") as f:
+        first_char = f.read(1)
+        while first_char.isspace():
+            first_char = f.read(1)
+        f.seek(0)
+        if first_char == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_log(filename="game_log.ndjson", include_backups=True):
+    """
+    Recorre los registros en orden cronologico, de la copia rotada mas antigua al
+    archivo actual, sin cargarlos todos en memoria.
+    """
+    filenames = [filename]
+    if include_backups:
+        index = 1
+        while os.path.exists(_backup_name(filename, index)):
+            filenames.insert(0, _backup_name(filename, index))
+            index += 1
+    for name in filenames:
+        if os.path.exists(name):
+            yield from _read_records(name)
+
+
+def load_log(filename="game_log.ndjson"):
+    return list(iter_log(filename))
+
+
+class RunningStats:
+    """
+    Cuenta, suma, mínimo, máximo y varianza (algoritmo de Welford) de una serie de
+    valores, actualizados en O(1) por valor sin guardarlos.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class IAAggregate:
+    """
+    Agregados de los registros de una IA: resultado final, IQ y primera y última IQ.
+    """
+    def __init__(self):
+        self.final_score = RunningStats()
+        self.iq = RunningStats()
+        self.iq_first = None
+        self.iq_last = None
+
+    def add(self, record):
+        self.final_score.add(record.get("final_score", 0))
+        iq = record.get("state", {}).get("iq")
+        if iq is not None:
+            self.iq.add(iq)
+            if self.iq_first is None:
+                self.iq_first = iq
+            self.iq_last = iq
+
+
+def aggregate_log(filename="game_log.ndjson"):
+    """
+    Calcula los agregados por IA recorriendo el registro en disco registro a registro.
+    """
+    aggregates = {}
+    for record in iter_log(filename):
+        aggregates.setdefault(record["ia_name"], IAAggregate()).add(record)
+    return aggregates
+
 
 class ExperienceLogger:
-    def __init__(self, filename="game_log.json"):
+    def __init__(self, filename="game_log.ndjson", flush_interval=2.0, max_buffered=1000,
+                 max_bytes=10 * 1024 * 1024, backup_count=5):
         self.filename = filename
-        self.log_data = []
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        # Agregados por IA de los registros de esta sesión, para el informe
+        self.aggregates = {}
+        atexit.register(self.close)
 
     def log(self, ia_name, experience_data):
-        self.log_data.append({"ia_name": ia_name, **experience_data})
+        record = {"ia_name": ia_name, **experience_data}
+        self.aggregates.setdefault(ia_name, IAAggregate()).add(record)
+        # Se serializa ya: el estado de la IA es un diccionario que sigue cambiando
+        self.buffer.append(json.dumps(record, default=_to_json) + "\n")
+        if len(self.buffer) >= self.max_buffered or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        data = "".join(self.buffer)
+        self.buffer = []
+        if self.max_bytes and os.path.exists(self.filename) and os.path.getsize(self.filename) + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.filename, "a") as f:
+            f.write(data)
 
     def save_log(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.log_data, f, indent=4)
-
-    def analyze_and_report(self):
-        ia_reports = {}
-        for entry in self.log_data:
-            ia_name = entry['ia_name']
-            if ia_name not in ia_reports:
-                ia_reports[ia_name] = {
-                    "difficulty": [],
-                    "satisfaction": [],
-                    "frustration": [],
-                    "iq_inicial": entry['iq_inicial'],
-                    "iq_final": entry['iq_final'],
-                }
-            ia_reports[ia_name]["difficulty"].append(entry['dificultad_rival'])
-            ia_reports[ia_name]["satisfaction"].append(entry['satisfaccion'])
-            ia_reports[ia_name]["frustration"].append(entry['frustracion'])
-            ia_reports[ia_name]["iq_final"] = entry['iq_final']
+        self.flush()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _rotate(self):
+        if self.backup_count <= 0:
+            os.remove(self.filename)
+            return
+        oldest = _backup_name(self.filename, self.backup_count)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(_backup_name(self.filename, index)):
+                os.replace(_backup_name(self.filename, index), _backup_name(self.filename, index + 1))
+        os.replace(self.filename, _backup_name(self.filename, 1))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def analyze_and_report(self, offline=False):
+        """
+        Imprime el informe por IA a partir de los agregados acumulados. Con offline=True
+        los agregados se recalculan leyendo el registro en disco.
+        """
+        if offline:
+            self.flush()
+            aggregates = aggregate_log(self.filename)
+        else:
+            aggregates = self.aggregates
 
         print("\n" + "="*50)
         print(" " * 10 + "INFORME DE PARTIDA")
         print("="*50 + "\n")
-        
-        for ia_name, data in ia_reports.items():
-            avg_difficulty = sum(data['difficulty']) / len(data['difficulty'])
-            avg_satisfaction = sum(data['satisfaction']) / len(data['satisfaction'])
-            avg_frustration = sum(data['frustration']) / len(data['frustration'])
 
+        for ia_name, aggregate in aggregates.items():
+            score, iq = aggregate.final_score, aggregate.iq
             print(f"--- Análisis de la IA: {ia_name.upper()} ---")
-            print(f"  > Dificultad percibida: {avg_difficulty:.2f} / 10")
-            print(f"  > Nivel de Satisfacción: {avg_satisfaction:.2f} / 10")
-            print(f"  > Nivel de Frustración: {avg_frustration:.2f} / 10")
-            print(f"  > IQ Inicial: {data['iq_inicial']:.2f}")
-            print(f"  > IQ Final: {data['iq_final']:.2f}")
-            print("--------------------------------------------------")
\ No newline at end of file
+            print(f"  > Registros: {score.count}")
+            print(f"  > Resultado medio: {score.mean:.2f} (desviación {score.std:.2f}, mín {score.min}, máx {score.max})")
+            if iq.count:
+                print(f"  > IQ Inicial: {aggregate.iq_first:.2f}")
+                print(f"  > IQ Final: {aggregate.iq_last:.2f}")
+                print(f"  > IQ media: {iq.mean:.2f} (desviación {iq.std:.2f}, mín {iq.min:.2f}, máx {iq.max:.2f})")
+            print("--------------------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Informe por IA a partir de un registro de experiencias")
+    parser.add_argument("log", nargs="?", default="game_log.ndjson", help="Archivo de registro (.ndjson o .json)")
+    args = parser.parse_args()
+
+    ExperienceLogger(args.log).analyze_and_report(offline=True)
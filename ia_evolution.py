@@ -0,0 +1,222 @@
+import argparse
+import os
+import pickle
+import random
+import time
+import zlib
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+from ia_players import IAE
+from ia_state import IAEState
+from ia_state_store import atomic_write
+from pong_core import HEIGHT, PongMatch
+from tournament_runner import RIVAL_OPTIONS, create_ia
+
+# Entrenamiento evolutivo de IAE.
+#
+# El genoma de una IAE son sus rasgos (iq_velocidad, iq_reaccion, iq_prediccion, de 0 a
+# 100), que fijan su velocidad, su retardo de reacción y el error de su predicción (ver
+# IAE). Los rasgos suman como mucho trait_budget, así que mejorar uno obliga a sacrificar
+# otro. En cada generación cada genoma juega contra todas las IA rivales, sin ventana y
+# repartiendo las partidas en un pool de procesos; la aptitud es la media de los
+# resultados. Después se conservan los mejores (élite) y el resto de la población se
+# rellena con cruces y mutaciones de genomas elegidos por torneo.
+#
+# Las partidas van con la bola más rápida (a velocidad 4 hasta una pala lenta llega a
+# todas) y saques aleatorios en altura y pendiente (con el saque fijo a 45° muchas
+# partidas acaban 0-0 en una trayectoria periódica). La semilla de cada partida sale
+# solo del rival y del número de partida: todos los genomas reciben los mismos saques y
+# la diferencia de aptitud se debe a sus rasgos. Los genes se redondean a una décima,
+# así que el resultado de una partida siempre es el mismo: se guarda en una caché y una
+# pareja ya jugada (la élite, o un hijo repetido) nunca se vuelve a simular. Al final de
+# cada generación se guarda un checkpoint (población, caché, estado del generador
+# aleatorio y parámetros) desde el que se puede continuar con los mismos parámetros.
+
+GENES = IAEState.TRAITS
+GENE_RANGE = (0.0, 100.0)
+MATCH_KWARGS = {"time_limit": 60, "consecutive_score_limit": 2, "point_score_limit": 5, "ball_speed": 10,
+                "random_serve": True}
+
+
+def genome_key(genome):
+    return tuple(round(float(gene), 1) for gene in genome)
+
+
+def match_seed(opponent, match_num):
+    return zlib.crc32(repr((opponent, match_num)).encode("utf-8"))
+
+
+def match_result_score(winner, score1, score2):
+    """
+    Puntuación de una partida para la IAE: 1 si gana, -1 si pierde y 0 si empata, más
+    una décima por cada punto de diferencia.
+    """
+    result = 1.0 if winner == "IAE" else 0.0 if winner == "Empate" else -1.0
+    return result + 0.1 * (score1 - score2)
+
+
+def _play_genome_match(task):
+    key, opponent, match_num = task
+    random.seed(match_seed(opponent, match_num))
+    player = IAE(HEIGHT, 100, initial_state=dict(zip(GENES, key)))
+    rival = create_ia(opponent)
+    match = PongMatch(player, rival, "IAE", opponent, verbose=False, **MATCH_KWARGS)
+    winner, score1, score2 = match.run()
+    return match_result_score(winner, score1, score2)
+
+
+class EvolutionTrainer:
+    """
+    Población de genomas de IAE que se evalúa, selecciona y muta generación a generación.
+    """
+    def __init__(self, population_size=24, opponents=None, matches_per_opponent=4, elite=4, tournament_size=3,
+                 mutation_sigma=8.0, trait_budget=180.0, workers=None, seed=0, checkpoint_path="evolucion_checkpoint.pkl"):
+        self.population_size = population_size
+        self.opponents = list(opponents or RIVAL_OPTIONS)
+        self.matches_per_opponent = matches_per_opponent
+        self.elite = elite
+        self.tournament_size = tournament_size
+        self.mutation_sigma = mutation_sigma
+        self.trait_budget = trait_budget
+        self.workers = workers or cpu_count()
+        self.checkpoint_path = checkpoint_path
+        self.rng = np.random.default_rng(seed)
+
+        self.generation = 0
+        self.population = [self._random_genome() for _ in range(population_size)]
+        self.fitness = None
+        # (genoma, rival, número de partida) -> puntuación
+        self.cache = {}
+        self.history = []
+
+    def _clip(self, genome):
+        genome = np.clip(genome, *GENE_RANGE)
+        total = genome.sum()
+        if total > self.trait_budget:
+            genome = genome * (self.trait_budget / total)
+        return genome_key(genome)
+
+    def _random_genome(self):
+        return self._clip(self.rng.uniform(*GENE_RANGE, size=len(GENES)))
+
+    def evaluate(self, pool):
+        """
+        Aptitud de cada genoma de la población. Solo se juegan las partidas que no
+        están en la caché.
+        """
+        tasks = [(key, opponent, match_num) for key in dict.fromkeys(self.population)
+                 for opponent in self.opponents for match_num in range(self.matches_per_opponent)]
+        missing = [task for task in tasks if task not in self.cache]
+        for task, score in zip(missing, pool.imap(_play_genome_match, missing, chunksize=4)):
+            self.cache[task] = score
+        matches_per_genome = len(self.opponents) * self.matches_per_opponent
+        self.fitness = np.array([sum(self.cache[(key, opponent, match_num)] for opponent in self.opponents
+                                     for match_num in range(self.matches_per_opponent)) / matches_per_genome
+                                 for key in self.population])
+        return len(missing), len(tasks)
+
+    def _select(self):
+        contenders = self.rng.choice(len(self.population), size=self.tournament_size, replace=False)
+        return np.asarray(self.population[contenders[np.argmax(self.fitness[contenders])]])
+
+    def next_generation(self):
+        order = np.argsort(-self.fitness, kind="stable")
+        children = [self.population[i] for i in order[:self.elite]]
+        while len(children) < self.population_size:
+            parent1, parent2 = self._select(), self._select()
+            # Cruce uniforme y mutación gaussiana de cada gen
+            child = np.where(self.rng.random(len(GENES)) < 0.5, parent1, parent2)
+            child = child + self.rng.normal(0.0, self.mutation_sigma, size=len(GENES))
+            children.append(self._clip(child))
+        self.population = children
+        self.fitness = None
+        self.generation += 1
+
+    def best(self):
+        i = int(np.argmax(self.fitness))
+        return self.population[i], float(self.fitness[i])
+
+    def config(self):
+        """
+        Parámetros que tienen que coincidir para continuar desde un checkpoint.
+        """
+        return {"population_size": self.population_size, "opponents": self.opponents,
+                "matches_per_opponent": self.matches_per_opponent, "trait_budget": self.trait_budget}
+
+    def save_checkpoint(self):
+        checkpoint = {
+            "config": self.config(),
+            "generation": self.generation,
+            "population": self.population,
+            "cache": self.cache,
+            "history": self.history,
+            "rng": self.rng.bit_generator.state,
+        }
+        atomic_write(self.checkpoint_path, pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def load_checkpoint(self):
+        """
+        Continúa desde el checkpoint guardado, si existe. Si se guardó con otros
+        parámetros (ver config), lanza ValueError en lugar de mezclarlos.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, "rb") as f:
+            checkpoint = pickle.load(f)
+        saved = checkpoint.get("config", {})
+        different = [f"{key}: {saved.get(key)!r} en el checkpoint, {value!r} ahora"
+                     for key, value in self.config().items() if saved.get(key) != value]
+        if different:
+            raise ValueError(f"El checkpoint {self.checkpoint_path} es de otra configuracion (" + "; ".join(different) + ")")
+        self.generation = checkpoint["generation"]
+        self.population = checkpoint["population"]
+        self.cache = checkpoint["cache"]
+        self.history = checkpoint["history"]
+        self.rng.bit_generator.state = checkpoint["rng"]
+        return True
+
+    def run(self, generations):
+        """
+        Evalúa y reproduce `generations` generaciones, guardando un checkpoint tras cada
+        una. Devuelve el mejor genoma de la última y su aptitud.
+        """
+        with Pool(self.workers) as pool:
+            for _ in range(generations):
+                start = time.time()
+                played, total = self.evaluate(pool)
+                best_key, best_fitness = self.best()
+                self.history.append((self.generation, best_fitness, float(self.fitness.mean()), best_key))
+                print(f"Generacion {self.generation}: mejor {best_fitness:.3f} {dict(zip(GENES, best_key))} | "
+                      f"media {self.fitness.mean():.3f} | {played}/{total} partidas jugadas ({time.time() - start:.1f}s)")
+                self.next_generation()
+                self.save_checkpoint()
+        return best_key, best_fitness
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrenamiento evolutivo de IAE contra las IA de Pong")
+    parser.add_argument("--generations", type=int, default=20, help="Generaciones a entrenar")
+    parser.add_argument("--population", type=int, default=24, help="Genomas por generación")
+    parser.add_argument("--matches", type=int, default=4, help="Partidas contra cada rival por genoma")
+    parser.add_argument("--budget", type=float, default=180.0, help="Suma máxima de los rasgos de un genoma")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del entrenamiento")
+    parser.add_argument("--checkpoint", default="evolucion_checkpoint.pkl", help="Archivo de checkpoint")
+    parser.add_argument("--resume", action="store_true", help="Continuar desde el checkpoint")
+    args = parser.parse_args()
+
+    trainer = EvolutionTrainer(population_size=args.population, matches_per_opponent=args.matches, trait_budget=args.budget,
+                               workers=args.workers, seed=args.seed, checkpoint_path=args.checkpoint)
+    try:
+        resumed = args.resume and trainer.load_checkpoint()
+    except ValueError as e:
+        parser.error(str(e))
+    if resumed:
+        print(f"Continuando desde la generacion {trainer.generation} ({len(trainer.cache)} partidas en cache)")
+    best_key, best_fitness = trainer.run(args.generations)
+    best = IAE(HEIGHT, 100, initial_state=dict(zip(GENES, best_key)))
+    print(f"\nMejor genoma: {dict(zip(GENES, best_key))} (aptitud {best_fitness:.3f})")
+    print(f"Velocidad {best.velocidad_base:.1f} | retardo {best.reaction_delay} fotogramas | "
+          f"error de prediccion {best.prediction_noise:.1f} px")
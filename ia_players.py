@@ -1,44 +1,195 @@
 import random
 import numpy as np
 import time
+from collections import deque
+
+from ia_state import IAState, IADState, IAAState, IAJState, IAFState, IACState, IALState, IAMState, IARState, IAEState
 
 # Constantes del juego para las IAs
 PADDLE_WIDTH = 15
 BALL_SIZE = 15
 
+# Columnas de las observaciones de move_batch: una fila por partida con la bola
+# (posicion y velocidad) y la posicion de hasta MAX_PADDLES paletas. Las IA de una
+# sola paleta usan solo la primera columna de paletas.
+OBS_BALL_X = 0
+OBS_BALL_Y = 1
+OBS_BALL_SPEED_X = 2
+OBS_BALL_SPEED_Y = 3
+OBS_PADDLE_Y = 4
+MAX_PADDLES = 5
+OBS_SIZE = OBS_PADDLE_Y + MAX_PADDLES
+
+
+def make_observations(ball_x, ball_y, ball_speed_x, ball_speed_y, paddles_y):
+    """
+    Construye el array de observaciones (n, OBS_SIZE) para n partidas. `paddles_y`
+    tiene forma (n,) o (n, numero de paletas).
+    """
+    ball_x = np.asarray(ball_x, dtype=np.float64)
+    observations = np.zeros((ball_x.size, OBS_SIZE), dtype=np.float64)
+    observations[:, OBS_BALL_X] = ball_x
+    observations[:, OBS_BALL_Y] = ball_y
+    observations[:, OBS_BALL_SPEED_X] = ball_speed_x
+    observations[:, OBS_BALL_SPEED_Y] = ball_speed_y
+    paddles_y = np.asarray(paddles_y, dtype=np.float64).reshape(ball_x.size, -1)
+    observations[:, OBS_PADDLE_Y:OBS_PADDLE_Y + paddles_y.shape[1]] = paddles_y
+    return observations
+
 # ====================================================================
 # Clase base para las IAs
 # ====================================================================
 class IA:
+    num_paddles = 1
+    # Si move() recibe tambien ball_x y la velocidad de la bola (IAA, IAL, IAE)
+    uses_ball_speed = False
+    # Clase del estado (rasgos, IQ y sentimiento), ver ia_state
+    state_class = IAState
+
+    # Parametros de juego que salen de los rasgos: (atributo, rasgo, valor con el rasgo
+    # a 0, valor con el rasgo a 100). El rasgo se recorta a 0-100 y se interpola; si los
+    # dos valores son enteros el parametro se redondea (fotogramas, pixeles). Con el
+    # rasgo a 75, la mitad del rango inicial, cada IA juega con sus valores de siempre.
+    TRAIT_PARAMETERS = ()
+    # Fotogramas de retraso con que ve la bola y desviacion tipica, en pixeles, del
+    # punto de llegada que predice (solo las IA que predicen)
+    reaction_delay = 0
+    prediction_noise = 0.0
+
     def __init__(self, screen_height, paddle_height, initial_state=None):
         self.screen_height = screen_height
         self.paddle_height = paddle_height
-        self.state = {"iq": 0.0, "sentimiento": "neutral"}
+        self.state = self.state_class(initial_state)
         self.initial_iq = 0.0
         self.final_iq = 0.0
         self.screen_width = 800
-        if initial_state:
-            self.state.update(initial_state)
+        # Bolas vistas por move() (la mas antigua es la que ve) y error de prediccion
+        self.seen_balls = deque(maxlen=1)
+        self.approaching = False
+        self.error = 0.0
+        self.batch_direction = None
+        self.apply_traits()
+
+    def apply_traits(self):
+        """
+        Recalcula los parametros de TRAIT_PARAMETERS con los rasgos actuales.
+        """
+        for attribute, trait, at_0, at_100 in self.TRAIT_PARAMETERS:
+            level = min(max(self.state[trait] / 100.0, 0.0), 1.0)
+            value = at_0 + (at_100 - at_0) * level
+            if isinstance(at_0, int) and isinstance(at_100, int):
+                value = int(round(value))
+            setattr(self, attribute, value)
+        if self.seen_balls.maxlen != self.reaction_delay + 1:
+            self.seen_balls = deque(self.seen_balls, maxlen=self.reaction_delay + 1)
 
     def move(self, ball_y, paddle_y):
         raise NotImplementedError("Este metodo debe ser implementado por las subclases")
 
+    def move_batch(self, observations):
+        """
+        Movimiento para muchas partidas a la vez. Recibe un array (n, OBS_SIZE) de
+        observaciones y devuelve las velocidades de las paletas, con forma (n, num_paddles).
+        """
+        raise NotImplementedError("Este metodo debe ser implementado por las subclases")
+
+    def _follow(self, target_y, paddle_y):
+        # Velocidad base hacia el objetivo, o 0 si el centro de la paleta ya esta en el
+        return np.sign(target_y - (paddle_y + self.paddle_height / 2)) * self.velocidad_base
+
+    def _seen_ball(self, ball):
+        # Lo que ve move() de la bola, con reaction_delay fotogramas de retraso
+        self.seen_balls.append(ball)
+        return self.seen_balls[0]
+
+    def _prediction_error(self, approaching):
+        # Se sortea un error nuevo cada vez que la bola (vista) empieza a venir hacia la IA
+        if approaching and not self.approaching:
+            self.error = random.gauss(0.0, self.prediction_noise)
+        self.approaching = approaching
+        return self.error
+
+    def _batch_state(self, num_games):
+        """
+        Estado de cada partida en move_batch: direccion y contador de fotogramas (IA que
+        cambian de direccion cada cierto tiempo), ultimos fotogramas vistos y error de
+        prediccion. Se reinicia si cambia el numero de partidas.
+        """
+        if self.batch_direction is None or len(self.batch_direction) != num_games:
+            self.batch_direction = np.zeros(num_games, dtype=np.float64)
+            self.batch_change_frame = np.zeros(num_games, dtype=np.int64)
+            self.batch_history = []
+            self.batch_approaching = np.zeros(num_games, dtype=bool)
+            self.batch_error = np.zeros(num_games, dtype=np.float64)
+            # Generador de los sorteos de move_batch, sembrado desde random para que
+            # random.seed siga fijando la partida
+            self.batch_rng = np.random.default_rng(random.getrandbits(64))
+        return self.batch_direction, self.batch_change_frame
+
+    def reset_batch(self, games):
+        """
+        Reinicia el estado de move_batch de las partidas indicadas (mascara o indices),
+        para cuando una de ellas vuelve a empezar.
+        """
+        if self.batch_direction is not None:
+            self.batch_direction[games] = 0
+            self.batch_change_frame[games] = 0
+            # Los fotogramas anteriores de esas partidas se marcan con NaN y se ignoran
+            for frame in self.batch_history:
+                frame[games] = np.nan
+            self.batch_approaching[games] = False
+            self.batch_error[games] = 0.0
+
+    def _seen_observations(self, observations):
+        """
+        Observaciones que ve la IA en cada partida, con reaction_delay fotogramas de
+        retraso (o las mas antiguas que haya desde que empezo la partida).
+        """
+        self._batch_state(len(observations))
+        if self.reaction_delay == 0:
+            return observations
+        self.batch_history.append(observations.copy())
+        while len(self.batch_history) > self.reaction_delay + 1:
+            del self.batch_history[0]
+        seen = self.batch_history[0].copy()
+        for frame in self.batch_history[1:]:
+            missing = np.isnan(seen[:, OBS_BALL_X])
+            if not missing.any():
+                break
+            seen[missing] = frame[missing]
+        return seen
+
+    def _batch_prediction_error(self, approaching):
+        # Como _prediction_error, con un solo sorteo para todas las partidas
+        self._batch_state(len(approaching))
+        new_error = approaching & ~self.batch_approaching
+        self.batch_error[new_error] = self.batch_rng.normal(0.0, self.prediction_noise, size=np.count_nonzero(new_error))
+        self.batch_approaching = approaching
+        return self.batch_error
+
+    def _change_directions(self, change_every, options):
+        # Un solo sorteo para todas las partidas a las que les toca cambiar de direccion
+        direction, change_frame = self.batch_direction, self.batch_change_frame
+        due = change_frame >= change_every
+        direction[due] = self.batch_rng.choice(options, size=np.count_nonzero(due))
+        change_frame[due] = 0
+        change_frame += 1
+
     def get_iq(self):
         """
         Devuelve el valor actual de la IQ de la IA.
         """
-        return self.state.get("iq", 0.0)
+        return self.state.iq
 
     def get_experience(self, final_score):
         """
-        Calcula y registra la experiencia de la IA, actualizando su IQ y sentimiento.
+        Calcula y registra la experiencia de la IA, actualizando su IQ y sentimiento
+        segun las tablas de su clase de estado. Sus parametros de juego siguen a los
+        rasgos.
         """
-        # La logica de actualizacion de IQ y sentimiento se maneja en cada subclase
-        experience = {
-            "final_score": final_score,
-            "state": self.state
-        }
-        return experience
+        self.state.apply_result(final_score)
+        self.apply_traits()
+        return {"final_score": final_score, "state": self.state}
 
 # ====================================================================
 # Implementaciones de las IAs
@@ -49,19 +200,18 @@ class IAD(IA):
     """
     IA Diablo: Juega con movimientos aleatorios.
     """
+    state_class = IADState
+    # iq_adaptabilidad no cambia al jugar (ver IADState), asi que no mueve ningun parametro
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_caos", 2.0, 6.0),
+                        ("change_every", "iq_imprevisibilidad", 60, 20))
+
     def __init__(self, screen_height, paddle_height, initial_state=None):
         super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 5
         self.move_direction = 0
         self.move_change_frame = 0
-        
-        self.state["iq_caos"] = initial_state.get("iq_caos", random.uniform(50.0, 100.0))
-        self.state["iq_imprevisibilidad"] = initial_state.get("iq_imprevisibilidad", random.uniform(50.0, 100.0))
-        self.state["iq_adaptabilidad"] = initial_state.get("iq_adaptabilidad", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "diversion")
 
     def move(self, ball_y, paddle_y):
-        if self.move_change_frame >= 30:
+        if self.move_change_frame >= self.change_every:
             self.move_direction = random.choice([-self.velocidad_base, self.velocidad_base])
             self.move_change_frame = 0
         
@@ -73,41 +223,31 @@ class IAD(IA):
             self.move_direction = -self.velocidad_base
             
         return self.move_direction
-        
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_caos"] += random.uniform(1.0, 3.0)
-            self.state["iq_imprevisibilidad"] += random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "alegria caotica"
-        elif final_score == -1:
-            self.state["iq_caos"] -= random.uniform(1.0, 3.0)
-            self.state["iq_imprevisibilidad"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "frustracion"
-        else:
-            self.state["sentimiento"] = "diversion"
 
-        self.state["iq"] = (self.state["iq_caos"] + self.state["iq_imprevisibilidad"] + self.state["iq_adaptabilidad"]) / 3
-        
-        return {"final_score": final_score, "state": self.state}
+    def move_batch(self, observations):
+        direction, _ = self._batch_state(len(observations))
+        self._change_directions(self.change_every, [-self.velocidad_base, self.velocidad_base])
+
+        paddle_y = observations[:, OBS_PADDLE_Y]
+        direction[paddle_y <= 0] = self.velocidad_base
+        direction[paddle_y + self.paddle_height >= self.screen_height] = -self.velocidad_base
+        return direction.copy()[:, None]
 
 # Implementación de IAA (Adivina)
 class IAA(IA):
     """
     IA Adivina: Intenta predecir la posicion de la bola.
     """
-    def __init__(self, screen_height, paddle_height, initial_state=None):
-        super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 7
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_prediccion"] = initial_state.get("iq_prediccion", random.uniform(50.0, 100.0))
-        self.state["iq_precision"] = initial_state.get("iq_precision", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "concentracion")
+    state_class = IAAState
+    uses_ball_speed = True
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_precision", 4.0, 8.0),
+                        ("prediction_noise", "iq_prediccion", 40.0, 0.0))
 
     def move(self, ball_y, paddle_y, ball_x, ball_speed_x, ball_speed_y):
+        error = self._prediction_error(ball_speed_x < 0)
         if ball_speed_x < 0:
             time_to_reach_paddle = (ball_x - (10 + PADDLE_WIDTH)) / -ball_speed_x
-            predicted_y = ball_y + time_to_reach_paddle * ball_speed_y
+            predicted_y = ball_y + time_to_reach_paddle * ball_speed_y + error
             
             if predicted_y > paddle_y + self.paddle_height/2:
                 return self.velocidad_base
@@ -116,76 +256,58 @@ class IAA(IA):
         
         return 0
 
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_prediccion"] += random.uniform(2.0, 5.0)
-            self.state["iq_precision"] += random.uniform(2.0, 5.0)
-            self.state["sentimiento"] = "satisfaccion"
-        elif final_score == -1:
-            self.state["iq_prediccion"] -= random.uniform(1.0, 3.0)
-            self.state["iq_precision"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "decepcion"
-        else:
-            self.state["sentimiento"] = "concentracion"
-        
-        self.state["iq"] = (self.state["iq_prediccion"] + self.state["iq_precision"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
+    def move_batch(self, observations):
+        ball_x, ball_y = observations[:, OBS_BALL_X], observations[:, OBS_BALL_Y]
+        speed_x, speed_y = observations[:, OBS_BALL_SPEED_X], observations[:, OBS_BALL_SPEED_Y]
+        approaching = speed_x < 0
+        error = self._batch_prediction_error(approaching)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time_to_reach_paddle = (ball_x - (10 + PADDLE_WIDTH)) / -speed_x
+        predicted_y = ball_y + time_to_reach_paddle * speed_y + error
+        movement = np.where(approaching, self._follow(predicted_y, observations[:, OBS_PADDLE_Y]), 0.0)
+        return movement[:, None]
 
 # Implementación de IAJ (Jugadora)
 class IAJ(IA):
     """
     IA Jugadora: Se enfoca en la sensacion del juego.
     """
-    def __init__(self, screen_height, paddle_height, initial_state=None):
-        super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 30
-        self.state["sentimiento"] = initial_state.get("sentimiento", "frustracion y sed de venganza")
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_emocional"] = initial_state.get("iq_emocional", random.uniform(50.0, 100.0))
-        self.state["iq_motivacion"] = initial_state.get("iq_motivacion", random.uniform(50.0, 100.0))
+    state_class = IAJState
+    # dead_zone: distancia, en pixeles, a la que deja de perseguir la bola
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_motivacion", 6.0, 38.0),
+                        ("dead_zone", "iq_emocional", 25, 5))
 
     def move(self, ball_y, paddle_y):
-        if abs(paddle_y + self.paddle_height/2 - ball_y) > 10:
+        if abs(paddle_y + self.paddle_height/2 - ball_y) > self.dead_zone:
             if ball_y > paddle_y + self.paddle_height/2:
                 return self.velocidad_base
             else:
                 return -self.velocidad_base
         return 0
 
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["sentimiento"] = "victoria y poder absoluto"
-            self.state["iq_emocional"] += random.randint(10, 20)
-            self.state["iq_motivacion"] += random.randint(5, 10)
-        elif final_score == -1:
-            self.state["sentimiento"] = "frustracion y sed de venganza"
-            self.state["iq_emocional"] -= random.randint(5, 10)
-            self.state["iq_motivacion"] -= random.randint(1, 5)
-        else:
-            self.state["sentimiento"] = "determinacion"
-
-        self.state["iq"] = (self.state["iq_emocional"] + self.state["iq_motivacion"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
+    def move_batch(self, observations):
+        ball_y = observations[:, OBS_BALL_Y]
+        paddle_center = observations[:, OBS_PADDLE_Y] + self.paddle_height / 2
+        towards_ball = np.where(ball_y > paddle_center, self.velocidad_base, -self.velocidad_base)
+        movement = np.where(np.abs(paddle_center - ball_y) > self.dead_zone, towards_ball, 0.0)
+        return movement[:, None]
 
 # Implementación de IAF (Flotadora)
 class IAF(IA):
     """
     IA Flotadora: Utiliza multiples paletas.
     """
+    state_class = IAFState
+    num_paddles = 5
+    # paddle_spacing: distancia entre las paletas
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_coordinacion", 1.5, 3.5),
+                        ("paddle_spacing", "iq_estrategia", 60, 20))
+
     def __init__(self, screen_height, initial_state=None):
+        # Las paletas se sortean antes que los rasgos del estado, como siempre
+        paddles = [random.randint(0, screen_height - 50) for _ in range(self.num_paddles)]
         super().__init__(screen_height, 50, initial_state) # Asignamos un alto fijo para las paletas de IAF
-        self.velocidad_base = 3
-        self.num_paddles = 5
-        self.paddles = [random.randint(0, screen_height - self.paddle_height) for _ in range(self.num_paddles)]
-        self.paddle_spacing = 30 # Distancia entre las paletas
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_coordinacion"] = initial_state.get("iq_coordinacion", random.uniform(50.0, 100.0))
-        self.state["iq_estrategia"] = initial_state.get("iq_estrategia", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "fluidez")
+        self.paddles = paddles
 
     def move(self, ball_y, paddles_y):
         movement = [0] * self.num_paddles
@@ -215,79 +337,60 @@ class IAF(IA):
                     movement[i] = -self.velocidad_base
 
         return movement
-        
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_coordinacion"] += random.uniform(2.0, 5.0)
-            self.state["iq_estrategia"] += random.uniform(2.0, 5.0)
-            self.state["sentimiento"] = "armonia"
-        elif final_score == -1:
-            self.state["iq_coordinacion"] -= random.uniform(1.0, 3.0)
-            self.state["iq_estrategia"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "desorganizacion"
-        else:
-            self.state["sentimiento"] = "fluidez"
 
-        self.state["iq"] = (self.state["iq_coordinacion"] + self.state["iq_estrategia"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
+    def move_batch(self, observations):
+        paddles_y = observations[:, OBS_PADDLE_Y:OBS_PADDLE_Y + self.num_paddles]
+        mid = self.num_paddles // 2
+        gap = self.paddle_spacing + self.paddle_height
+        movement = np.empty_like(paddles_y)
+
+        # Paleta central: sigue la bola. Las demas mantienen la distancia con su vecina
+        movement[:, mid] = self._follow(observations[:, OBS_BALL_Y], paddles_y[:, mid])
+        movement[:, :mid] = np.sign(paddles_y[:, 1:mid + 1] - gap - paddles_y[:, :mid]) * self.velocidad_base
+        movement[:, mid + 1:] = np.sign(paddles_y[:, mid:-1] + gap - paddles_y[:, mid + 1:]) * self.velocidad_base
+        return movement
 
 # Implementación de IAC (Cautelin)
 class IAC(IA):
     """
     IA Cautelin: Juega de forma mas pasiva, moviendose aleatoriamente.
     """
+    state_class = IACState
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_cautela", 1.5, 3.5),
+                        ("change_every", "iq_paciencia", 30, 70))
+
     def __init__(self, screen_height, paddle_height, initial_state=None):
         super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 3
         self.move_direction = 0
         self.move_change_frame = 0
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
 
-        self.state["iq_cautela"] = initial_state.get("iq_cautela", random.uniform(50.0, 100.0))
-        self.state["iq_paciencia"] = initial_state.get("iq_paciencia", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "calma")
 
     def move(self, ball_y, paddle_y):
-        if self.move_change_frame >= 60:
+        if self.move_change_frame >= self.change_every:
             self.move_direction = random.choice([-self.velocidad_base, self.velocidad_base, 0])
             self.move_change_frame = 0
         
         self.move_change_frame += 1
         
         return self.move_direction
-    
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_cautela"] += random.uniform(1.0, 3.0)
-            self.state["iq_paciencia"] += random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "satisfaccion pasiva"
-        elif final_score == -1:
-            self.state["iq_cautela"] -= random.uniform(1.0, 3.0)
-            self.state["iq_paciencia"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "molestia"
-        else:
-            self.state["sentimiento"] = "calma"
 
-        self.state["iq"] = (self.state["iq_cautela"] + self.state["iq_paciencia"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
+    def move_batch(self, observations):
+        direction, _ = self._batch_state(len(observations))
+        self._change_directions(self.change_every, [-self.velocidad_base, self.velocidad_base, 0])
+        return direction.copy()[:, None]
 
 # Implementación de IAL (Logico)
 class IAL(IA):
     """
     IA Logico: Calcula donde va a llegar la pelota.
     """
-    def __init__(self, screen_height, paddle_height, initial_state=None):
-        super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 7
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_analisis"] = initial_state.get("iq_analisis", random.uniform(50.0, 100.0))
-        self.state["iq_logica"] = initial_state.get("iq_logica", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "calculo")
-        
+    state_class = IALState
+    uses_ball_speed = True
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_logica", 4.0, 8.0),
+                        ("prediction_noise", "iq_analisis", 40.0, 0.0))
+
     def move(self, ball_y, paddle_y, ball_x, ball_speed_x, ball_speed_y):
+        error = self._prediction_error(ball_speed_x < 0)
         if ball_speed_x > 0:
             return 0
         
@@ -299,6 +402,7 @@ class IAL(IA):
             predicted_y = (self.screen_height - predicted_y) % self.screen_height
         else:
             predicted_y = predicted_y % self.screen_height
+        predicted_y += error
             
         if predicted_y > paddle_y + self.paddle_height / 2:
             return self.velocidad_base
@@ -306,96 +410,113 @@ class IAL(IA):
             return -self.velocidad_base
         
         return 0
-        
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_analisis"] += random.uniform(2.0, 5.0)
-            self.state["iq_logica"] += random.uniform(2.0, 5.0)
-            self.state["sentimiento"] = "placer intelectual"
-        elif final_score == -1:
-            self.state["iq_analisis"] -= random.uniform(1.0, 3.0)
-            self.state["iq_logica"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "error en los datos"
-        else:
-            self.state["sentimiento"] = "analisis continuo"
-        
-        self.state["iq"] = (self.state["iq_analisis"] + self.state["iq_logica"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
-        
+
+    def move_batch(self, observations):
+        ball_x, ball_y = observations[:, OBS_BALL_X], observations[:, OBS_BALL_Y]
+        speed_x, speed_y = observations[:, OBS_BALL_SPEED_X], observations[:, OBS_BALL_SPEED_Y]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time_to_reach = (ball_x - (10 + PADDLE_WIDTH)) / -speed_x
+            predicted_y = ball_y + speed_y * time_to_reach
+
+            # Rebotes en las paredes: con un numero impar de rebotes la trayectoria se refleja
+            num_bounces = np.trunc(predicted_y / self.screen_height)
+            predicted_y = np.where(np.mod(num_bounces, 2) == 1,
+                                   np.mod(self.screen_height - predicted_y, self.screen_height),
+                                   np.mod(predicted_y, self.screen_height))
+        predicted_y = predicted_y + self._batch_prediction_error(speed_x < 0)
+        movement = np.where(speed_x < 0, self._follow(predicted_y, observations[:, OBS_PADDLE_Y]), 0.0)
+        return movement[:, None]
+
 # Implementación de IAM (Movi)
 class IAM(IA):
     """
     IA Movi: Mueve la paleta de forma reactiva y constante.
     """
-    def __init__(self, screen_height, paddle_height, initial_state=None):
-        super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 5
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_reactividad"] = initial_state.get("iq_reactividad", random.uniform(50.0, 100.0))
-        self.state["iq_constancia"] = initial_state.get("iq_constancia", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "determinacion")
+    state_class = IAMState
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_constancia", 2.0, 6.0),
+                        ("reaction_delay", "iq_reactividad", 12, 0))
 
     def move(self, ball_y, paddle_y):
+        ball_y = self._seen_ball(ball_y)
         if ball_y > paddle_y + self.paddle_height/2:
             return self.velocidad_base
         elif ball_y < paddle_y + self.paddle_height/2:
             return -self.velocidad_base
         return 0
-    
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_reactividad"] += random.uniform(1.0, 3.0)
-            self.state["iq_constancia"] += random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "ritmo optimo"
-        elif final_score == -1:
-            self.state["iq_reactividad"] -= random.uniform(1.0, 3.0)
-            self.state["iq_constancia"] -= random.uniform(1.0, 3.0)
-            self.state["sentimiento"] = "ritmo roto"
-        else:
-            self.state["sentimiento"] = "fluidez constante"
-        
-        self.state["iq"] = (self.state["iq_reactividad"] + self.state["iq_constancia"]) / 2
-        
-        return {"final_score": final_score, "state": self.state}
-        
+
+    def move_batch(self, observations):
+        seen = self._seen_observations(observations)
+        return self._follow(seen[:, OBS_BALL_Y], observations[:, OBS_PADDLE_Y])[:, None]
+
 # Implementación de IAR (Velocidad)
 class IAR(IA):
     """
     IA de Velocidad: Muy rapida, pero con logica simple.
     """
-    def __init__(self, screen_height, paddle_height, initial_state=None):
-        super().__init__(screen_height, paddle_height, initial_state)
-        self.velocidad_base = 10
-        self.state["iq"] = initial_state.get("iq", 0.0) if initial_state else 0.0
-        
-        self.state["iq_reaccion"] = initial_state.get("iq_reaccion", random.uniform(50.0, 100.0))
-        self.state["iq_velocidad"] = initial_state.get("iq_velocidad", random.uniform(50.0, 100.0))
-        self.state["iq_agresividad"] = initial_state.get("iq_agresividad", random.uniform(50.0, 100.0))
-        self.state["sentimiento"] = initial_state.get("sentimiento", "impulsividad")
+    state_class = IARState
+    # dead_zone: distancia, en pixeles, a la que deja de perseguir la bola
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_velocidad", 4.0, 12.0),
+                        ("reaction_delay", "iq_reaccion", 8, 0),
+                        ("dead_zone", "iq_agresividad", 20, 0))
 
     def move(self, ball_y, paddle_y):
-        if ball_y > paddle_y + self.paddle_height/2:
+        ball_y = self._seen_ball(ball_y)
+        if ball_y > paddle_y + self.paddle_height/2 + self.dead_zone:
             return self.velocidad_base
-        elif ball_y < paddle_y + self.paddle_height/2:
+        elif ball_y < paddle_y + self.paddle_height/2 - self.dead_zone:
             return -self.velocidad_base
         return 0
-        
-    def get_experience(self, final_score):
-        if final_score == 1:
-            self.state["iq_reaccion"] += random.uniform(5.0, 10.0)
-            self.state["iq_velocidad"] += random.uniform(5.0, 10.0)
-            self.state["iq_agresividad"] += random.uniform(5.0, 10.0)
-            self.state["sentimiento"] = "euforia"
-        elif final_score == -1:
-            self.state["iq_reaccion"] -= random.uniform(3.0, 7.0)
-            self.state["iq_velocidad"] -= random.uniform(3.0, 7.0)
-            self.state["iq_agresividad"] -= random.uniform(3.0, 7.0)
-            self.state["sentimiento"] = "furia"
+
+    def move_batch(self, observations):
+        ball_y = self._seen_observations(observations)[:, OBS_BALL_Y]
+        paddle_y = observations[:, OBS_PADDLE_Y]
+        movement = np.where(np.abs(ball_y - (paddle_y + self.paddle_height / 2)) > self.dead_zone,
+                            self._follow(ball_y, paddle_y), 0.0)
+        return movement[:, None]
+
+# Implementación de IAE (Evolutiva)
+class IAE(IA):
+    """
+    IA Evolutiva: predice donde llega la bola, como IAL. Sus rasgos son su genoma: no
+    cambian al jugar y solo se entrenan con ia_evolution.
+    """
+    state_class = IAEState
+    uses_ball_speed = True
+    TRAIT_PARAMETERS = (("velocidad_base", "iq_velocidad", 2.0, 14.0),
+                        ("reaction_delay", "iq_reaccion", 12, 0),
+                        ("prediction_noise", "iq_prediccion", 120.0, 0.0))
+
+    def move(self, ball_y, paddle_y, ball_x, ball_speed_x, ball_speed_y):
+        ball_x, ball_y, speed_x, speed_y = self._seen_ball((ball_x, ball_y, ball_speed_x, ball_speed_y))
+        approaching = speed_x < 0
+        error = self._prediction_error(approaching)
+
+        if approaching:
+            time_to_reach = (ball_x - (10 + PADDLE_WIDTH)) / -speed_x
+            predicted_y = (ball_y + speed_y * time_to_reach) % (2 * self.screen_height)
+            if predicted_y > self.screen_height:
+                predicted_y = 2 * self.screen_height - predicted_y
+            target_y = predicted_y + error
         else:
-            self.state["sentimiento"] = "impulsividad"
-        
-        self.state["iq"] = (self.state["iq_reaccion"] + self.state["iq_velocidad"] + self.state["iq_agresividad"]) / 3
-            
-        return {"final_score": final_score, "state": self.state}
\ No newline at end of file
+            target_y = self.screen_height / 2
+        paddle_center = paddle_y + self.paddle_height / 2
+        if target_y > paddle_center:
+            return self.velocidad_base
+        elif target_y < paddle_center:
+            return -self.velocidad_base
+        return 0
+
+    def move_batch(self, observations):
+        seen = self._seen_observations(observations)
+        ball_x, ball_y = seen[:, OBS_BALL_X], seen[:, OBS_BALL_Y]
+        speed_x, speed_y = seen[:, OBS_BALL_SPEED_X], seen[:, OBS_BALL_SPEED_Y]
+        approaching = speed_x < 0
+        error = self._batch_prediction_error(approaching)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time_to_reach = (ball_x - (10 + PADDLE_WIDTH)) / -speed_x
+            # Rebotes en las paredes: la trayectoria es una onda triangular de periodo 2 * alto
+            predicted_y = np.mod(ball_y + speed_y * time_to_reach, 2 * self.screen_height)
+        predicted_y = np.where(predicted_y > self.screen_height, 2 * self.screen_height - predicted_y, predicted_y)
+        target_y = np.where(approaching, predicted_y + error, self.screen_height / 2)
+        return self._follow(target_y, observations[:, OBS_PADDLE_Y])[:, None]
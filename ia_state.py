@@ -0,0 +1,287 @@
+import random
+
+import numpy as np
+
+# Estado de las IA de Pong.
+#
+# Cada tipo de IA tiene su clase de estado con __slots__ y una tabla de rasgos a nivel de
+# clase: los nombres de sus rasgos numéricos (iq_caos, iq_prediccion, ...), los pesos de
+# cada uno en la IQ, cuánto suben al ganar y bajan al perder y los sentimientos. Los
+# rasgos de cada IA se guardan en un pequeño array float64 y la IQ (su media ponderada)
+# se cachea hasta que cambia algún rasgo; no se puede asignar (state["iq"] = x lanza
+# TypeError). El estado se usa como un diccionario
+# (state["iq_caos"], state.get("sentimiento")) y solo se convierte a dict/JSON al
+# guardarlo (to_dict).
+#
+# IAPopulation aplica las mismas tablas a miles de IA a la vez, con los rasgos de todas
+# en un único array (IA, rasgos): 10.000 IA ocupan unos cientos de KB.
+
+INITIAL_TRAIT_RANGE = (50.0, 100.0)
+
+# Posición de cada sentimiento en SENTIMIENTOS (tras ganar, perder, empatar) y del inicial
+WIN, LOSS, DRAW, INITIAL = range(4)
+
+
+class IAState:
+    """
+    Estado de una IA: rasgos en un array float64 (en el orden de TRAITS), IQ cacheada,
+    sentimiento y, en `extras`, las claves de estados guardados que no son rasgos.
+    """
+    __slots__ = ("_traits", "_iq", "sentimiento", "extras")
+
+    TRAITS = ()
+    IQ_WEIGHTS = None
+    # Cambio de cada rasgo al ganar y al perder: (mínimo, máximo) o None si no cambia
+    WIN_CHANGE = ()
+    LOSS_CHANGE = ()
+    INTEGER_CHANGES = False
+    # Sentimiento tras ganar, perder y empatar, y al crear la IA sin sentimiento guardado
+    SENTIMIENTOS = ("neutral", "neutral", "neutral", "neutral")
+
+    _INDEX = {}
+    _WEIGHTS = np.zeros(0)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._INDEX = {name: i for i, name in enumerate(cls.TRAITS)}
+        cls._WEIGHTS = np.ones(len(cls.TRAITS)) if cls.IQ_WEIGHTS is None else np.asarray(cls.IQ_WEIGHTS, dtype=np.float64)
+
+    def __init__(self, initial_state=None):
+        initial_state = initial_state or {}
+        # Se sortea un valor para cada rasgo aunque venga guardado, así la secuencia de
+        # números aleatorios es la misma haya o no estado guardado
+        self._traits = np.array([initial_state.get(name, random.uniform(*INITIAL_TRAIT_RANGE)) for name in self.TRAITS],
+                                dtype=np.float64)
+        self._iq = None
+        self.sentimiento = initial_state.get("sentimiento", self.SENTIMIENTOS[INITIAL])
+        self.extras = {key: value for key, value in initial_state.items()
+                       if key not in self._INDEX and key not in ("iq", "sentimiento")}
+
+    @property
+    def traits(self):
+        """
+        Vista de solo lectura de los rasgos. Para cambiarlos, add_traits o state[nombre].
+        """
+        view = self._traits.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def iq(self):
+        if self._iq is None:
+            self._iq = float((self._traits * self._WEIGHTS).sum() / self._WEIGHTS.sum()) if len(self._traits) else 0.0
+        return self._iq
+
+    def add_traits(self, deltas):
+        self._traits += deltas
+        self._iq = None
+
+    def apply_result(self, final_score):
+        """
+        Actualiza rasgos y sentimiento tras una partida (1 gana, -1 pierde, otro empate).
+        """
+        if final_score == 1:
+            changes, sign, self.sentimiento = self.WIN_CHANGE, 1, self.SENTIMIENTOS[WIN]
+        elif final_score == -1:
+            changes, sign, self.sentimiento = self.LOSS_CHANGE, -1, self.SENTIMIENTOS[LOSS]
+        else:
+            changes, sign, self.sentimiento = (), 0, self.SENTIMIENTOS[DRAW]
+        if changes:
+            draw = random.randint if self.INTEGER_CHANGES else random.uniform
+            self.add_traits([sign * draw(*change) if change else 0.0 for change in changes])
+
+    # --- Acceso como diccionario ---
+
+    def __getitem__(self, key):
+        if key == "iq":
+            return self.iq
+        if key == "sentimiento":
+            return self.sentimiento
+        index = self._INDEX.get(key)
+        if index is not None:
+            return float(self._traits[index])
+        return self.extras[key]
+
+    def __setitem__(self, key, value):
+        if key == "iq":
+            raise TypeError("La IQ se calcula a partir de los rasgos y no se puede asignar; cambia los rasgos")
+        if key == "sentimiento":
+            self.sentimiento = value
+            return
+        index = self._INDEX.get(key)
+        if index is not None:
+            self._traits[index] = value
+            self._iq = None
+        else:
+            self.extras[key] = value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in ("iq", "sentimiento") or key in self._INDEX or key in self.extras
+
+    def keys(self):
+        return ["iq", "sentimiento", *self.TRAITS, *self.extras]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return 2 + len(self.TRAITS) + len(self.extras)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def update(self, values):
+        """
+        Copia los valores de un diccionario de estado. Su "iq", si la trae (como los de
+        to_dict), se ignora: se recalcula a partir de los rasgos.
+        """
+        for key, value in values.items():
+            if key != "iq":
+                self[key] = value
+
+    def to_dict(self):
+        state = {"iq": self.iq, "sentimiento": self.sentimiento}
+        state.update(zip(self.TRAITS, self._traits.tolist()))
+        state.update(self.extras)
+        return state
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class IADState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_caos", "iq_imprevisibilidad", "iq_adaptabilidad")
+    WIN_CHANGE = ((1.0, 3.0), (1.0, 3.0), None)
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0), None)
+    SENTIMIENTOS = ("alegria caotica", "frustracion", "diversion", "diversion")
+
+
+class IAAState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_prediccion", "iq_precision")
+    WIN_CHANGE = ((2.0, 5.0), (2.0, 5.0))
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    SENTIMIENTOS = ("satisfaccion", "decepcion", "concentracion", "concentracion")
+
+
+class IAJState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_emocional", "iq_motivacion")
+    WIN_CHANGE = ((10, 20), (5, 10))
+    LOSS_CHANGE = ((5, 10), (1, 5))
+    INTEGER_CHANGES = True
+    SENTIMIENTOS = ("victoria y poder absoluto", "frustracion y sed de venganza", "determinacion",
+                    "frustracion y sed de venganza")
+
+
+class IAFState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_coordinacion", "iq_estrategia")
+    WIN_CHANGE = ((2.0, 5.0), (2.0, 5.0))
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    SENTIMIENTOS = ("armonia", "desorganizacion", "fluidez", "fluidez")
+
+
+class IACState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_cautela", "iq_paciencia")
+    WIN_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    SENTIMIENTOS = ("satisfaccion pasiva", "molestia", "calma", "calma")
+
+
+class IALState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_analisis", "iq_logica")
+    WIN_CHANGE = ((2.0, 5.0), (2.0, 5.0))
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    SENTIMIENTOS = ("placer intelectual", "error en los datos", "analisis continuo", "calculo")
+
+
+class IAMState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_reactividad", "iq_constancia")
+    WIN_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    LOSS_CHANGE = ((1.0, 3.0), (1.0, 3.0))
+    SENTIMIENTOS = ("ritmo optimo", "ritmo roto", "fluidez constante", "determinacion")
+
+
+class IARState(IAState):
+    __slots__ = ()
+    TRAITS = ("iq_reaccion", "iq_velocidad", "iq_agresividad")
+    WIN_CHANGE = ((5.0, 10.0), (5.0, 10.0), (5.0, 10.0))
+    LOSS_CHANGE = ((3.0, 7.0), (3.0, 7.0), (3.0, 7.0))
+    SENTIMIENTOS = ("euforia", "furia", "impulsividad", "impulsividad")
+
+
+class IAEState(IAState):
+    # Los rasgos de IAE son su genoma: solo cambian con ia_evolution, no al jugar
+    __slots__ = ()
+    TRAITS = ("iq_velocidad", "iq_reaccion", "iq_prediccion")
+    SENTIMIENTOS = ("seleccion natural", "presion evolutiva", "equilibrio", "curiosidad")
+
+
+class IAPopulation:
+    """
+    Población de `size` IA del mismo tipo para experimentos: rasgos en un array
+    (size, rasgos) y sentimientos como índices de SENTIMIENTOS. Los resultados de todas
+    las partidas se aplican de una vez con apply_results.
+    """
+    def __init__(self, state_class, size, rng=None):
+        self.state_class = state_class
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.traits = self.rng.uniform(*INITIAL_TRAIT_RANGE, size=(size, len(state_class.TRAITS)))
+        self.sentimientos = np.full(size, INITIAL, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.traits)
+
+    @property
+    def nbytes(self):
+        return self.traits.nbytes + self.sentimientos.nbytes
+
+    @property
+    def iq(self):
+        weights = self.state_class._WEIGHTS
+        return self.traits @ weights / weights.sum()
+
+    def _draw(self, changes, count):
+        low = np.array([change[0] if change else 0 for change in changes], dtype=np.float64)
+        high = np.array([change[1] if change else 0 for change in changes], dtype=np.float64)
+        if self.state_class.INTEGER_CHANGES:
+            # randint incluye el máximo
+            return self.rng.integers(low, high + 1, size=(count, len(changes))).astype(np.float64)
+        return self.rng.uniform(low, high, size=(count, len(changes)))
+
+    def apply_results(self, final_scores):
+        """
+        Aplica el resultado de una partida a cada IA (1 gana, -1 pierde, otro empate).
+        """
+        final_scores = np.asarray(final_scores)
+        won, lost = final_scores == 1, final_scores == -1
+        if self.state_class.WIN_CHANGE:
+            self.traits[won] += self._draw(self.state_class.WIN_CHANGE, np.count_nonzero(won))
+        if self.state_class.LOSS_CHANGE:
+            self.traits[lost] -= self._draw(self.state_class.LOSS_CHANGE, np.count_nonzero(lost))
+        self.sentimientos[:] = np.where(won, WIN, np.where(lost, LOSS, DRAW))
+
+    def sentimiento(self, index):
+        return self.state_class.SENTIMIENTOS[self.sentimientos[index]]
+
+    def state(self, index):
+        """
+        Estado de una IA de la población como registro independiente.
+        """
+        state = self.state_class.__new__(self.state_class)
+        state._traits = self.traits[index].copy()
+        state._iq = None
+        state.sentimiento = self.sentimiento(index)
+        state.extras = {}
+        return state
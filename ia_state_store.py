@@ -0,0 +1,152 @@
+import copy
+import json
+import os
+import pickle
+import time
+
+# Guardado del estado de las IA (ia_state.json).
+#
+# En lugar de reescribir el archivo entero después de cada partida, las IA que juegan se
+# marcan como modificadas y las escrituras se agrupan: se guarda cuando pasan
+# flush_interval segundos o cuando se acumulan max_pending partidas, y siempre al
+# llamar a flush() o close(). De cada IA marcada solo se guardan los valores que han
+# cambiado desde la última escritura, y si no ha cambiado nada no se escribe.
+#
+# Cada archivo se escribe en un temporal que luego se renombra sobre el original, así
+# que un corte a mitad de escritura nunca deja un estado a medias.
+#
+# Con journal=True, en cada escritura solo se añaden al final de ia_state.journal los
+# cambios (una línea JSON por escritura) sobre una instantánea binaria, ia_state.bin.
+# Cada compact_every escrituras, y al cerrar, la instantánea se rehace y el diario se
+# vacía; al cerrar también se exporta ia_state.json para poder leerlo a mano.
+
+
+def atomic_write(path, data):
+    """
+    Escribe `data` (bytes) en `path` a través de un temporal que se renombra al final.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class IAStateStore:
+    def __init__(self, path="ia_state.json", flush_interval=10.0, max_pending=20, journal=False, compact_every=500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.journal = journal
+        self.compact_every = compact_every
+        root, _ = os.path.splitext(path)
+        self.snapshot_path = root + ".bin"
+        self.journal_path = root + ".journal"
+
+        self.ia_players = {}
+        # Último estado escrito de cada IA, para saber qué ha cambiado
+        self.persisted = {}
+        self.dirty = set()
+        self.pending = 0
+        self.journal_entries = 0
+        self.last_flush = time.monotonic()
+
+    def load(self):
+        """
+        Devuelve el estado guardado de todas las IA ({nombre: estado}).
+        """
+        if self.journal and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                states = pickle.load(f)
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            changes = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Última línea cortada por un cierre inesperado: se descarta
+                            # y la próxima escritura rehace la instantánea
+                            self.journal_entries = self.compact_every
+                            break
+                        for name, delta in changes.items():
+                            states.setdefault(name, {}).update(delta)
+                        self.journal_entries += 1
+        elif os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                states = json.load(f)
+        else:
+            states = {}
+        self.persisted = copy.deepcopy(states)
+        return states
+
+    def attach(self, ia_players):
+        """
+        IA ({nombre: IA}) cuyo estado se guarda.
+        """
+        self.ia_players = ia_players
+
+    def mark_dirty(self, *names):
+        """
+        Marca como modificadas las IA indicadas (todas si no se indica ninguna), cuenta
+        una partida pendiente y escribe si toca.
+        """
+        self.dirty.update(names or self.ia_players)
+        self.pending += 1
+        if self.pending >= self.max_pending or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def _changes(self):
+        changes = {}
+        for name in self.dirty:
+            saved = self.persisted.get(name, {})
+            delta = {key: value for key, value in self.ia_players[name].state.items()
+                     if key not in saved or saved[key] != value}
+            if delta:
+                changes[name] = copy.deepcopy(delta)
+        return changes
+
+    def flush(self):
+        changes = self._changes()
+        self.dirty.clear()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        if not changes:
+            return False
+
+        for name, delta in changes.items():
+            self.persisted.setdefault(name, {}).update(delta)
+        if not self.journal:
+            self._write_json()
+        elif not os.path.exists(self.snapshot_path) or self.journal_entries >= self.compact_every:
+            self._write_snapshot()
+        else:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(changes) + "\n")
+            self.journal_entries += 1
+        return True
+
+    def _write_json(self):
+        atomic_write(self.path, json.dumps(self.persisted).encode("utf-8"))
+
+    def _write_snapshot(self):
+        # Si se corta justo después de renombrar, el diario se vuelve a aplicar al cargar
+        # sobre la instantánea nueva, y como guarda valores y no incrementos, no cambia nada
+        atomic_write(self.snapshot_path, pickle.dumps(self.persisted, protocol=pickle.HIGHEST_PROTOCOL))
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_entries = 0
+
+    def close(self):
+        self.dirty.update(self.ia_players)
+        self.flush()
+        if self.journal and self.persisted:
+            if self.journal_entries:
+                self._write_snapshot()
+            self._write_json()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -6,6 +6,8 @@ import os
 
 # Importar tu entorno personalizado de Cuatro en Raya
 from connect_four_env import ConnectFourEnv
+from connect_four_solver import ConnectFourSolver
+from connect_four_book import BookPlayer
 
 # --- Configuración del entorno ---
 ROWS = 6
@@ -31,13 +33,27 @@ env_id = "ConnectFour-v0"
 # Crear el entorno en modo humano para visualizarlo
 env = gym.make(env_id, render_mode="human")
 
-# Cargar el modelo entrenado
-try:
-    model = DQN.load(model_path)
-    print(f"Modelo de IA cargado desde: '{model_path}'")
-except Exception as e:
-    print(f"Error al cargar el modelo: {e}")
-    exit()
+# Elegir la IA rival
+print("Elige la IA rival:")
+print("1. Modelo DQN entrenado")
+print("2. Buscador alfa-beta")
+use_solver = input("Introduce el numero de tu opcion: ").strip() == "2"
+
+if use_solver:
+    # Segundos de búsqueda por jugada. Antes de buscar se consultan el libro de
+    # aperturas y la caché de posiciones ya resueltas en sesiones anteriores.
+    solver = ConnectFourSolver(time_budget=1.0)
+    ai_player = BookPlayer(solver)
+    print(f"Jugarás contra el buscador alfa-beta (libro: {len(ai_player.book)} posiciones, "
+          f"caché: {len(ai_player.cache)} posiciones).")
+else:
+    # Cargar el modelo entrenado
+    try:
+        model = DQN.load(model_path)
+        print(f"Modelo de IA cargado desde: '{model_path}'")
+    except Exception as e:
+        print(f"Error al cargar el modelo: {e}")
+        exit()
 
 # Bucle principal para jugar una partida
 observation, info = env.reset()
@@ -53,7 +69,16 @@ while not done and not truncated:
         # Turno de la IA
         print("Turno de la IA...")
         # La IA toma una acción (columna)
-        action, _ = model.predict(observation, deterministic=True)
+        if use_solver:
+            action = ai_player.choose_move(env.unwrapped.board, -1)
+            if ai_player.last_source == "búsqueda":
+                stats = solver.stats()
+                print(f"Búsqueda: profundidad {stats['depth']}, {stats['nodes_per_second']:.0f} nodos/s, "
+                      f"aciertos en tabla {stats['tt_hit_rate']:.0%}")
+            else:
+                print(f"Jugada tomada de: {ai_player.last_source}")
+        else:
+            action, _ = model.predict(observation, deterministic=True)
         # Nos aseguramos de que la acción sea válida
         valid_actions = env.unwrapped._get_valid_locations()
         if action not in valid_actions:
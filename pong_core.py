@@ -0,0 +1,355 @@
+import random
+import numpy as np
+from ia_players import IA
+
+# Núcleo de simulación de Pong sin pygame. Toda la lógica de la partida (movimiento de
+# las IA, física de las bolas, puntos y condiciones de victoria) vive aquí y avanza
+# fotograma a fotograma con step(). El límite de tiempo se cuenta en fotogramas, no con
+# el reloj, así que una partida sin ventana puede simularse tan rápido como dé la CPU.
+#
+# Las bolas se guardan en arrays de NumPy (posiciones y velocidades (n, 2) y tamaños
+# (n,)). Con pocas bolas (lo normal: una, o hasta cinco con IAJ) se recorren una a una
+# con floats de Python, porque en arrays tan cortos el coste fijo de NumPy domina el
+# fotograma. Con más de LOOP_MAX_BALLS, rebotes, choques con todas las paletas
+# (incluidas las 5 de IAF) y puntos se calculan como máscaras vectorizadas, así que
+# cientos de bolas cuestan poco más que unas pocas. Los dos caminos dan exactamente la
+# misma partida. Por lo mismo, cada IA se mueve con su move() escalar; move_batch es
+# para avanzar muchas partidas a la vez (PongVecEnv).
+
+WIDTH, HEIGHT = 800, 600
+PALETA_WIDTH = 15
+BALL_SIZE = 15
+FPS = 60
+PADDLE_MARGIN = 10
+LEFT_PADDLE_X = PADDLE_MARGIN
+RIGHT_PADDLE_X = WIDTH - PADDLE_MARGIN - PALETA_WIDTH
+# Hasta este número de bolas se recorren una a una; con más se usan máscaras
+LOOP_MAX_BALLS = 24
+
+
+def rects_collide(ax, ay, aw, ah, bx, by, bw, bh):
+    """
+    Misma comprobación que pygame.Rect.colliderect, sin crear objetos.
+    """
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class PongMatch:
+    """
+    Una partida de Pong entre dos IA, simulada sin pantalla.
+    """
+    def __init__(self, player1, player2, player1_name, player2_name, time_limit=60, consecutive_score_limit=1,
+                 point_score_limit=1, diablo_mode=False, ball_speed=4, logger=None, rng=None, verbose=True, max_balls=5,
+                 random_serve=False):
+        self.player1 = player1
+        self.player2 = player2
+        self.player1_name = player1_name
+        self.player2_name = player2_name
+        self.consecutive_score_limit = consecutive_score_limit
+        self.point_score_limit = point_score_limit
+        self.diablo_mode = diablo_mode
+        self.ball_speed = ball_speed
+        self.logger = logger
+        self.rng = rng if rng is not None else random
+        self.verbose = verbose
+        # Número de bolas a partir del cual IAJ deja de lanzar bolas nuevas
+        self.max_balls = max_balls
+        # Sortear también la altura y la pendiente de cada saque (ver _serve)
+        self.random_serve = random_serve
+
+        self.p1_is_multi_paddle = isinstance(player1, IA) and player1.num_paddles > 1
+        self.p2_is_multi_paddle = isinstance(player2, IA) and player2.num_paddles > 1
+
+        if self.p1_is_multi_paddle:
+            self.player1_y = [i * (player1.paddle_height + 5) for i in range(player1.num_paddles)]
+        else:
+            self.player1_y = HEIGHT // 2 - player1.paddle_height // 2
+
+        if self.p2_is_multi_paddle:
+            self.player2_y = [i * (player2.paddle_height + 5) for i in range(player2.num_paddles)]
+        else:
+            self.player2_y = HEIGHT // 2 - player2.paddle_height // 2
+
+        # IAJ lanza una bola nueva por cada golpe mientras haya menos de max_balls
+        self.p1_spawns = player1_name == "IAJ" and not self.p1_is_multi_paddle
+        self.p2_spawns = player2_name == "IAJ" and not self.p2_is_multi_paddle
+
+        self.p1_display_name = f"{player1_name}1" if player1_name == player2_name else player1_name
+        self.p2_display_name = f"{player2_name}2" if player1_name == player2_name else player2_name
+
+        self.score_player1 = 0
+        self.score_player2 = 0
+        self.consecutive_score_player1 = 0
+        self.consecutive_score_player2 = 0
+
+        self.frame = 0
+        self.max_frames = int(time_limit * FPS)
+
+        ball_pos, ball_vel = self._serve()
+        self.ball_pos = np.array([ball_pos], dtype=np.float64)
+        self.ball_vel = np.array([ball_vel], dtype=np.float64)
+        self.ball_size = np.array([BALL_SIZE], dtype=np.float64)
+
+        self.finished = False
+        self.result = None
+
+    @property
+    def num_balls(self):
+        return len(self.ball_size)
+
+    @property
+    def time_left(self):
+        """
+        Segundos de partida restantes (a 60 fotogramas por segundo).
+        """
+        return max(0, self.max_frames - self.frame) / FPS
+
+    def run(self):
+        """
+        Simula la partida completa y devuelve (ganador, puntos jugador 1, puntos jugador 2).
+        """
+        while not self.step():
+            pass
+        return self.result
+
+    def _log_experience(self, final_score_p1, final_score_p2):
+        for player, display_name, final_score in ((self.player1, self.p1_display_name, final_score_p1),
+                                                  (self.player2, self.p2_display_name, final_score_p2)):
+            if isinstance(player, IA):
+                experience = player.get_experience(final_score)
+                if self.logger is not None:
+                    self.logger.log(display_name.lower(), experience)
+
+    def _finish(self, winner, final_score_p1, final_score_p2, message):
+        if self.verbose:
+            print(message)
+        self._log_experience(final_score_p1, final_score_p2)
+        if self.logger is not None:
+            self.logger.save_log()
+        self.finished = True
+        self.result = (winner, self.score_player1, self.score_player2)
+        return True
+
+    def _move_paddles(self):
+        # Las IA siguen a la primera bola
+        ball_x, ball_y = self.ball_pos[0].tolist()
+        speed_x, speed_y = self.ball_vel[0].tolist()
+        player1, player2 = self.player1, self.player2
+
+        if isinstance(player1, IA):
+            self.player1_y = self._moved_paddles(player1, self.player1_y, ball_x, ball_y, speed_x, speed_y)
+        if isinstance(player2, IA):
+            self.player2_y = self._moved_paddles(player2, self.player2_y, ball_x, ball_y, speed_x, speed_y)
+
+        if self.p1_is_multi_paddle:
+            limit = HEIGHT - player1.paddle_height
+            self.player1_y = [max(0, min(limit, y)) for y in self.player1_y]
+        elif isinstance(player1, IA):
+            self.player1_y = max(0, min(HEIGHT - player1.paddle_height, self.player1_y))
+
+        if self.p2_is_multi_paddle:
+            limit = HEIGHT - player2.paddle_height
+            self.player2_y = [max(0, min(limit, y)) for y in self.player2_y]
+        elif isinstance(player2, IA):
+            self.player2_y = max(0, min(HEIGHT - player2.paddle_height, self.player2_y))
+
+    @staticmethod
+    def _moved_paddles(player, paddle_y, ball_x, ball_y, speed_x, speed_y):
+        if player.num_paddles > 1:
+            movement = player.move(ball_y, paddle_y)
+            return [y + dy for y, dy in zip(paddle_y, movement)]
+        if player.uses_ball_speed:
+            return paddle_y + player.move(ball_y, paddle_y, ball_x, speed_x, speed_y)
+        return paddle_y + player.move(ball_y, paddle_y)
+
+    def step(self):
+        """
+        Avanza un fotograma. Devuelve True cuando la partida ha terminado.
+        """
+        if self.finished:
+            return True
+
+        if self.frame >= self.max_frames:
+            if self.score_player1 > self.score_player2:
+                winner = self.player1_name
+            elif self.score_player2 > self.score_player1:
+                winner = self.player2_name
+            else:
+                winner = "Empate"
+            final_score_p1 = 1 if self.score_player1 > self.score_player2 else -1 if self.score_player2 > self.score_player1 else 0
+            return self._finish(winner, final_score_p1, -final_score_p1, "¡Juego terminado por limite de tiempo!")
+
+        self.frame += 1
+        self._move_paddles()
+
+        self._update_balls()
+
+        if self.diablo_mode and (self.score_player1 > 0 or self.score_player2 > 0):
+            winner = self.p1_display_name if self.score_player1 > 0 else self.p2_display_name
+            final_score_p1 = 1 if winner == self.p1_display_name else -1
+            final_score_p2 = 1 if winner == self.p2_display_name else -1
+            return self._finish(winner, final_score_p1, final_score_p2, f"¡{winner} gana la partida!")
+
+        if self.consecutive_score_player1 >= self.consecutive_score_limit or self.score_player1 >= self.point_score_limit:
+            winner = self.p1_display_name
+            return self._finish(winner, 1, -1, f"¡{winner} gana la partida!")
+
+        if self.consecutive_score_player2 >= self.consecutive_score_limit or self.score_player2 >= self.point_score_limit:
+            winner = self.p2_display_name
+            return self._finish(winner, -1, 1, f"¡{winner} gana la partida!")
+
+        return False
+
+    def _paddle_hits(self, paddle_x, paddle_ys, paddle_height):
+        """
+        Máscara de las bolas que tocan alguna de las paletas del jugador.
+        """
+        x, y, size = self.ball_pos[:, 0], self.ball_pos[:, 1], self.ball_size
+        paddle_ys = np.asarray(paddle_ys, dtype=np.float64).reshape(-1, 1)
+        overlap_x = (paddle_x < x + size) & (x < paddle_x + PALETA_WIDTH)
+        overlap_y = (paddle_ys < y + size) & (y < paddle_ys + paddle_height)
+        return overlap_x & overlap_y.any(axis=0)
+
+    def _serve(self):
+        """
+        Posición y velocidad de la bola de un saque desde el centro, a 45 grados. Con
+        random_serve también se sortean la altura de salida y la pendiente: si no, la
+        bola repite siempre las mismas pocas trayectorias y llegan a la paleta a las
+        mismas alturas, así que la velocidad o la reacción de las IA apenas cuentan.
+        """
+        speed_x = self.rng.choice([self.ball_speed, -self.ball_speed])
+        speed_y = self.rng.choice([self.ball_speed, -self.ball_speed])
+        if not self.random_serve:
+            return [WIDTH // 2, HEIGHT // 2], [speed_x, speed_y]
+        return [WIDTH // 2, self.rng.uniform(HEIGHT / 4, 3 * HEIGHT / 4)], [speed_x, speed_y * self.rng.uniform(0.25, 1.0)]
+
+    def _new_ball(self, speed_x):
+        return [WIDTH // 2, HEIGHT // 2], [speed_x, self.rng.choice([self.ball_speed, -self.ball_speed])]
+
+    def _update_balls(self):
+        if len(self.ball_size) <= LOOP_MAX_BALLS:
+            self._update_ball_list()
+        else:
+            self._update_ball_arrays()
+
+    def _update_ball_list(self):
+        """
+        Lo mismo que _update_ball_arrays, bola a bola con floats de Python.
+        """
+        num_balls = len(self.ball_size)
+        p1_spawns = self.p1_spawns and num_balls < self.max_balls
+        p2_spawns = self.p2_spawns and num_balls < self.max_balls
+        player1_ys = self.player1_y if self.p1_is_multi_paddle else (self.player1_y,)
+        player2_ys = self.player2_y if self.p2_is_multi_paddle else (self.player2_y,)
+        player1_height, player2_height = self.player1.paddle_height, self.player2.paddle_height
+
+        kept, new_balls, point_for_p1 = [], [], []
+        for (x, y), (speed_x, speed_y), size in zip(self.ball_pos.tolist(), self.ball_vel.tolist(), self.ball_size.tolist()):
+            x += speed_x
+            y += speed_y
+            if y <= 0 or y >= HEIGHT - size:
+                speed_y = -speed_y
+
+            if any(rects_collide(LEFT_PADDLE_X, paddle_y, PALETA_WIDTH, player1_height, x, y, size, size) for paddle_y in player1_ys):
+                speed_x = -speed_x
+                x = LEFT_PADDLE_X + PALETA_WIDTH
+                if p1_spawns:
+                    new_balls.append((*self._new_ball(self.ball_speed), BALL_SIZE))
+            if any(rects_collide(RIGHT_PADDLE_X, paddle_y, PALETA_WIDTH, player2_height, x, y, size, size) for paddle_y in player2_ys):
+                speed_x = -speed_x
+                x = RIGHT_PADDLE_X - size
+                if p2_spawns:
+                    new_balls.append((*self._new_ball(-self.ball_speed), BALL_SIZE))
+
+            if x <= 0:
+                point_for_p1.append(False)
+            elif x >= WIDTH - size:
+                point_for_p1.append(True)
+            else:
+                kept.append(([x, y], [speed_x, speed_y], size))
+
+        if point_for_p1:
+            self._add_points(np.array(point_for_p1))
+            final_score_p1 = 1 if self.score_player1 > self.score_player2 else -1 if self.score_player2 > self.score_player1 else 0
+            self._log_experience(final_score_p1, -final_score_p1)
+
+        balls = kept + new_balls
+        if not balls:
+            balls = [(*self._serve(), BALL_SIZE)]
+        if len(balls) == num_balls == 1:
+            self.ball_pos[0], self.ball_vel[0], self.ball_size[0] = balls[0]
+        else:
+            self.ball_pos = np.array([ball[0] for ball in balls], dtype=np.float64)
+            self.ball_vel = np.array([ball[1] for ball in balls], dtype=np.float64)
+            self.ball_size = np.array([ball[2] for ball in balls], dtype=np.float64)
+
+    def _update_ball_arrays(self):
+        pos, vel, size = self.ball_pos, self.ball_vel, self.ball_size
+        num_balls = len(size)
+
+        pos += vel
+        bounce = (pos[:, 1] <= 0) | (pos[:, 1] >= HEIGHT - size)
+        vel[bounce, 1] *= -1
+
+        # Choques con las paletas: se invierte la velocidad y se recoloca la bola
+        hits_p1 = self._paddle_hits(LEFT_PADDLE_X, self.player1_y, self.player1.paddle_height)
+        vel[hits_p1, 0] *= -1
+        pos[hits_p1, 0] = LEFT_PADDLE_X + PALETA_WIDTH
+        hits_p2 = self._paddle_hits(RIGHT_PADDLE_X, self.player2_y, self.player2.paddle_height)
+        vel[hits_p2, 0] *= -1
+        pos[hits_p2, 0] = RIGHT_PADDLE_X - size[hits_p2]
+
+        new_pos, new_vel = [], []
+        p1_spawns = self.p1_spawns and num_balls < self.max_balls
+        p2_spawns = self.p2_spawns and num_balls < self.max_balls
+        if p1_spawns or p2_spawns:
+            for i in np.flatnonzero((hits_p1 & p1_spawns) | (hits_p2 & p2_spawns)):
+                for spawns, hits, speed_x in ((p1_spawns, hits_p1, self.ball_speed), (p2_spawns, hits_p2, -self.ball_speed)):
+                    if spawns and hits[i]:
+                        ball_pos, ball_vel = self._new_ball(speed_x)
+                        new_pos.append(ball_pos)
+                        new_vel.append(ball_vel)
+
+        # Puntos: bolas que salen por la izquierda (punto del jugador 2) o la derecha (jugador 1)
+        scored_p2 = pos[:, 0] <= 0
+        scored_p1 = ~scored_p2 & (pos[:, 0] >= WIDTH - size)
+        scored = scored_p1 | scored_p2
+        if scored.any():
+            self._add_points(scored_p1[scored])
+            final_score_p1 = 1 if self.score_player1 > self.score_player2 else -1 if self.score_player2 > self.score_player1 else 0
+            self._log_experience(final_score_p1, -final_score_p1)
+            keep = ~scored
+            pos, vel, size = pos[keep], vel[keep], size[keep]
+
+        if new_pos:
+            pos = np.concatenate((pos, new_pos))
+            vel = np.concatenate((vel, new_vel))
+            size = np.concatenate((size, np.full(len(new_pos), BALL_SIZE, dtype=np.float64)))
+
+        if len(size) == 0:
+            ball_pos, ball_vel = self._serve()
+            pos = np.array([ball_pos], dtype=np.float64)
+            vel = np.array([ball_vel], dtype=np.float64)
+            size = np.array([BALL_SIZE], dtype=np.float64)
+
+        self.ball_pos, self.ball_vel, self.ball_size = pos, vel, size
+
+    def _add_points(self, point_for_p1):
+        """
+        Suma los puntos del fotograma, en el orden de las bolas, y actualiza las rachas.
+        """
+        p1_points = int(point_for_p1.sum())
+        p2_points = len(point_for_p1) - p1_points
+        self.score_player1 += p1_points
+        self.score_player2 += p2_points
+
+        # La racha final depende solo de la última serie de puntos del mismo jugador
+        last_is_p1 = bool(point_for_p1[-1])
+        different = np.flatnonzero(point_for_p1 != last_is_p1)
+        run = len(point_for_p1) - (different[-1] + 1 if len(different) else 0)
+        if last_is_p1:
+            self.consecutive_score_player1 = run if len(different) else self.consecutive_score_player1 + run
+            self.consecutive_score_player2 = 0
+        else:
+            self.consecutive_score_player2 = run if len(different) else self.consecutive_score_player2 + run
+            self.consecutive_score_player1 = 0
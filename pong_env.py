@@ -0,0 +1,131 @@
+import random
+
+import gymnasium as gym
+from gymnasium import spaces
+import numpy as np
+
+from ia_players import IA
+from ia_state import IAState
+from pong_core import WIDTH, HEIGHT, PongMatch
+from tournament_runner import RIVAL_OPTIONS, create_ia
+
+# Entorno de Gymnasium para entrenar un agente de Pong contra las IA de ia_players.
+#
+# El agente controla la paleta derecha y el rival (IAA, IAL, ...) la izquierda, que es el
+# lado para el que están pensadas las predicciones de las IA. La partida es un PongMatch
+# sin pantalla, con la misma física que run_game. La observación es un vector pequeño,
+# no píxeles: posición y velocidad de la bola y centro de las dos paletas, normalizados.
+# Las acciones son quedarse quieto, subir o bajar, y cada acción se repite frame_skip
+# fotogramas. La recompensa es +1 por cada punto del agente y -1 por cada punto del rival.
+#
+# Para entrenar con muchas partidas a la vez, ver PongVecEnv en pong_vec_env.
+
+AGENT_NAME = "Agente"
+AGENT_PADDLE_HEIGHT = 100
+AGENT_SPEED = 7
+# Movimiento de la paleta para cada acción: quieto, arriba, abajo
+ACTION_DIRECTIONS = np.array([0.0, -1.0, 1.0])
+OBS_SIZE = 6
+DEFAULT_MATCH_KWARGS = {"time_limit": 60, "consecutive_score_limit": 5, "point_score_limit": 5}
+
+
+def pong_observation(ball_x, ball_y, ball_speed_x, ball_speed_y, agent_y, opponent_y, opponent_paddle_height,
+                     ball_speed=4):
+    """
+    Observación del agente (una fila por partida): bola (x, y, velocidad x, velocidad y)
+    y centro de la paleta del agente y de la del rival, normalizados. `opponent_y` es la
+    paleta del rival, o su paleta central si tiene varias.
+    """
+    return np.stack((np.asarray(ball_x, dtype=np.float32) / WIDTH,
+                     np.asarray(ball_y, dtype=np.float32) / HEIGHT,
+                     np.asarray(ball_speed_x, dtype=np.float32) / ball_speed,
+                     np.asarray(ball_speed_y, dtype=np.float32) / ball_speed,
+                     (np.asarray(agent_y, dtype=np.float32) + AGENT_PADDLE_HEIGHT / 2) / HEIGHT,
+                     (np.asarray(opponent_y, dtype=np.float32) + opponent_paddle_height / 2) / HEIGHT), axis=-1)
+
+
+class AgentPaddle(IA):
+    """
+    Paleta controlada desde fuera: se mueve a la velocidad fijada en `speed`.
+    """
+    state_class = IAState
+
+    def __init__(self, screen_height, paddle_height=AGENT_PADDLE_HEIGHT):
+        super().__init__(screen_height, paddle_height)
+        self.speed = 0.0
+
+    def move(self, ball_y, paddle_y):
+        return self.speed
+
+    def move_batch(self, observations):
+        return np.full((len(observations), 1), self.speed)
+
+
+class PongEnv(gym.Env):
+    metadata = {"render_modes": []}
+
+    def __init__(self, opponent="IAL", frame_skip=4, paddle_speed=AGENT_SPEED, match_kwargs=None, render_mode=None):
+        super().__init__()
+        if opponent not in RIVAL_OPTIONS:
+            raise ValueError(f"Rival desconocido: {opponent} (opciones: {', '.join(RIVAL_OPTIONS)})")
+        self.opponent_name = opponent
+        self.frame_skip = frame_skip
+        self.paddle_speed = paddle_speed
+        self.match_kwargs = dict(DEFAULT_MATCH_KWARGS if match_kwargs is None else match_kwargs)
+        self.render_mode = render_mode
+
+        self.observation_space = spaces.Box(low=-2.0, high=2.0, shape=(OBS_SIZE,), dtype=np.float32)
+        self.action_space = spaces.Discrete(len(ACTION_DIRECTIONS))
+        self.match = None
+
+    def _get_obs(self):
+        match = self.match
+        opponent = match.player1
+        opponent_y = match.player1_y[opponent.num_paddles // 2] if match.p1_is_multi_paddle else match.player1_y
+        (ball_x, ball_y), (speed_x, speed_y) = match.ball_pos[0], match.ball_vel[0]
+        return pong_observation(ball_x, ball_y, speed_x, speed_y, match.player2_y, opponent_y,
+                                opponent.paddle_height, match.ball_speed)
+
+    def _get_info(self):
+        return {"score_agent": self.match.score_player2, "score_opponent": self.match.score_player1}
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        if seed is not None:
+            # Las IA que se mueven al azar usan el módulo random
+            random.seed(seed)
+        self.agent = AgentPaddle(HEIGHT)
+        opponent = create_ia(self.opponent_name)
+        match_rng = random.Random(int(self.np_random.integers(2 ** 32)))
+        self.match = PongMatch(opponent, self.agent, self.opponent_name, AGENT_NAME, rng=match_rng, verbose=False,
+                               **self.match_kwargs)
+        return self._get_obs(), self._get_info()
+
+    def step(self, action):
+        match = self.match
+        self.agent.speed = ACTION_DIRECTIONS[int(action)] * self.paddle_speed
+        reward = 0.0
+        finished = False
+        for _ in range(self.frame_skip):
+            score_agent, score_opponent = match.score_player2, match.score_player1
+            finished = match.step()
+            reward += (match.score_player2 - score_agent) - (match.score_player1 - score_opponent)
+            if finished:
+                break
+
+        info = self._get_info()
+        # La partida se corta por tiempo solo si nadie ha llegado a un límite de puntos:
+        # un punto en el último fotograma es una victoria, no un corte
+        won = (max(match.consecutive_score_player1, match.consecutive_score_player2) >= match.consecutive_score_limit
+               or max(match.score_player1, match.score_player2) >= match.point_score_limit
+               or (match.diablo_mode and match.score_player1 + match.score_player2 > 0))
+        truncated = finished and not won
+        if finished:
+            info["winner"] = match.result[0]
+        return self._get_obs(), float(reward), finished and not truncated, truncated, info
+
+
+try:
+    gym.register(id="PongIA-v0", entry_point="pong_env:PongEnv")
+except gym.error.Error:
+    pass
@@ -0,0 +1,162 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+
+from batch_vec_env import BatchVecEnv
+from ia_players import make_observations
+from pong_core import WIDTH, HEIGHT, PALETA_WIDTH, BALL_SIZE, FPS, LEFT_PADDLE_X, RIGHT_PADDLE_X
+from pong_env import (AGENT_NAME, AGENT_PADDLE_HEIGHT, AGENT_SPEED, ACTION_DIRECTIONS, OBS_SIZE, DEFAULT_MATCH_KWARGS,
+                      pong_observation)
+from tournament_runner import RIVAL_OPTIONS, create_ia
+
+
+class PongVecEnv(BatchVecEnv):
+    """
+    N partidas de Pong contra la misma IA rival, avanzadas a la vez con NumPy.
+
+    Cada partida se comporta como un PongEnv (misma observación, acciones, recompensa y
+    reglas de victoria), pero la física de todas las partidas se calcula con arrays
+    (n,): bolas, paletas, rebotes y puntos son máscaras vectorizadas, y el rival mueve
+    sus paletas en todas las partidas con una sola llamada a move_batch. Cada partida
+    tiene una sola bola (las bolas extra de IAJ no se simulan). Las partidas terminadas
+    se reinician automáticamente, como espera stable-baselines3.
+    """
+    env_arrays = ("ball_pos", "ball_vel", "agent_y", "opponent_y", "scores", "consecutive", "frame")
+
+    def __init__(self, num_envs, opponent="IAL", frame_skip=4, paddle_speed=AGENT_SPEED, match_kwargs=None,
+                 ball_speed=4, seed=None):
+        self.render_mode = None
+        if opponent not in RIVAL_OPTIONS:
+            raise ValueError(f"Rival desconocido: {opponent} (opciones: {', '.join(RIVAL_OPTIONS)})")
+        match_kwargs = dict(DEFAULT_MATCH_KWARGS if match_kwargs is None else match_kwargs)
+        self.frame_skip = frame_skip
+        self.paddle_speed = paddle_speed
+        self.ball_speed = ball_speed
+        self.max_frames = int(match_kwargs["time_limit"] * FPS)
+        self.consecutive_score_limit = match_kwargs["consecutive_score_limit"]
+        self.point_score_limit = match_kwargs["point_score_limit"]
+
+        observation_space = spaces.Box(low=-2.0, high=2.0, shape=(OBS_SIZE,), dtype=np.float32)
+        action_space = spaces.Discrete(len(ACTION_DIRECTIONS))
+        super().__init__(num_envs, observation_space, action_space)
+
+        self.np_random, _ = seeding.np_random(seed)
+        self.opponent_name = opponent
+        self.opponent = create_ia(opponent)
+        self.opponent_height = self.opponent.paddle_height
+        num_paddles = self.opponent.num_paddles
+        self.opponent_start = (np.arange(num_paddles) * (self.opponent_height + 5) if num_paddles > 1
+                               else np.array([HEIGHT // 2 - self.opponent_height // 2]))
+
+        self.ball_pos = np.zeros((num_envs, 2), dtype=np.float64)
+        self.ball_vel = np.zeros((num_envs, 2), dtype=np.float64)
+        self.agent_y = np.zeros(num_envs, dtype=np.float64)
+        self.opponent_y = np.zeros((num_envs, num_paddles), dtype=np.float64)
+        # Puntos y rachas: columna 0 el rival (jugador 1), columna 1 el agente (jugador 2)
+        self.scores = np.zeros((num_envs, 2), dtype=np.int64)
+        self.consecutive = np.zeros((num_envs, 2), dtype=np.int64)
+        self.frame = np.zeros(num_envs, dtype=np.int64)
+        self._actions = None
+
+    def _serve(self, mask):
+        count = np.count_nonzero(mask)
+        self.ball_pos[mask] = (WIDTH // 2, HEIGHT // 2)
+        self.ball_vel[mask] = self.np_random.choice((self.ball_speed, -self.ball_speed), size=(count, 2))
+
+    def _reset_games(self, mask):
+        self._serve(mask)
+        self.agent_y[mask] = HEIGHT // 2 - AGENT_PADDLE_HEIGHT // 2
+        self.opponent_y[mask] = self.opponent_start
+        self.scores[mask] = 0
+        self.consecutive[mask] = 0
+        self.frame[mask] = 0
+        # Estado por partida del rival (direcciones de IAD/IAC, retardo de IAE...)
+        self.opponent.reset_batch(mask)
+
+    def _get_obs(self):
+        mid = self.opponent_y.shape[1] // 2
+        return pong_observation(self.ball_pos[:, 0], self.ball_pos[:, 1], self.ball_vel[:, 0], self.ball_vel[:, 1],
+                                self.agent_y, self.opponent_y[:, mid], self.opponent_height, self.ball_speed)
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.np_random, _ = seeding.np_random(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_games(slice(None))
+        return self._get_obs()
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def _step_frame(self, active, agent_speed):
+        """
+        Avanza un fotograma de las partidas activas. Devuelve (puntos del agente, puntos
+        del rival, partidas terminadas por tiempo).
+        """
+        timeout = active & (self.frame >= self.max_frames)
+        active = active & ~timeout
+        self.frame += active
+
+        # Paletas: el rival ve la bola con las mismas observaciones que en PongMatch
+        pos, vel = self.ball_pos, self.ball_vel
+        observations = make_observations(pos[:, 0], pos[:, 1], vel[:, 0], vel[:, 1], self.opponent_y)
+        movement = self.opponent.move_batch(observations)
+        self.opponent_y = np.clip(self.opponent_y + movement * active[:, None], 0, HEIGHT - self.opponent_height)
+        self.agent_y = np.clip(self.agent_y + agent_speed * active, 0, HEIGHT - AGENT_PADDLE_HEIGHT)
+
+        # Bola: avance, rebotes en las paredes y choques con las paletas
+        pos += vel * active[:, None]
+        bounce = active & ((pos[:, 1] <= 0) | (pos[:, 1] >= HEIGHT - BALL_SIZE))
+        vel[bounce, 1] *= -1
+        overlap_y = (self.opponent_y < pos[:, 1:2] + BALL_SIZE) & (pos[:, 1:2] < self.opponent_y + self.opponent_height)
+        hits_left = active & (LEFT_PADDLE_X < pos[:, 0] + BALL_SIZE) & (pos[:, 0] < LEFT_PADDLE_X + PALETA_WIDTH) & overlap_y.any(axis=1)
+        vel[hits_left, 0] *= -1
+        pos[hits_left, 0] = LEFT_PADDLE_X + PALETA_WIDTH
+        hits_right = (active & (RIGHT_PADDLE_X < pos[:, 0] + BALL_SIZE) & (pos[:, 0] < RIGHT_PADDLE_X + PALETA_WIDTH)
+                      & (self.agent_y < pos[:, 1] + BALL_SIZE) & (pos[:, 1] < self.agent_y + AGENT_PADDLE_HEIGHT))
+        vel[hits_right, 0] *= -1
+        pos[hits_right, 0] = RIGHT_PADDLE_X - BALL_SIZE
+
+        # Puntos: la bola sale por la izquierda (punto del agente) o por la derecha (del rival)
+        agent_point = active & (pos[:, 0] <= 0)
+        opponent_point = active & ~agent_point & (pos[:, 0] >= WIDTH - BALL_SIZE)
+        scored = agent_point | opponent_point
+        if scored.any():
+            self.scores[:, 1] += agent_point
+            self.scores[:, 0] += opponent_point
+            self.consecutive[agent_point, 1] += 1
+            self.consecutive[agent_point, 0] = 0
+            self.consecutive[opponent_point, 0] += 1
+            self.consecutive[opponent_point, 1] = 0
+            self._serve(scored)
+        return agent_point, opponent_point, timeout
+
+    def step_wait(self):
+        agent_speed = ACTION_DIRECTIONS[np.asarray(self._actions, dtype=np.int64).reshape(self.num_envs)] * self.paddle_speed
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+
+        for _ in range(self.frame_skip):
+            agent_point, opponent_point, timeout = self._step_frame(~dones, agent_speed)
+            rewards += agent_point
+            rewards -= opponent_point
+            won = (self.consecutive >= self.consecutive_score_limit) | (self.scores >= self.point_score_limit)
+            truncated |= timeout
+            dones |= timeout | won.any(axis=1)
+            if dones.all():
+                break
+
+        observation = self._get_obs()
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            score_opponent, score_agent = self.scores[i].tolist()
+            winner = AGENT_NAME if score_agent > score_opponent else self.opponent_name if score_opponent > score_agent else "Empate"
+            infos[i] = {"terminal_observation": observation[i].copy(), "TimeLimit.truncated": bool(truncated[i]),
+                        "winner": winner, "score_agent": score_agent, "score_opponent": score_opponent}
+        if dones.any():
+            self._reset_games(dones)
+            observation[dones] = self._get_obs()[dones]
+
+        return observation, rewards, dones, infos
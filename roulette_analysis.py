@@ -0,0 +1,242 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from roulette_env import RED_NUMBERS, FIRST_COLUMN, SECOND_COLUMN, THIRD_COLUMN, VOISINS_DU_ZERO, TIERS_DU_CYLINDRE, ORPHELINS
+
+# Análisis macro de los números ganadores de la ruleta, vectorizado con NumPy.
+#
+# Los conteos por número salen de un único np.bincount. Docenas, columnas, zonas y
+# colores son arrays de 37 etiquetas (una por número, -1 si el número no pertenece a
+# ningún grupo), así que sus totales son otro bincount sobre los 37 conteos. Todo el
+# análisis recorre el historial unas pocas veces, sin bucles de Python por jugada.
+
+NUM_NUMBERS = 37
+
+DOZEN_NAMES = ["Primera Docena", "Segunda Docena", "Tercera Docena"]
+COLUMN_NAMES = ["Primera Columna", "Segunda Columna", "Tercera Columna"]
+ZONE_NAMES = ["Zona del Cero", "Tercio del Cilindro", "Huérfanos"]
+COLOR_NAMES = ["Verde", "Rojo", "Negro"]
+
+
+def _labels(groups):
+    labels = np.full(NUM_NUMBERS, -1, dtype=np.int8)
+    for label, numbers in enumerate(groups):
+        # Como en el informe original, un número cuenta solo para el primer grupo que lo contiene
+        numbers = [n for n in numbers if labels[n] == -1]
+        labels[numbers] = label
+    return labels
+
+
+DOZEN_LABELS = _labels([range(1, 13), range(13, 25), range(25, 37)])
+COLUMN_LABELS = _labels([FIRST_COLUMN, SECOND_COLUMN, THIRD_COLUMN])
+ZONE_LABELS = _labels([VOISINS_DU_ZERO, TIERS_DU_CYLINDRE, ORPHELINS])
+COLOR_LABELS = _labels([[0], RED_NUMBERS, [n for n in range(1, NUM_NUMBERS) if n not in RED_NUMBERS]])
+
+
+def _as_numbers(results):
+    return np.asarray(results).astype(np.uint8, copy=False)
+
+
+def number_counts(results):
+    return np.bincount(_as_numbers(results), minlength=NUM_NUMBERS)
+
+
+def first_seen(results, chunk_size=4096):
+    """
+    Posición de la primera aparición de cada número (len(results) si no ha salido).
+    Se recorre el historial por bloques y se para en cuanto han salido todos.
+    """
+    results = _as_numbers(results)
+    positions = np.full(NUM_NUMBERS, len(results), dtype=np.int64)
+    missing = NUM_NUMBERS
+    for start in range(0, len(results), chunk_size):
+        numbers, first = np.unique(results[start:start + chunk_size], return_index=True)
+        new = positions[numbers] == len(results)
+        positions[numbers[new]] = first[new] + start
+        missing -= np.count_nonzero(new)
+        if missing == 0:
+            break
+    return positions
+
+
+def group_counts(counts, labels):
+    in_group = labels >= 0
+    return np.bincount(labels[in_group], weights=counts[in_group], minlength=labels.max() + 1).astype(np.int64)
+
+
+def group_first_seen(positions, labels):
+    first = np.full(labels.max() + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    in_group = labels >= 0
+    np.minimum.at(first, labels[in_group], positions[in_group])
+    return first
+
+
+def ranking(counts, positions):
+    """
+    Índices ordenados de más a menos frecuente. Los empates se resuelven por la primera
+    aparición, igual que Counter.most_common.
+    """
+    return np.lexsort((positions, -np.asarray(counts)))
+
+
+def longest_streaks(results, labels=None):
+    """
+    Racha más larga de cada etiqueta (números iguales, o del mismo grupo si se pasan
+    etiquetas). Devuelve un array con la racha máxima por etiqueta.
+    """
+    results = _as_numbers(results)
+    num_labels = NUM_NUMBERS if labels is None else labels.max() + 1
+    streaks = np.zeros(num_labels, dtype=np.int64)
+    if len(results) == 0:
+        return streaks
+
+    # Toda etiqueta que aparece tiene al menos una racha de 1. Las rachas más largas son
+    # grupos de posiciones consecutivas donde el valor se repite respecto al anterior.
+    present = np.flatnonzero(first_seen(results) < len(results))
+    values = results
+    if labels is not None:
+        values = labels[results]
+        present = labels[present]
+        present = present[present >= 0]
+    streaks[present] = 1
+    repeats = np.flatnonzero(values[1:] == values[:-1])
+    if len(repeats) == 0:
+        return streaks
+    group_starts = np.flatnonzero(np.concatenate(([True], np.diff(repeats) != 1)))
+    lengths = np.diff(np.append(group_starts, len(repeats))) + 1
+    run_values = values[repeats[group_starts]].astype(np.int64)
+    in_group = run_values >= 0
+    run_values, lengths = run_values[in_group], lengths[in_group]
+
+    # Máximo por etiqueta sin bucles: se marca qué longitudes aparecen para cada etiqueta
+    # y se toma la mayor marcada en cada fila
+    max_length = int(lengths.max(initial=0)) + 1
+    seen = np.bincount(run_values * max_length + lengths, minlength=num_labels * max_length).reshape(num_labels, max_length) > 0
+    has_runs = seen.any(axis=1)
+    streaks[has_runs] = max_length - 1 - np.argmax(seen[has_runs, ::-1], axis=1)
+    return streaks
+
+
+def chi_square_p_value(statistic, dof):
+    """
+    P-valor de la chi-cuadrado con la aproximación de Wilson-Hilferty (sin SciPy).
+    """
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi_square_uniformity(counts):
+    """
+    Contraste chi-cuadrado de que todos los números salen con la misma probabilidad.
+    Devuelve (estadístico, grados de libertad, p-valor).
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1, keepdims=True)
+    expected = total / counts.shape[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistic = np.nan_to_num(((counts - expected) ** 2 / expected).sum(axis=-1))
+    dof = counts.shape[-1] - 1
+    p_value = np.vectorize(chi_square_p_value, otypes=[np.float64])(statistic, dof)
+    if np.ndim(statistic) == 0:
+        return float(statistic), dof, float(p_value)
+    return statistic, dof, p_value
+
+
+def window_counts(results, window):
+    """
+    Conteos por número en ventanas consecutivas de `window` jugadas, como array
+    (ventanas, 37). Las jugadas que no llenan una ventana completa se ignoran.
+    """
+    results = _as_numbers(results)
+    num_windows = len(results) // window
+    offsets = (np.arange(num_windows, dtype=np.int64) * NUM_NUMBERS)[:, None]
+    keys = results[:num_windows * window].reshape(num_windows, window) + offsets
+    return np.bincount(keys.ravel(), minlength=num_windows * NUM_NUMBERS).reshape(num_windows, NUM_NUMBERS)
+
+
+def rolling_share(results, numbers, window):
+    """
+    Fracción móvil de jugadas (en las últimas `window`) cuyo número está en `numbers`.
+    """
+    mask = np.zeros(NUM_NUMBERS, dtype=np.uint8)
+    mask[list(numbers)] = 1
+    hits = np.zeros(len(results) + 1, dtype=np.int64)
+    np.cumsum(mask[_as_numbers(results)], out=hits[1:])
+    return (hits[window:] - hits[:-window]) / window
+
+
+def _top_group(lines, title, label, counts, positions, labels, names, total):
+    lines.append(f"\n-- {title} --\n")
+    totals = group_counts(counts, labels)
+    if totals.sum() == 0:
+        return
+    top = ranking(totals, group_first_seen(positions, labels))[0]
+    percentage = (totals[top] / total) * 100
+    lines.append(f"{label}: {names[top]} con {totals[top]} veces ({percentage:.2f}%)\n")
+
+
+def macro_report(results, current_time_str=None, window=1000):
+    """
+    Texto de la sección "ANÁLISIS MACRO" del resumen de entrenamiento.
+    """
+    results = np.asarray(results)
+    total = len(results)
+    current_time_str = current_time_str or time.strftime('%Y-%m-%d %H:%M:%S')
+    lines = ["\n" + "=" * 50 + "\n", f"--- ANÁLISIS MACRO | {current_time_str} ---\n", f"Jugadas totales: {total}\n\n"]
+    if total == 0:
+        return "".join(lines)
+
+    counts = number_counts(results)
+    positions = first_seen(results)
+
+    lines.append("--- 10 Números más frecuentes ---\n")
+    for number in ranking(counts, positions)[:10]:
+        if counts[number] == 0:
+            break
+        percentage = (counts[number] / total) * 100
+        lines.append(f"Número {number}: {counts[number]} veces ({percentage:.2f}%)\n")
+
+    _top_group(lines, "Zonas más frecuentes", "Zona más frecuente", counts, positions, ZONE_LABELS, ZONE_NAMES, total)
+    _top_group(lines, "Docenas más frecuentes", "Docena más frecuente", counts, positions, DOZEN_LABELS, DOZEN_NAMES, total)
+    _top_group(lines, "Columnas más frecuentes", "Columna más frecuente", counts, positions, COLUMN_LABELS, COLUMN_NAMES, total)
+
+    lines.append("\n-- Rachas más largas --\n")
+    number_streaks = longest_streaks(results)
+    top_number = int(np.argmax(number_streaks))
+    lines.append(f"Mismo número: {number_streaks[top_number]} seguidas (número {top_number})\n")
+    for title, labels, names in (("Color", COLOR_LABELS, COLOR_NAMES), ("Docena", DOZEN_LABELS, DOZEN_NAMES),
+                                 ("Columna", COLUMN_LABELS, COLUMN_NAMES), ("Zona", ZONE_LABELS, ZONE_NAMES)):
+        streaks = longest_streaks(results, labels)
+        lines.append(f"{title}: " + ", ".join(f"{name} {streak}" for name, streak in zip(names, streaks)) + "\n")
+
+    lines.append("\n-- Uniformidad (chi-cuadrado) --\n")
+    statistic, dof, p_value = chi_square_uniformity(counts)
+    lines.append(f"Chi-cuadrado: {statistic:.2f} con {dof} grados de libertad, p-valor {p_value:.4f}\n")
+    windows = window_counts(results, window)
+    if len(windows):
+        _, _, window_p_values = chi_square_uniformity(windows)
+        biased = int(np.count_nonzero(window_p_values < 0.05))
+        lines.append(f"Ventanas de {window} jugadas: {len(windows)}, con p < 0.05: {biased} "
+                     f"({biased / len(windows) * 100:.2f}%, se esperaría un 5%)\n")
+        shares = rolling_share(results, RED_NUMBERS, window)
+        lines.append(f"Porcentaje de rojos en {window} jugadas seguidas: mínimo {shares.min() * 100:.2f}%, "
+                     f"máximo {shares.max() * 100:.2f}%\n")
+    return "".join(lines)
+
+
+if __name__ == "__main__":
+    from roulette_history import read_column
+
+    parser = argparse.ArgumentParser(description="Análisis macro del historial completo de la ruleta")
+    parser.add_argument("history_dir", nargs="?", default="./roulette_logs/roulette_historial/", help="Directorio de historial columnar")
+    parser.add_argument("--window", type=int, default=1000, help="Tamaño de las ventanas, en jugadas")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = read_column(args.history_dir, "result")
+    report = macro_report(results, window=args.window)
+    print(report)
+    print(f"({len(results)} jugadas analizadas en {time.perf_counter() - start:.3f}s)")
@@ -3,12 +3,193 @@ from gymnasium import spaces
 import numpy as np
 from collections import deque
 import os
+import tempfile
+
+# --- Definición de las apuestas ---
+RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
+FIRST_COLUMN = [1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34]
+SECOND_COLUMN = [2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35]
+THIRD_COLUMN = [3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36]
+VOISINS_DU_ZERO = [2, 0, 3, 4, 7, 12, 15, 18, 19, 21, 22, 25, 26, 28, 29, 32, 35]
+TIERS_DU_CYLINDRE = [5, 8, 10, 11, 13, 16, 23, 24, 27, 30, 33, 36]
+ORPHELINS = [1, 6, 9, 14, 17, 20, 31, 34]
+
+# Cada apuesta es (nombre, números que gana, pago). Si sale cualquier otro número se pierde 1.
+# Las apuestas "negro", "par" y "pasa" se definen como en la versión original del entorno,
+# por lo que el 0 gana en "negro", "par" y "pasa".
+DEFAULT_BETS = [
+    ("rojo", RED_NUMBERS, 1.0),
+    ("negro", [n for n in range(37) if n not in RED_NUMBERS], 1.0),
+    ("par", [n for n in range(37) if n % 2 == 0], 1.0),
+    ("impar", [n for n in range(37) if n % 2 == 1], 1.0),
+    ("falta", list(range(1, 19)), 1.0),
+    ("pasa", [0] + list(range(19, 37)), 1.0),
+    ("primera docena", list(range(1, 13)), 2.0),
+    ("segunda docena", list(range(13, 25)), 2.0),
+    ("tercera docena", list(range(25, 37)), 2.0),
+    ("primera columna", FIRST_COLUMN, 2.0),
+    ("segunda columna", SECOND_COLUMN, 2.0),
+    ("tercera columna", THIRD_COLUMN, 2.0),
+    ("pleno 7", [7], 35.0),
+    ("vecinos del cero", VOISINS_DU_ZERO, 2.0),
+    ("tercio del cilindro", TIERS_DU_CYLINDRE, 2.0),
+    ("huerfanos", ORPHELINS, 2.0),
+]
+
+
+def _check_number(number):
+    if isinstance(number, bool) or not isinstance(number, (int, np.integer)) or not 0 <= number <= 36:
+        raise ValueError(f"{number!r} no es un número de la ruleta (de 0 a 36)")
+
+
+def split_bet(a, b):
+    """
+    Apuesta a caballo entre dos números contiguos del tapete: vecinos en la misma fila
+    o en la misma columna, o el 0 con el 1, el 2 o el 3.
+    """
+    _check_number(a)
+    _check_number(b)
+    low, high = sorted((a, b))
+    if low == 0:
+        contiguous = high <= 3
+    else:
+        same_row = high - low == 1 and (low - 1) // 3 == (high - 1) // 3
+        contiguous = same_row or high - low == 3
+    if not contiguous:
+        raise ValueError(f"{a} y {b} no son contiguos en el tapete: no se puede apostar a caballo")
+    return (f"caballo {a}-{b}", [a, b], 17.0)
+
+
+def street_bet(row):
+    """
+    Apuesta a transversal (fila de 3 números). `row` va de 0 (1-2-3) a 11 (34-35-36).
+    """
+    if isinstance(row, bool) or not isinstance(row, (int, np.integer)) or not 0 <= row <= 11:
+        raise ValueError(f"La fila de una transversal va de 0 a 11, no {row!r}")
+    first = 3 * row + 1
+    return (f"transversal {first}-{first + 2}", [first, first + 1, first + 2], 11.0)
+
+
+def corner_bet(top_left):
+    """
+    Apuesta a cuadro: el número indicado y sus vecinos a la derecha y en la fila siguiente.
+    `top_left` no puede estar en la tercera columna ni en la última fila (1 a 32).
+    """
+    if isinstance(top_left, bool) or not isinstance(top_left, (int, np.integer)) or not 1 <= top_left <= 32:
+        raise ValueError(f"El número de arriba a la izquierda de un cuadro va de 1 a 32, no {top_left!r}")
+    if top_left % 3 == 0:
+        raise ValueError(f"{top_left} está en la tercera columna: no hay números a su derecha para un cuadro")
+    numbers = [top_left, top_left + 1, top_left + 3, top_left + 4]
+    return (f"cuadro {top_left}-{top_left + 4}", numbers, 8.0)
+
+
+def build_payout_table(bets):
+    """
+    Tabla 37xN con la recompensa de cada apuesta (columna) para cada número ganador (fila).
+    """
+    table = np.full((37, len(bets)), -1.0)
+    for bet_index, (name, numbers, payout) in enumerate(bets):
+        for number in numbers:
+            try:
+                _check_number(number)
+            except ValueError as error:
+                raise ValueError(f"Apuesta '{name}': {error}") from None
+        table[numbers, bet_index] = payout
+    return table
+
+
+PAYOUT_TABLE = build_payout_table(DEFAULT_BETS)
+
+
+HISTORY_FILE = './roulette_logs/roulette_full_history.bin'
+
+
+def _read_text_history(text_file):
+    with open(text_file, 'r') as f:
+        content = f.read().strip()
+    return [int(n) for n in content.split(',') if n] if content else []
+
+
+class SpinHistoryFile:
+    """
+    Historial persistente de tiradas: un archivo binario de solo añadir con un byte
+    (uint8) por tirada. Las tiradas nuevas se acumulan en memoria y se añaden al
+    archivo en bloques de `batch_size`. La cola del historial se lee con memoria
+    mapeada, así que cargar las últimas N tiradas cuesta lo mismo sea cual sea el
+    tamaño del archivo.
+
+    Si el archivo no existe pero hay un historial antiguo en texto (mismo nombre con
+    extensión .txt, números separados por comas), se migra una sola vez.
+    """
+    def __init__(self, path=HISTORY_FILE, batch_size=4096):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = bytearray()
+        text_file = os.path.splitext(path)[0] + '.txt'
+        if not os.path.exists(path) and os.path.exists(text_file):
+            self._migrate(text_file)
+
+    def _migrate(self, text_file):
+        # Varias mesas pueden migrar a la vez: cada una escribe su propio temporal y lo
+        # enlaza con el nombre final solo si nadie lo ha creado antes
+        numbers = np.array(_read_text_history(text_file), dtype=np.uint8)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(numbers.tobytes())
+            os.link(tmp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+
+    def __len__(self):
+        stored = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return stored + len(self.pending)
+
+    def tail(self, count):
+        """
+        Las últimas `count` tiradas (incluidas las que aún no se han escrito), de la más
+        antigua a la más reciente.
+        """
+        stored = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        from_file = max(0, min(stored, count - len(self.pending)))
+        numbers = np.zeros(0, dtype=np.uint8)
+        if from_file:
+            numbers = np.array(np.memmap(self.path, dtype=np.uint8, mode='r', offset=stored - from_file, shape=(from_file,)))
+        pending = np.frombuffer(bytes(self.pending), dtype=np.uint8)
+        return np.concatenate((numbers, pending))[-count:] if count else numbers[:0]
+
+    def append(self, numbers):
+        """
+        Añade una tirada o un array de tiradas.
+        """
+        if isinstance(numbers, (int, np.integer)):
+            self.pending.append(int(numbers))
+        else:
+            self.pending.extend(np.asarray(numbers, dtype=np.uint8).reshape(-1).tobytes())
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(self.pending)
+        self.pending = bytearray()
+
 
 class RouletteEnv(gym.Env):
-    def __init__(self, initial_balance=100.0):
+    def __init__(self, initial_balance=100.0, history_size=10000, bets=None, history_file=HISTORY_FILE):
         super(RouletteEnv, self).__init__()
-        
-        self.action_space = spaces.MultiBinary(16)
+
+        # Con `bets` se puede usar un tapete propio (caballos, transversales, cuadros...)
+        self.payout_table = PAYOUT_TABLE if bets is None else build_payout_table(bets)
+
+        self.action_space = spaces.MultiBinary(self.payout_table.shape[1])
         self.observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(38,), dtype=np.float32)
         
         self.initial_balance = initial_balance
@@ -17,18 +198,23 @@ class RouletteEnv(gym.Env):
         self.max_steps = 1000000
         
         # El historial de la IA se limita a las últimas 10,000 jugadas para optimizar el rendimiento.
-        self.history_size = 10000 
-        self.full_history_file = './roulette_logs/roulette_full_history.txt'
+        # Todas las tiradas se guardan en `history_file` y la siguiente sesión arranca con
+        # las últimas del archivo. Con history_file=None no se lee ni se guarda nada.
+        self.history_size = history_size
+        self.full_history_file = history_file
+        self.spin_history = SpinHistoryFile(history_file) if history_file is not None else None
         self.winning_numbers_history = self._load_history()
 
+        # Conteo acumulado de cada número dentro del historial. Se actualiza en O(1)
+        # en cada jugada para no recorrer el historial completo en _get_obs.
+        self.number_counts = np.zeros(37, dtype=np.int64)
+        for number in self.winning_numbers_history:
+            self.number_counts[number] += 1
+
     def _load_history(self):
         history = deque(maxlen=self.history_size)
-        if os.path.exists(self.full_history_file):
-            with open(self.full_history_file, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    numbers = [int(n) for n in content.split(',') if n]
-                    history.extend(numbers[-self.history_size:])
+        if self.spin_history is not None:
+            history.extend(self.spin_history.tail(self.history_size).tolist())
         return history
 
     def reset(self, seed=None, options=None):
@@ -44,18 +230,14 @@ class RouletteEnv(gym.Env):
         self.current_step += 1
         
         roulette_result = self.np_random.integers(0, 37)
-        self.winning_numbers_history.append(roulette_result)
-        
-        total_reward = 0.0
-        active_bets_count = np.sum(action)
+        self._record_result(roulette_result)
         
-        if active_bets_count == 0:
-            total_reward -= 0.5
-        
-        for bet_index, is_bet_active in enumerate(action):
-            if is_bet_active:
-                reward = self._calculate_reward(bet_index, roulette_result)
-                total_reward += reward
+        active_bets = np.asarray(action) != 0
+
+        if active_bets.any():
+            total_reward = float(np.dot(active_bets, self.payout_table[roulette_result]))
+        else:
+            total_reward = -0.5
 
         self.balance += total_reward
         
@@ -66,64 +248,28 @@ class RouletteEnv(gym.Env):
         
         return observation, total_reward, terminated, truncated, info
 
+    def _record_result(self, number):
+        # Si el deque está lleno, al añadir se descarta el número más antiguo
+        if len(self.winning_numbers_history) == self.winning_numbers_history.maxlen:
+            self.number_counts[self.winning_numbers_history[0]] -= 1
+        self.winning_numbers_history.append(number)
+        self.number_counts[number] += 1
+        if self.spin_history is not None:
+            self.spin_history.append(number)
+
     def _get_obs(self):
-        number_frequencies = np.zeros(37, dtype=np.float32)
+        number_frequencies = self.number_counts.astype(np.float32)
         if self.winning_numbers_history:
-            for number in self.winning_numbers_history:
-                number_frequencies[number] += 1
             number_frequencies /= len(self.winning_numbers_history)
         
         observation = np.concatenate(([self.balance], number_frequencies)).astype(np.float32)
         return observation
 
-    def _calculate_reward(self, bet_index, result):
-        reward = -1.0 
-        
-        is_red = result in [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
-        is_even = result % 2 == 0
-        is_low = 1 <= result <= 18
-        is_first_dozen = 1 <= result <= 12
-        is_second_dozen = 13 <= result <= 24
-        is_third_dozen = 25 <= result <= 36
-        is_first_column = result in [1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34]
-        is_second_column = result in [2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35]
-        is_third_column = result in [3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36]
-
-        voisins_du_zero = [2, 0, 3, 4, 7, 12, 15, 18, 19, 21, 22, 25, 26, 28, 29, 32, 35]
-        tiers_du_cylindre = [5, 8, 10, 11, 13, 16, 23, 24, 27, 30, 33, 36]
-        orphelins = [1, 6, 9, 14, 17, 20, 31, 34]
-        
-        if bet_index == 0 and is_red:
-            reward = 1.0
-        elif bet_index == 1 and not is_red:
-            reward = 1.0
-        elif bet_index == 2 and is_even:
-            reward = 1.0
-        elif bet_index == 3 and not is_even:
-            reward = 1.0
-        elif bet_index == 4 and is_low:
-            reward = 1.0
-        elif bet_index == 5 and not is_low:
-            reward = 1.0
-        elif bet_index == 6 and is_first_dozen:
-            reward = 2.0
-        elif bet_index == 7 and is_second_dozen:
-            reward = 2.0
-        elif bet_index == 8 and is_third_dozen:
-            reward = 2.0
-        elif bet_index == 9 and is_first_column:
-            reward = 2.0
-        elif bet_index == 10 and is_second_column:
-            reward = 2.0
-        elif bet_index == 11 and is_third_column:
-            reward = 2.0
-        elif bet_index == 12 and result == 7:
-            reward = 35.0
-        elif bet_index == 13 and result in voisins_du_zero:
-            reward = 2.0
-        elif bet_index == 14 and result in tiers_du_cylindre:
-            reward = 2.0
-        elif bet_index == 15 and result in orphelins:
-            reward = 2.0
-            
-        return reward
\ No newline at end of file
+    def close(self):
+        if self.spin_history is not None:
+            self.spin_history.flush()
+        super().close()
+
+    @staticmethod
+    def _calculate_reward(bet_index, result):
+        return float(PAYOUT_TABLE[result, bet_index])
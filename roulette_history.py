@@ -0,0 +1,236 @@
+import argparse
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Historial de jugadas de la ruleta en formato columnar.
+#
+# Cada sesión de entrenamiento se guarda en su propia carpeta dentro del directorio de
+# historial, con un .npy por columna:
+#   step.npy     uint32   número de jugada dentro de la sesión
+#   action.npy   uint16   apuestas activas como máscara de bits (bit i = apuesta i)
+#   reward.npy   float32  recompensa de la jugada
+#   balance.npy  float32  saldo después de la jugada
+#   result.npy   uint8    número ganador (0-36)
+# Añadir una sesión solo escribe sus propios archivos, y leer una columna de todo el
+# historial abre cada sesión con memoria mapeada sin tocar el resto de columnas.
+
+COLUMNS = {
+    "step": np.uint32,
+    "action": np.uint16,
+    "reward": np.float32,
+    "balance": np.float32,
+    "result": np.uint8,
+}
+NUM_ACTION_BITS = 16
+_BIT_WEIGHTS = (1 << np.arange(NUM_ACTION_BITS)).astype(np.uint16)
+
+
+def pack_actions(actions):
+    """
+    Convierte acciones (n, 16) con 0/1 en máscaras de bits uint16.
+    """
+    active = np.asarray(actions).reshape(-1, NUM_ACTION_BITS) != 0
+    return (active.astype(np.uint16) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint16)
+
+
+def unpack_actions(masks, num_bets=NUM_ACTION_BITS):
+    """
+    Convierte máscaras de bits en acciones (n, num_bets) con 0/1.
+    """
+    masks = np.asarray(masks, dtype=np.uint16)
+    return ((masks[:, None] & _BIT_WEIGHTS[:num_bets]) != 0).astype(np.uint8)
+
+
+def write_session(history_dir, session_name, step, action, reward, balance, result):
+    """
+    Guarda una sesión completa. `action` puede venir como máscaras uint16 o como
+    acciones (n, 16). Se escribe en una carpeta temporal que se renombra al final, así
+    que una sesión a medio escribir nunca aparece en el historial. Si la sesión ya
+    existe, se sustituye.
+    """
+    action = np.asarray(action)
+    if action.ndim == 2:
+        action = pack_actions(action)
+    data = {"step": step, "action": action, "reward": reward, "balance": balance, "result": result}
+
+    session_dir = os.path.join(history_dir, session_name)
+    tmp_dir = session_dir + ".tmp"
+    old_dir = session_dir + ".old"
+    # Restos de una escritura anterior interrumpida
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        os.makedirs(tmp_dir)
+        for column, dtype in COLUMNS.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), np.ascontiguousarray(data[column], dtype=dtype))
+        if os.path.exists(session_dir):
+            # os.replace no puede sustituir una carpeta con contenido: la anterior se aparta
+            shutil.rmtree(old_dir, ignore_errors=True)
+            os.replace(session_dir, old_dir)
+        os.replace(tmp_dir, session_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return session_dir
+
+
+def list_sessions(history_dir):
+    """
+    Nombres de las sesiones guardadas, en orden cronológico (los nombres son marcas de tiempo).
+    """
+    if not os.path.isdir(history_dir):
+        return []
+    return sorted(name for name in os.listdir(history_dir)
+                  if not name.endswith((".tmp", ".old")) and os.path.isdir(os.path.join(history_dir, name)))
+
+
+def read_session(history_dir, session_name, columns=None, mmap=True):
+    """
+    Devuelve un diccionario columna -> array de una sesión, con memoria mapeada por defecto.
+    """
+    session_dir = os.path.join(history_dir, session_name)
+    return {column: np.load(os.path.join(session_dir, f"{column}.npy"), mmap_mode="r" if mmap else None)
+            for column in (columns or COLUMNS)}
+
+
+def iter_sessions(history_dir, columns=None):
+    """
+    Recorre las sesiones una a una como (nombre, columnas) sin cargar el historial entero.
+    """
+    for session_name in list_sessions(history_dir):
+        yield session_name, read_session(history_dir, session_name, columns)
+
+
+def read_column(history_dir, column):
+    """
+    Una columna de todo el historial, concatenada en un único array.
+    """
+    parts = [session[column] for _, session in iter_sessions(history_dir, [column])]
+    if not parts:
+        return np.zeros(0, dtype=COLUMNS[column])
+    return np.concatenate(parts)
+
+
+def to_dataframe(session):
+    return pd.DataFrame({column: np.asarray(values) for column, values in session.items()})
+
+
+class SessionRecorder:
+    """
+    Registro de las jugadas de una sesión en arrays preasignados (uno por columna).
+    Empieza con `capacity` filas y duplica su tamaño si se queda corto, así que añadir
+    una jugada cuesta O(1) amortizado y no crea objetos de Python por jugada.
+    """
+    def __init__(self, capacity=1024):
+        capacity = max(1, int(capacity))
+        self.arrays = {column: np.zeros(capacity, dtype=dtype) for column, dtype in COLUMNS.items()}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self.arrays["step"])
+
+    def _grow(self, min_capacity):
+        capacity = max(min_capacity, 2 * self.capacity)
+        for column, array in self.arrays.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.arrays[column] = grown
+
+    def append(self, step, action, reward, balance, result):
+        if self.size == self.capacity:
+            self._grow(self.size + 1)
+        i = self.size
+        arrays = self.arrays
+        arrays["step"][i] = step
+        arrays["action"][i] = np.dot(np.asarray(action) != 0, _BIT_WEIGHTS)
+        arrays["reward"][i] = reward
+        arrays["balance"][i] = balance
+        arrays["result"][i] = result
+        self.size = i + 1
+
+    def column(self, name):
+        """
+        Vista (sin copia) de las filas grabadas de una columna.
+        """
+        return self.arrays[name][:self.size]
+
+    def columns(self):
+        return {column: self.column(column) for column in COLUMNS}
+
+    def actions(self, rows=slice(None)):
+        """
+        Acciones (n, 16) de las filas indicadas, desempaquetadas como float32.
+        """
+        return unpack_actions(self.column("action")[rows]).astype(np.float32)
+
+    def to_dataframe(self):
+        """
+        DataFrame que comparte memoria con los arrays del registro (sin copia).
+        """
+        return pd.DataFrame(self.columns(), copy=False)
+
+    def save(self, history_dir, session_name):
+        columns = self.columns()
+        return write_session(history_dir, session_name, columns["step"], columns["action"], columns["reward"],
+                             columns["balance"], columns["result"])
+
+
+def _parse_actions(action_strings):
+    # "[np.float32(0.0), np.float32(1.0), ...]" o "[0.0, 1.0, ...]" -> (n, 16)
+    cleaned = action_strings.str.replace(r"np\.float32\(|\)|\[|\]", "", regex=True)
+    return cleaned.str.split(",", expand=True).astype(np.float32).to_numpy()
+
+
+def _write_csv_session(history_dir, session_name, parts, append):
+    rows = pd.concat(parts)
+    columns = {"step": rows["step"].to_numpy(), "action": rows["action"].to_numpy(dtype=np.uint16),
+               "reward": rows["reward"].to_numpy(), "balance": rows["balance"].to_numpy(),
+               "result": rows["roulette_result"].to_numpy()}
+    if append:
+        saved = read_session(history_dir, session_name, mmap=False)
+        columns = {column: np.concatenate((saved[column], values)) for column, values in columns.items()}
+    write_session(history_dir, session_name, **columns)
+    print(f"Sesión {session_name}: {len(columns['step'])} jugadas")
+
+
+def convert_csv(csv_path, history_dir, chunksize=100000):
+    """
+    Convierte el CSV de historial antiguo (una fila por jugada, con la acción como texto)
+    al formato columnar, con una sesión por cada valor de la columna timestamp.
+
+    El CSV se lee por trozos y cada sesión se escribe en cuanto empieza la siguiente
+    (las filas de una sesión van seguidas), así que en memoria solo hay una sesión. Si
+    una sesión reaparece más adelante, sus filas se añaden a las ya escritas.
+    """
+    sessions = {}
+    current, parts = None, []
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk["action"] = list(pack_actions(_parse_actions(chunk["action"])))
+        for session_name, rows in chunk.groupby("timestamp", sort=False):
+            if session_name != current:
+                if current is not None:
+                    _write_csv_session(history_dir, current, parts, append=sessions.get(current, False))
+                    sessions[current] = True
+                current, parts = session_name, []
+            parts.append(rows)
+    if current is not None:
+        _write_csv_session(history_dir, current, parts, append=sessions.get(current, False))
+        sessions[current] = True
+    return list(sessions)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convierte el historial CSV de la ruleta al formato columnar")
+    parser.add_argument("csv", help="CSV de historial (roulette_historial_completo.csv)")
+    parser.add_argument("--out", default=None, help="Directorio de historial (por defecto, 'roulette_historial' junto al CSV)")
+    args = parser.parse_args()
+
+    out_dir = args.out or os.path.join(os.path.dirname(args.csv), "roulette_historial")
+    convert_csv(args.csv, out_dir)
+    print(f"Historial convertido en {out_dir}")
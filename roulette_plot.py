@@ -0,0 +1,157 @@
+import argparse
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from roulette_history import list_sessions, read_session
+
+# Gráficos del saldo de la ruleta con submuestreo.
+#
+# Una sesión nocturna tiene cientos de miles de jugadas por mesa y el gráfico solo tiene
+# unos pocos cientos de píxeles de ancho, así que antes de dibujar se reduce cada curva
+# a un número de puntos proporcional al ancho en píxeles:
+#   - "envelope": por cada cubo de jugadas se guardan el mínimo y el máximo, de modo que
+#     los picos y caídas se ven igual que con la curva completa.
+#   - "lttb": Largest-Triangle-Three-Buckets, un punto por cubo elegido para conservar
+#     la forma de la curva.
+# El tiempo de dibujo depende del ancho del gráfico y no del número de jugadas.
+
+DOWNSAMPLE_METHODS = ("envelope", "lttb")
+
+
+def _bucket_edges(n, num_buckets):
+    return np.linspace(0, n, num_buckets + 1).astype(np.int64)
+
+
+def envelope(x, y, num_buckets):
+    """
+    Mínimo y máximo de `y` en cada uno de `num_buckets` cubos consecutivos. Devuelve
+    (x, y) con dos puntos por cubo, en el orden en que aparecen en la curva original.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= 2 * num_buckets:
+        return x, y
+    # Cubos del mismo tamaño: la curva (rellenada con su último valor) se ve como una
+    # matriz cubos x tamaño y argmin/argmax por fila dan las posiciones sin ordenar nada
+    size = -(-len(y) // num_buckets)
+    num_buckets = -(-len(y) // size)
+    padded = np.empty(num_buckets * size, dtype=y.dtype)
+    padded[:len(y)] = y
+    padded[len(y):] = y[-1]
+    rows = padded.reshape(num_buckets, size)
+    starts = np.arange(num_buckets) * size
+    first = np.minimum(starts + rows.argmin(axis=1), len(y) - 1)
+    last = np.minimum(starts + rows.argmax(axis=1), len(y) - 1)
+    points = np.sort(np.column_stack((first, last)), axis=1).ravel()
+    return x[points], y[points]
+
+
+def lttb(x, y, num_points):
+    """
+    Largest-Triangle-Three-Buckets: reduce la curva a `num_points` puntos, conservando
+    el primero y el último.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if num_points >= n or num_points < 3:
+        return x, y
+    edges = _bucket_edges(n - 2, num_points - 2) + 1
+    xf, yf = x.astype(np.float64), y.astype(np.float64)
+    selected = np.zeros(num_points, dtype=np.int64)
+    selected[-1] = n - 1
+    a = 0
+    for i in range(num_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = xf[end:edges[i + 2]].mean(), yf[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = xf[-1], yf[-1]
+        areas = np.abs((xf[a] - next_x) * (yf[start:end] - yf[a]) - (xf[a] - xf[start:end]) * (next_y - yf[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def downsample(x, y, width_px, method="envelope"):
+    if method == "lttb":
+        return lttb(x, y, width_px)
+    return envelope(x, y, width_px)
+
+
+def axes_width_px(ax):
+    return max(1, int(ax.get_window_extent().width))
+
+
+def plot_balance(ax, x, y, method="envelope", **kwargs):
+    """
+    Dibuja una curva de saldo en `ax` con tantos puntos como píxeles de ancho tiene.
+    """
+    xs, ys = downsample(x, y, axes_width_px(ax), method)
+    return ax.plot(xs, ys, **kwargs)
+
+
+def history_envelope(historial_dir, num_buckets, column="balance"):
+    """
+    Mínimo y máximo de una columna sobre todo el historial, en `num_buckets` cubos. Las
+    sesiones se colocan una detrás de otra en el eje x. Cada sesión se lee con memoria
+    mapeada y solo se guardan los cubos, así que la memoria no depende del historial.
+    Devuelve (x, mínimos, máximos, inicios de sesión).
+    """
+    sessions = list_sessions(historial_dir)
+    lengths = np.array([len(read_session(historial_dir, name, ["step"])["step"]) for name in sessions], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    total = int(offsets[-1])
+    num_buckets = max(1, min(num_buckets, total))
+    edges = _bucket_edges(total, num_buckets)
+    mins = np.full(num_buckets, np.inf)
+    maxs = np.full(num_buckets, -np.inf)
+
+    for name, offset, length in zip(sessions, offsets, lengths):
+        if length == 0:
+            continue
+        values = read_session(historial_dir, name, [column])[column]
+        first = np.searchsorted(edges, offset, side="right") - 1
+        last = np.searchsorted(edges, offset + length, side="left")
+        local_starts = np.clip(edges[first:last] - offset, 0, None)
+        buckets = np.arange(first, last)
+        np.minimum.at(mins, buckets, np.minimum.reduceat(values, local_starts))
+        np.maximum.at(maxs, buckets, np.maximum.reduceat(values, local_starts))
+
+    centers = (edges[:-1] + edges[1:]) / 2
+    return centers, mins, maxs, offsets[:-1]
+
+
+def plot_history(historial_dir, plot_path, initial_balance=None, figsize=(12, 6), dpi=100):
+    """
+    Gráfico del saldo de todas las sesiones guardadas, como banda mínimo-máximo con un
+    cubo por píxel de ancho.
+    """
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    x, mins, maxs, session_starts = history_envelope(historial_dir, int(figsize[0] * dpi))
+    ax.fill_between(x, mins, maxs, color='lime', linewidth=0.5, label='Saldo (mínimo-máximo)')
+    for start in session_starts[1:]:
+        ax.axvline(x=start, color='gray', linewidth=0.5, alpha=0.4)
+    if initial_balance is not None:
+        ax.axhline(y=initial_balance, color='red', linestyle='--', label='Saldo Inicial')
+    ax.set_title(f'Evolución del Saldo de la IA ({len(session_starts)} sesiones)')
+    ax.set_xlabel('Jugada (todas las sesiones)')
+    ax.set_ylabel('Saldo')
+    ax.grid(True, linestyle=':', alpha=0.6)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(plot_path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gráfico del saldo de todas las sesiones guardadas de la ruleta")
+    parser.add_argument("history_dir", nargs="?", default="./roulette_logs/roulette_historial/", help="Directorio de historial columnar")
+    parser.add_argument("--out", default="roulette_saldo_historico.png", help="Imagen de salida")
+    parser.add_argument("--initial-balance", type=float, default=None, help="Saldo inicial a marcar en el gráfico")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    plot_history(args.history_dir, args.out, args.initial_balance)
+    print(f"Gráfico guardado en {args.out} ({time.perf_counter() - start:.2f}s)")
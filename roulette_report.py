@@ -0,0 +1,249 @@
+import argparse
+import html
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from roulette_analysis import macro_report
+from roulette_history import list_sessions, read_session, unpack_actions
+from roulette_plot import DOWNSAMPLE_METHODS, plot_balance
+
+# Informes de las sesiones de entrenamiento de la ruleta, generados a partir del
+# historial guardado (ver roulette_history).
+#
+# El informe es una etapa aparte del entrenamiento: el script de entrenamiento guarda el
+# modelo y el historial y lanza este módulo en un proceso independiente, así que termina
+# sin esperar al resumen ni al gráfico. También se puede ejecutar a mano sobre cualquier
+# sesión ya guardada, o sobre todas las que aún no tienen informe.
+#
+# Cada sesión tiene su propio fragmento HTML (roulette_informe_<sesión>.html) y el
+# informe maestro es un índice que enlaza los fragmentos. El índice se deja con el
+# contenedor abierto (los navegadores cierran las etiquetas al final del archivo), así
+# que cada sesión nueva solo añade su entrada al final, sin leer ni reescribir el resto.
+
+REPORT_MODES = ("background", "sync", "none")
+
+PAGE_STYLE = """
+        <style>
+            body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; margin: 2em; line-height: 1.6; background-color: #121212; color: #e0e0e0; }
+            h1 { color: #4CAF50; border-bottom: 2px solid #4CAF50; padding-bottom: 0.5em; }
+            a { color: #4CAF50; }
+            .container { display: flex; flex-direction: column; gap: 2em; }
+            .section { background-color: #1e1e1e; padding: 1.5em; border-radius: 8px; box-shadow: 0 4px 8px rgba(0,0,0,0.2); }
+            pre { background-color: #1e1e1e; color: #e0e0e0; padding: 1em; border-radius: 6px; overflow-x: auto; white-space: pre-wrap; word-wrap: break-word; }
+            img { max-width: 100%; height: auto; border-radius: 6px; }
+        </style>"""
+
+
+def _page_header(title, heading):
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>{PAGE_STYLE}
+</head>
+<body>
+    <h1>{heading}</h1>
+    <div class="container">
+"""
+
+
+def _run_name(session_name):
+    # Las sesiones de un entrenamiento con varias mesas se llaman <marca de tiempo>_mesaNN
+    return session_name.split("_mesa")[0]
+
+
+def list_runs(historial_dir):
+    """
+    Entrenamientos guardados en el historial, en orden cronológico.
+    """
+    return list(dict.fromkeys(_run_name(name) for name in list_sessions(historial_dir)))
+
+
+def read_run(historial_dir, run):
+    """
+    Columnas de cada mesa de un entrenamiento, en orden de mesa.
+    """
+    return [read_session(historial_dir, name) for name in list_sessions(historial_dir) if _run_name(name) == run]
+
+
+def summary_path(log_dir, run):
+    return f"{log_dir}roulette_resumen_{run}.txt"
+
+
+def balance_plot_path(log_dir, run):
+    return f"{log_dir}roulette_saldo_{run}.png"
+
+
+def fragment_path(log_dir, run):
+    return f"{log_dir}roulette_informe_{run}.html"
+
+
+def pending_runs(log_dir, historial_dir):
+    """
+    Entrenamientos del historial que todavía no tienen fragmento de informe.
+    """
+    return [run for run in list_runs(historial_dir) if not os.path.exists(fragment_path(log_dir, run))]
+
+
+def write_summary(path, run, sessions, initial_balance, current_time_str):
+    """
+    Resumen de texto de un entrenamiento: saldo, jugadas de muestra de la primera mesa y
+    el análisis macro de las tiradas de todas las mesas.
+    """
+    session = sessions[0]
+    balances = session["balance"]
+    winning_numbers = np.concatenate([s["result"] for s in sessions])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("--- RESUMEN DEL ENTRENAMIENTO ---\n\n")
+        f.write(f"Timestamp: {run}\n")
+        f.write(f"Jugadas totales: {len(winning_numbers)}\n")
+        f.write(f"Mesas en paralelo: {len(sessions)}\n")
+        f.write(f"Saldo inicial: {initial_balance:.2f}\n")
+        f.write(f"Saldo final (mesa 1): {balances[-1]:.2f}\n\n")
+        mid_point = len(balances) // 2
+        for title, rows in (("--- Primeras 8 jugadas (mesa 1) ---\n", slice(None, 8)),
+                            ("\n--- 8 jugadas intermedias (mesa 1) ---\n", slice(mid_point - 4, mid_point + 4)),
+                            ("\n--- Últimas 8 jugadas (mesa 1) ---\n", slice(-8, None))):
+            f.write(title)
+            actions = unpack_actions(session["action"][rows]).astype(np.float32)
+            for step, action, balance in zip(session["step"][rows], actions, balances[rows]):
+                action_str = ', '.join(map(str, action))
+                f.write(f"Paso: {step}, Acción: [{action_str}], Saldo: {balance:.2f}\n")
+        f.write(macro_report(winning_numbers, current_time_str))
+
+
+def save_balance_plot(plot_path, sessions, initial_balance, method="envelope"):
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i, session in enumerate(sessions):
+        # Cada mesa se reduce a unos puntos por píxel antes de dibujarla (ver roulette_plot)
+        plot_balance(ax, session["step"], session["balance"], method, label=f'Saldo mesa {i + 1}' if len(sessions) > 1 else 'Saldo',
+                     color='lime' if i == 0 else None, linewidth=1)
+    ax.axhline(y=initial_balance, color='red', linestyle='--', label='Saldo Inicial')
+    ax.set_title('Evolución del Saldo de la IA')
+    ax.set_xlabel('Paso de la Simulación')
+    ax.set_ylabel('Saldo')
+    ax.grid(True, linestyle=':', alpha=0.6)
+    if len(sessions) <= 8:
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(plot_path)
+    plt.close(fig)
+
+
+def _close_legacy_index(informe_maestro_html):
+    # Los informes maestros antiguos terminan en </div></body></html>. Se quitan una sola
+    # vez mirando solo el final del archivo, para poder seguir añadiendo entradas.
+    with open(informe_maestro_html, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 256))
+        tail = f.read()
+        if b"</html>" not in tail:
+            return
+        pos = tail.rfind(b"</div>")
+        if pos != -1:
+            f.truncate(size - len(tail) + pos)
+
+
+def append_to_index(informe_maestro_html, entry, title, heading):
+    """
+    Añade una entrada al final del informe maestro, creándolo si no existe.
+    """
+    if os.path.exists(informe_maestro_html):
+        _close_legacy_index(informe_maestro_html)
+        with open(informe_maestro_html, "a", encoding="utf-8") as f:
+            f.write(entry)
+    else:
+        with open(informe_maestro_html, "w", encoding="utf-8") as f:
+            f.write(_page_header(title, heading) + entry)
+
+
+def generate_report(log_dir, historial_dir, run, informe_maestro_html, title, heading, initial_balance=100000,
+                    plot_method="envelope"):
+    """
+    Genera el resumen, el gráfico y el fragmento HTML de un entrenamiento guardado y lo
+    añade al índice del informe maestro.
+    """
+    sessions = read_run(historial_dir, run)
+    if not sessions:
+        print(f"No hay jugadas guardadas del entrenamiento {run} en '{historial_dir}'")
+        return False
+
+    current_time_str = time.strftime('%Y-%m-%d %H:%M:%S')
+    resumen_file = summary_path(log_dir, run)
+    balance_plot_file = balance_plot_path(log_dir, run)
+    fragment_file = fragment_path(log_dir, run)
+    write_summary(resumen_file, run, sessions, initial_balance, current_time_str)
+    print(f"Resumen del entrenamiento guardado en: {resumen_file}")
+
+    try:
+        save_balance_plot(balance_plot_file, sessions, initial_balance, plot_method)
+        with open(resumen_file, "r", encoding="utf-8") as f:
+            resumen_texto = f.read()
+        html_block = f"""
+        <div class="section">
+            <h2>Informe de Entrenamiento - {current_time_str}</h2>
+            <img src="{os.path.basename(balance_plot_file)}" alt="Gráfico de evolución del saldo">
+            <pre>{html.escape(resumen_texto)}</pre>
+        </div>
+"""
+        with open(fragment_file, "w", encoding="utf-8") as f:
+            f.write(_page_header(title, heading) + html_block + "    </div>\n</body>\n</html>\n")
+
+        entry = f"""
+        <div class="section">
+            <h2><a href="{os.path.basename(fragment_file)}">Informe de Entrenamiento - {current_time_str}</a></h2>
+            <p>Sesión {run}: {sum(len(s["step"]) for s in sessions)} jugadas en {len(sessions)} mesas</p>
+            <img src="{os.path.basename(balance_plot_file)}" alt="Gráfico de evolución del saldo">
+        </div>
+"""
+        append_to_index(informe_maestro_html, entry, title, heading)
+        print(f"Informe HTML de esta sesión guardado en {fragment_file} y adjuntado en: {informe_maestro_html}")
+    except Exception as e:
+        print(f"Error al generar el informe HTML: {e}")
+        return False
+    return True
+
+
+def launch_report_worker(log_dir, historial_dir, run, informe_maestro_html, title, heading, initial_balance=100000):
+    """
+    Lanza generate_report en un proceso independiente que sigue aunque termine el
+    entrenamiento. Su salida se añade a roulette_informes.log en log_dir.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--log-dir", log_dir, "--historial-dir", historial_dir,
+               "--master", informe_maestro_html, "--title", title, "--heading", heading,
+               "--initial-balance", str(initial_balance), "--run", run]
+    worker_log = f"{log_dir}roulette_informes.log"
+    with open(worker_log, "a", encoding="utf-8") as output:
+        subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                         start_new_session=True)
+    return worker_log
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera los informes de entrenamiento de la ruleta a partir del historial guardado")
+    parser.add_argument("--log-dir", default="./roulette_logs/", help="Carpeta de logs del entrenamiento")
+    parser.add_argument("--historial-dir", default=None, help="Directorio de historial (por defecto, roulette_historial/ en la carpeta de logs)")
+    parser.add_argument("--master", default=None, help="Informe maestro HTML (por defecto, roulette_informe_maestro.html en la carpeta de logs)")
+    parser.add_argument("--title", default="Historial de Entrenamientos de la IA", help="Título del informe maestro")
+    parser.add_argument("--heading", default="Historial de Entrenamientos de la IA para la Ruleta", help="Encabezado del informe maestro")
+    parser.add_argument("--initial-balance", type=float, default=100000, help="Saldo inicial de las mesas")
+    parser.add_argument("--plot-method", choices=DOWNSAMPLE_METHODS, default="envelope", help="Submuestreo del gráfico de saldo")
+    parser.add_argument("--run", nargs="*", default=None, help="Entrenamientos a procesar (por defecto, todos los que no tienen informe)")
+    args = parser.parse_args()
+
+    log_dir = os.path.join(args.log_dir, "")
+    historial_dir = args.historial_dir or f"{log_dir}roulette_historial/"
+    informe_maestro_html = args.master or f"{log_dir}roulette_informe_maestro.html"
+    runs = args.run if args.run is not None else pending_runs(log_dir, historial_dir)
+    if not runs:
+        print("No hay entrenamientos pendientes de informe.")
+    for run in runs:
+        generate_report(log_dir, historial_dir, run, informe_maestro_html, args.title, args.heading, args.initial_balance,
+                        args.plot_method)
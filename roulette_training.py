@@ -0,0 +1,134 @@
+import os
+import time
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from tqdm import tqdm
+
+from roulette_env import HISTORY_FILE, RouletteEnv, SpinHistoryFile
+from roulette_history import SessionRecorder
+from roulette_report import generate_report, launch_report_worker
+from roulette_vec_env import RouletteVecEnv
+
+# Entrenamiento de la IA de la ruleta con varias mesas en paralelo.
+#
+# PPO recoge las jugadas de todas las mesas a la vez (una sola inferencia de la política
+# por paso para todas) y un callback graba cada jugada mientras PPO la recoge, así que
+# cada jugada se simula una única vez y sirve tanto para aprender como para el historial.
+# Las mesas pueden ser procesos (SubprocVecEnv, escala con los núcleos), estar en el
+# mismo proceso (DummyVecEnv) o ser RouletteVecEnv, que simula todas con NumPy.
+# El informe de la sesión lo genera roulette_report a partir del historial guardado, por
+# defecto en un proceso aparte para que el entrenamiento termine al guardar el modelo.
+
+MODEL_PATH = "./roulette_model/pelayo.zip"
+VEC_ENV_TYPES = ("subproc", "dummy", "numpy")
+
+
+def make_roulette_vec_env(vec_env_type, n_envs, initial_balance, seed=None):
+    if vec_env_type == "numpy":
+        return RouletteVecEnv(n_envs, initial_balance=initial_balance, seed=seed)
+    # El historial de texto antiguo se migra aquí, una vez, antes de crear las mesas
+    SpinHistoryFile(HISTORY_FILE)
+    vec_env_cls = SubprocVecEnv if vec_env_type == "subproc" else DummyVecEnv
+    return make_vec_env(RouletteEnv, n_envs=n_envs, seed=seed, vec_env_cls=vec_env_cls,
+                        env_kwargs={"initial_balance": initial_balance})
+
+
+class RouletteHistoryCallback(BaseCallback):
+    """
+    Graba las jugadas que recoge PPO, un SessionRecorder por mesa, y actualiza la barra
+    de progreso.
+    """
+    def __init__(self, n_envs, capacity, total_timesteps):
+        super().__init__()
+        self.recorders = [SessionRecorder(capacity) for _ in range(n_envs)]
+        self.env_steps = np.zeros(n_envs, dtype=np.int64)
+        self.total_timesteps = total_timesteps
+        self.pbar = None
+
+    def _on_training_start(self):
+        self.pbar = tqdm(total=self.total_timesteps, desc="Entrenamiento de la IA", unit=" jugadas", leave=False)
+
+    def _on_step(self):
+        infos = self.locals["infos"]
+        actions = self.locals["actions"]
+        rewards = self.locals["rewards"]
+        # En las mesas que terminan, new_obs ya es la observación tras reiniciar
+        balances = np.array(self.locals["new_obs"][:, 0], dtype=np.float64)
+        for i in np.flatnonzero(self.locals["dones"]):
+            balances[i] = infos[i]["terminal_observation"][0]
+
+        self.env_steps += 1
+        for i, recorder in enumerate(self.recorders):
+            recorder.append(self.env_steps[i], actions[i], rewards[i], balances[i], infos[i]["roulette_result"])
+
+        progress = self.env_steps.sum() / self.total_timesteps
+        self.pbar.colour = "red" if progress < 0.40 else "yellow" if progress < 0.60 else "green"
+        self.pbar.update(len(self.recorders))
+        if self.n_calls % 100 == 0:
+            self.pbar.set_postfix(saldo=f"{balances[0]:.2f}")
+        return True
+
+    def _on_training_end(self):
+        self.pbar.close()
+
+
+def load_or_create_model(model_path, env, n_steps, label=""):
+    if os.path.exists(model_path):
+        print(f"Cargando modelo pre-existente '{os.path.basename(model_path)}'{label}...")
+        # El modelo guardado trae su n_steps; se sustituye para que cada rollout tenga el
+        # mismo número de jugadas sea cual sea el número de mesas
+        return PPO.load(model_path, env=env, custom_objects={"n_steps": n_steps})
+    print(f"Creando nuevo modelo de IA '{os.path.basename(model_path)}'{label}...")
+    return PPO("MlpPolicy", env, verbose=0, learning_rate=0.001, gamma=0.95, n_steps=n_steps)
+
+
+def train(total_timesteps, log_dir, historial_dir, informe_maestro_html, title, heading, n_envs=None,
+          vec_env_type="subproc", initial_balance=100000, model_path=MODEL_PATH, label="", seed=None,
+          report="background"):
+    """
+    Entrena el modelo compartido con `n_envs` mesas y guarda el historial de cada mesa.
+    El informe se genera según `report`: "background" (proceso aparte), "sync" o "none".
+    """
+    n_envs = n_envs or os.cpu_count()
+    os.makedirs(log_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    timestamp = time.strftime('%Y-%m-%d_%H-%M-%S')
+
+    env = make_roulette_vec_env(vec_env_type, n_envs, initial_balance, seed)
+    model = load_or_create_model(model_path, env, n_steps=max(1, 2048 // n_envs), label=label)
+
+    # PPO recoge rollouts completos, así que cada mesa juega un múltiplo de n_steps
+    rollouts = -(-total_timesteps // (model.n_steps * n_envs))
+    callback = RouletteHistoryCallback(n_envs, rollouts * model.n_steps, total_timesteps)
+
+    print(f"Iniciando el entrenamiento de la IA{label} para la ruleta con {total_timesteps} jugadas en {n_envs} mesas ({vec_env_type})...")
+    print(f"Los avances y el informe se registrarán en la carpeta '{log_dir}'")
+    total_start_time = time.time()
+    model.learn(total_timesteps=total_timesteps, reset_num_timesteps=False, callback=callback)
+    total_elapsed_time = time.time() - total_start_time
+    hours, remainder = divmod(total_elapsed_time, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    print("\n¡Entrenamiento completado!")
+    print(f"Tiempo total de ejecución: {int(hours)}h {int(minutes)}m {int(seconds)}s "
+          f"({callback.env_steps.sum() / total_elapsed_time:.0f} jugadas/s).")
+
+    model.save(model_path)
+    print(f"Modelo de IA actualizado y guardado en: {model_path}")
+    env.close()
+
+    recorders = callback.recorders
+    for i, recorder in enumerate(recorders):
+        recorder.save(historial_dir, f"{timestamp}_mesa{i + 1:02d}")
+    print(f"Historial de jugadas guardado en: {historial_dir}")
+
+    if report == "background":
+        worker_log = launch_report_worker(log_dir, historial_dir, timestamp, informe_maestro_html, title, heading, initial_balance)
+        print(f"El informe de la sesión se está generando en segundo plano (salida en {worker_log}).")
+    elif report == "sync":
+        generate_report(log_dir, historial_dir, timestamp, informe_maestro_html, title, heading, initial_balance)
+    return model
@@ -0,0 +1,116 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+
+from batch_vec_env import BatchVecEnv
+from roulette_env import PAYOUT_TABLE, HISTORY_FILE, SpinHistoryFile, build_payout_table
+
+NUM_NUMBERS = 37
+
+
+class RouletteVecEnv(BatchVecEnv):
+    """
+    N mesas de ruleta independientes simuladas a la vez con NumPy.
+
+    Cada mesa se comporta como un RouletteEnv: mismo espacio de acciones (una por apuesta),
+    misma observación (saldo + frecuencia de los 37 números en su historial) y misma
+    recompensa. Las tiradas de todas las mesas se sortean en una sola llamada a
+    `np_random.integers` y las recompensas salen de la tabla de pagos, sin bucles por mesa.
+    Las mesas que terminan se reinician automáticamente, como espera stable-baselines3.
+    """
+    env_arrays = ("balance", "current_step", "history", "number_counts")
+
+    def __init__(self, num_envs, initial_balance=100.0, history_size=10000,
+                 history_file=HISTORY_FILE, seed=None, bets=None):
+        self.render_mode = None
+        self.payout_table = PAYOUT_TABLE if bets is None else build_payout_table(bets)
+        self.num_bets = self.payout_table.shape[1]
+        self.initial_balance = initial_balance
+        self.history_size = history_size
+        self.max_steps = 1000000
+
+        observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(NUM_NUMBERS + 1,), dtype=np.float32)
+        action_space = spaces.MultiBinary(self.num_bets)
+        super().__init__(num_envs, observation_space, action_space)
+
+        self.np_random, _ = seeding.np_random(seed)
+        self._env_indices = np.arange(num_envs)
+
+        # Historial circular por mesa. Todas las mesas avanzan a la vez, así que
+        # la posición de escritura y la longitud son comunes.
+        # Las tiradas de todas las mesas se añaden al historial persistente, mesa a mesa
+        self.spin_history = SpinHistoryFile(history_file) if history_file is not None else None
+        if self.spin_history is not None:
+            initial_history = self.spin_history.tail(history_size)
+        else:
+            initial_history = np.zeros(0, dtype=np.uint8)
+        self.history = np.zeros((num_envs, history_size), dtype=np.uint8)
+        self.history[:, :len(initial_history)] = initial_history
+        self.history_len = len(initial_history)
+        self.history_pos = self.history_len % history_size
+        self.number_counts = np.tile(np.bincount(initial_history, minlength=NUM_NUMBERS).astype(np.int64), (num_envs, 1))
+
+        self.balance = np.full(num_envs, initial_balance, dtype=np.float64)
+        self.current_step = np.zeros(num_envs, dtype=np.int64)
+        self._actions = None
+
+    def _get_obs(self):
+        observation = np.empty((self.num_envs, NUM_NUMBERS + 1), dtype=np.float32)
+        observation[:, 0] = self.balance
+        observation[:, 1:] = self.number_counts
+        if self.history_len:
+            observation[:, 1:] /= self.history_len
+        return observation
+
+    def _record_results(self, results):
+        if self.history_len == self.history_size:
+            evicted = self.history[:, self.history_pos]
+            self.number_counts[self._env_indices, evicted] -= 1
+        else:
+            self.history_len += 1
+        self.history[:, self.history_pos] = results
+        self.history_pos = (self.history_pos + 1) % self.history_size
+        self.number_counts[self._env_indices, results] += 1
+        if self.spin_history is not None:
+            self.spin_history.append(results)
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.np_random, _ = seeding.np_random(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self.balance[:] = self.initial_balance
+        self.current_step[:] = 0
+        return self._get_obs()
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        active_bets = np.asarray(self._actions).reshape(self.num_envs, self.num_bets) != 0
+        self.current_step += 1
+
+        results = self.np_random.integers(0, NUM_NUMBERS, size=self.num_envs)
+        self._record_results(results)
+
+        rewards = np.einsum('ij,ij->i', active_bets, self.payout_table[results])
+        rewards[~active_bets.any(axis=1)] = -0.5
+        self.balance += rewards
+
+        dones = (self.balance <= 0) | (self.current_step >= self.max_steps)
+        observation = self._get_obs()
+        infos = [{'roulette_result': int(result)} for result in results]
+
+        for i in np.flatnonzero(dones):
+            infos[i]['terminal_observation'] = observation[i].copy()
+            infos[i]['TimeLimit.truncated'] = False
+        if dones.any():
+            self.balance[dones] = self.initial_balance
+            self.current_step[dones] = 0
+            observation[dones, 0] = self.initial_balance
+
+        return observation, rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        if self.spin_history is not None:
+            self.spin_history.flush()
@@ -3,10 +3,13 @@ import sys
 import os
 import time
 import random
-import json
 import traceback
 from ia_players import IA, IAD, IAA, IAJ, IAF, IAC, IAL, IAM, IAR
 from experience_logger import ExperienceLogger
+from ia_ratings import RatingTable
+from ia_state_store import IAStateStore
+from pong_core import PongMatch, WIDTH, HEIGHT, PALETA_WIDTH, FPS, LEFT_PADDLE_X, RIGHT_PADDLE_X
+from tournament_runner import create_ia, run_diablo_mode, run_rated_league, run_tournament
 
 # Mapeo de IA a colores
 IA_COLORS = {
@@ -20,19 +23,28 @@ IA_COLORS = {
     "IAR": (192, 192, 192)    # Plateado
 }
 
-def start_game(player1, player2, player1_name, player2_name, time_limit=60, consecutive_score_limit=1, point_score_limit=1, diablo_mode=False, diablo_round=0, diablo_points=0, diablo_victories=0, ball_speed=4, game_mode="default"):
+def start_game(player1, player2, player1_name, player2_name, time_limit=60, consecutive_score_limit=1, point_score_limit=1, diablo_mode=False, diablo_round=0, diablo_points=0, diablo_victories=0, ball_speed=4, game_mode="default", headless=False):
+    logger = ExperienceLogger()
+
+    match = PongMatch(player1, player2, player1_name, player2_name, time_limit=time_limit,
+                      consecutive_score_limit=consecutive_score_limit, point_score_limit=point_score_limit,
+                      diablo_mode=diablo_mode, ball_speed=ball_speed, logger=logger)
+
+    # Sin ventana la partida se simula de golpe, sin limitar los FPS
+    if headless:
+        result = match.run()
+        logger.close()
+        return result
+
     pygame.init()
     pygame.font.init()
 
     # Configuración de la pantalla
-    WIDTH, HEIGHT = 800, 600
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption(f"Pong - {player1_name} vs {player2_name}")
 
     # Colores y objetos del juego
     BLACK, WHITE = (0, 0, 0), (255, 255, 255)
-    PALETA_WIDTH = 15
-    BALL_SIZE = 15
     score_font = pygame.font.Font(None, 74)
     ui_font = pygame.font.Font(None, 36)
 
@@ -40,220 +52,40 @@ def start_game(player1, player2, player1_name, player2_name, time_limit=60, cons
     player1_color = IA_COLORS.get(player1_name, WHITE)
     player2_color = IA_COLORS.get(player2_name, WHITE)
 
-    # Creación de las instancias de IA
-    p1_is_multi_paddle = player1_name == "IAF"
-    p2_is_multi_paddle = player2_name == "IAF"
-    
-    p1_is_ial_or_iaa = player1_name in ["IAL", "IAA"]
-    p2_is_ial_or_iaa = player2_name in ["IAL", "IAA"]
-
-    if p1_is_multi_paddle:
-        player1_y = [i * (player1.paddle_height + 5) for i in range(5)]
-    else:
-        player1_y = HEIGHT // 2 - player1.paddle_height // 2
-    
-    if p2_is_multi_paddle:
-        player2_y = [i * (player2.paddle_height + 5) for i in range(5)]
-    else:
-        player2_y = HEIGHT // 2 - player2.paddle_height // 2
-
-    p1_display_name = f"{player1_name}1" if player1_name == player2_name else player1_name
-    p2_display_name = f"{player2_name}2" if player1_name == player2_name else player2_name
-    
     clock = pygame.time.Clock()
 
-    score_player1 = 0
-    score_player2 = 0
-    consecutive_score_player1 = 0
-    consecutive_score_player2 = 0
-    
-    start_time = time.time()
-    
-    initial_ball_speed_x = random.choice([ball_speed, -ball_speed])
-    initial_ball_speed_y = random.choice([ball_speed, -ball_speed])
-    balls = [{'x': WIDTH // 2, 'y': HEIGHT // 2, 'speed_x': initial_ball_speed_x, 'speed_y': initial_ball_speed_y, 'size': BALL_SIZE}]
-    
-    logger = ExperienceLogger(filename="game_log.json")
-    logger.log_data = []
-    
     running = True
     while running:
-        elapsed_time = time.time() - start_time
-        
-        if elapsed_time >= time_limit:
-            print("¡Juego terminado por limite de tiempo!")
-            
-            if score_player1 > score_player2:
-                winner = player1_name
-            elif score_player2 > score_player1:
-                winner = player2_name
-            else:
-                winner = "Empate"
-            
-            if isinstance(player1, IA): logger.log(p1_display_name.lower(), player1.get_experience(final_score=1 if score_player1 > score_player2 else -1 if score_player2 > score_player1 else 0))
-            if isinstance(player2, IA): logger.log(p2_display_name.lower(), player2.get_experience(final_score=1 if score_player2 > score_player1 else -1 if score_player1 > score_player2 else 0))
-            logger.save_log()
-            
-            running = False
-            return winner, score_player1, score_player2
-
-        time_left = time_limit - elapsed_time
+        time_left = match.time_left
         time_text = score_font.render(f"{int(time_left/60):02}:{int(time_left%60):02}", True, WHITE)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+                logger.close()
                 return None, 0, 0
-        
-        # Corregido: Logica de movimiento para IAL e IAA
-        if isinstance(player1, IA):
-            if p1_is_multi_paddle:
-                movement = player1.move(balls[0]['y'], player1_y)
-                player1_y = [player1_y[i] + movement[i] for i in range(len(player1_y))]
-            elif p1_is_ial_or_iaa:
-                player1_y += player1.move(balls[0]['y'], player1_y, balls[0]['x'], balls[0]['speed_x'], balls[0]['speed_y'])
-            else:
-                player1_y += player1.move(balls[0]['y'], player1_y)
-        
-        if isinstance(player2, IA):
-            if p2_is_multi_paddle:
-                movement = player2.move(balls[0]['y'], player2_y)
-                player2_y = [player2_y[i] + movement[i] for i in range(len(player2_y))]
-            elif p2_is_ial_or_iaa:
-                player2_y += player2.move(balls[0]['y'], player2_y, balls[0]['x'], balls[0]['speed_x'], balls[0]['speed_y'])
-            else:
-                player2_y += player2.move(balls[0]['y'], player2_y)
-
-        if p1_is_multi_paddle:
-            for i in range(len(player1_y)):
-                player1_y[i] = max(0, min(HEIGHT - player1.paddle_height, player1_y[i]))
-        else:
-            if isinstance(player1, IA):
-                player1_y = max(0, min(HEIGHT - player1.paddle_height, player1_y))
 
-        if p2_is_multi_paddle:
-            for i in range(len(player2_y)):
-                player2_y[i] = max(0, min(HEIGHT - player2.paddle_height, player2_y[i]))
-        else:
-            if isinstance(player2, IA):
-                player2_y = max(0, min(HEIGHT - player2.paddle_height, player2_y))
-        
-        balls_to_remove = []
-        new_balls = []
-        for ball in balls:
-            ball['x'] += ball['speed_x']
-            ball['y'] += ball['speed_y']
-            
-            if ball['y'] <= 0 or ball['y'] >= HEIGHT - ball['size']:
-                ball['speed_y'] *= -1
-                
-            p1_collision = False
-            if p1_is_multi_paddle:
-                for y in player1_y:
-                    if pygame.Rect(10, y, PALETA_WIDTH, player1.paddle_height).colliderect(pygame.Rect(ball['x'], ball['y'], ball['size'], ball['size'])):
-                        p1_collision = True
-                        ball['speed_x'] *= -1
-                        ball['x'] = 10 + PALETA_WIDTH # Reposiciona la pelota
-                        break
-            else:
-                if pygame.Rect(10, player1_y, PALETA_WIDTH, player1.paddle_height).colliderect(pygame.Rect(ball['x'], ball['y'], ball['size'], ball['size'])):
-                    p1_collision = True
-                    ball['speed_x'] *= -1
-                    ball['x'] = 10 + PALETA_WIDTH # Reposiciona la pelota
-                    if player1_name == "IAJ" and len(balls) < 5:
-                        new_balls.append({'x': WIDTH // 2, 'y': HEIGHT // 2, 'speed_x': ball_speed, 'speed_y': random.choice([ball_speed, -ball_speed]), 'size': BALL_SIZE})
-            
-            p2_collision = False
-            if p2_is_multi_paddle:
-                for y in player2_y:
-                    if pygame.Rect(WIDTH - 10 - PALETA_WIDTH, y, PALETA_WIDTH, player2.paddle_height).colliderect(pygame.Rect(ball['x'], ball['y'], ball['size'], ball['size'])):
-                        p2_collision = True
-                        ball['speed_x'] *= -1
-                        ball['x'] = WIDTH - 10 - PALETA_WIDTH - ball['size'] # Reposiciona la pelota
-                        break
-            else:
-                if pygame.Rect(WIDTH - 10 - PALETA_WIDTH, player2_y, PALETA_WIDTH, player2.paddle_height).colliderect(pygame.Rect(ball['x'], ball['y'], ball['size'], ball['size'])):
-                    p2_collision = True
-                    ball['speed_x'] *= -1
-                    ball['x'] = WIDTH - 10 - PALETA_WIDTH - ball['size'] # Reposiciona la pelota
-                    if player2_name == "IAJ" and len(balls) < 5:
-                        new_balls.append({'x': WIDTH // 2, 'y': HEIGHT // 2, 'speed_x': -ball_speed, 'speed_y': random.choice([ball_speed, -ball_speed]), 'size': BALL_SIZE})
-
-            if ball['x'] <= 0:
-                score_player2 += 1
-                consecutive_score_player2 += 1
-                consecutive_score_player1 = 0
-                balls_to_remove.append(ball)
-            elif ball['x'] >= WIDTH - ball['size']:
-                score_player1 += 1
-                consecutive_score_player1 += 1
-                consecutive_score_player2 = 0
-                balls_to_remove.append(ball)
-        
-        if balls_to_remove:
-            if isinstance(player1, IA): logger.log(p1_display_name.lower(), player1.get_experience(final_score=1 if score_player1 > score_player2 else -1 if score_player2 > score_player1 else 0))
-            if isinstance(player2, IA): logger.log(p2_display_name.lower(), player2.get_experience(final_score=1 if score_player2 > score_player1 else -1 if score_player1 > score_player2 else 0))
-            
-        for ball in balls_to_remove:
-            balls.remove(ball)
-            
-        balls.extend(new_balls)
-            
-        if not balls:
-            balls.append({'x': WIDTH // 2, 'y': HEIGHT // 2, 'speed_x': random.choice([ball_speed, -ball_speed]), 'speed_y': random.choice([ball_speed, -ball_speed]), 'size': BALL_SIZE})
-
-        if diablo_mode:
-            if score_player1 > 0 or score_player2 > 0:
-                winner = p1_display_name if score_player1 > 0 else p2_display_name
-                print(f"¡{winner} gana la partida!")
-                
-                final_score_p1 = 1 if winner == p1_display_name else -1
-                final_score_p2 = 1 if winner == p2_display_name else -1
-                
-                if isinstance(player1, IA): logger.log(p1_display_name.lower(), player1.get_experience(final_score_p1))
-                if isinstance(player2, IA): logger.log(p2_display_name.lower(), player2.get_experience(final_score_p2))
-                logger.save_log()
-                
-                return winner, score_player1, score_player2
-
-        if consecutive_score_player1 >= consecutive_score_limit or score_player1 >= point_score_limit:
-            winner = p1_display_name
-            print(f"¡{winner} gana la partida!")
-            
-            if isinstance(player1, IA): logger.log(p1_display_name.lower(), player1.get_experience(final_score=1))
-            if isinstance(player2, IA): logger.log(p2_display_name.lower(), player2.get_experience(final_score=-1))
-            logger.save_log()
-            
-            return winner, score_player1, score_player2
-        
-        if consecutive_score_player2 >= consecutive_score_limit or score_player2 >= point_score_limit:
-            winner = p2_display_name
-            print(f"¡{winner} gana la partida!")
-
-            if isinstance(player1, IA): logger.log(p1_display_name.lower(), player1.get_experience(final_score=-1))
-            if isinstance(player2, IA): logger.log(p2_display_name.lower(), player2.get_experience(final_score=1))
-            logger.save_log()
-            
-            return winner, score_player1, score_player2
+        if match.step():
+            logger.close()
+            return match.result
 
         screen.fill(BLACK)
-        if p1_is_multi_paddle:
-            for y in player1_y:
-                pygame.draw.rect(screen, player1_color, pygame.Rect(10, y, PALETA_WIDTH, player1.paddle_height))
+        if match.p1_is_multi_paddle:
+            for y in match.player1_y:
+                pygame.draw.rect(screen, player1_color, pygame.Rect(LEFT_PADDLE_X, y, PALETA_WIDTH, player1.paddle_height))
         else:
-            pygame.draw.rect(screen, player1_color, pygame.Rect(10, player1_y, PALETA_WIDTH, player1.paddle_height))
-        
-        if p2_is_multi_paddle:
-            for y in player2_y:
-                pygame.draw.rect(screen, player2_color, pygame.Rect(WIDTH - 10 - PALETA_WIDTH, y, PALETA_WIDTH, player2.paddle_height))
+            pygame.draw.rect(screen, player1_color, pygame.Rect(LEFT_PADDLE_X, match.player1_y, PALETA_WIDTH, player1.paddle_height))
+
+        if match.p2_is_multi_paddle:
+            for y in match.player2_y:
+                pygame.draw.rect(screen, player2_color, pygame.Rect(RIGHT_PADDLE_X, y, PALETA_WIDTH, player2.paddle_height))
         else:
-            pygame.draw.rect(screen, player2_color, pygame.Rect(WIDTH - 10 - PALETA_WIDTH, player2_y, PALETA_WIDTH, player2.paddle_height))
-            
+            pygame.draw.rect(screen, player2_color, pygame.Rect(RIGHT_PADDLE_X, match.player2_y, PALETA_WIDTH, player2.paddle_height))
 
-        for ball in balls:
-            pygame.draw.ellipse(screen, WHITE, pygame.Rect(ball['x'], ball['y'], ball['size'], ball['size']))
-            
-        score_text = score_font.render(f"{score_player1} - {score_player2}", True, WHITE)
+        for (ball_x, ball_y), size in zip(match.ball_pos.tolist(), match.ball_size.tolist()):
+            pygame.draw.ellipse(screen, WHITE, pygame.Rect(ball_x, ball_y, size, size))
+
+        score_text = score_font.render(f"{match.score_player1} - {match.score_player2}", True, WHITE)
         screen.blit(score_text, (WIDTH/2 - score_text.get_width()/2, 10))
         screen.blit(time_text, (WIDTH/2 - time_text.get_width()/2, 50)) 
 
@@ -279,20 +111,21 @@ def start_game(player1, player2, player1_name, player2_name, time_limit=60, cons
         # --- FIN DEL CÓDIGO ACTUALIZADO ---
 
         pygame.display.flip()
-        clock.tick(60)
+        clock.tick(FPS)
 
     pygame.quit()
-    logger.save_log()
+    logger.close()
     
-    return "Empate", score_player1, score_player2
+    return "Empate", match.score_player1, match.score_player2
 
-def generate_tournament_report(ia_players, tournament_victories, total_time):
+def generate_tournament_report(ia_players, tournament_victories, total_time, ratings=None,
+                               filename="informe_torneo.txt", title="INFORME FINAL DEL TORNEO"):
     """
     Genera un informe completo del torneo en un archivo de texto.
     """
-    with open("informe_torneo.txt", "w") as f:
+    with open(filename, "w") as f:
         f.write("========================================\n")
-        f.write("          INFORME FINAL DEL TORNEO\n")
+        f.write(f"          {title}\n")
         f.write("========================================\n\n")
         
         f.write(f"Tiempo total del torneo: {int(total_time/60):02}:{int(total_time%60):02} minutos\n\n")
@@ -316,7 +149,12 @@ def generate_tournament_report(ia_players, tournament_victories, total_time):
             f.write(f"> {name}: {ia_obj.state.get('sentimiento', 'neutral')}\n")
         f.write("\n")
 
-def generate_diablo_report(diablo_points, diablo_victories, winner_name, ia_players, final_round, total_time):
+        if ratings is not None:
+            f.write("--- Ratings (Elo / Glicko-2) ---\n")
+            f.writelines(ratings.report_lines())
+            f.write("\n")
+
+def generate_diablo_report(diablo_points, diablo_victories, winner_name, ia_players, final_round, total_time, ratings=None):
     """
     Genera un informe del Modo Diablo.
     """
@@ -354,45 +192,35 @@ def generate_diablo_report(diablo_points, diablo_victories, winner_name, ia_play
             f.write(f"> {name}: {ia_obj.state.get('sentimiento', 'neutral')}\n")
         f.write("\n")
 
-def save_ia_state(ia_players):
+        if ratings is not None:
+            f.write("--- Ratings (Elo / Glicko-2) ---\n")
+            f.writelines(ratings.report_lines())
+            f.write("\n")
+
+def save_ratings(ratings, ia_players, state_store):
     """
-    Guarda el estado actual de las IA en un archivo JSON.
+    Aplica los resultados pendientes y guarda los ratings en el estado de las IA.
     """
-    state_to_save = {}
-    for name, ia_obj in ia_players.items():
-        ia_obj_experience = ia_obj.get_experience(0)
-        state_to_save[name] = ia_obj_experience.get("state", {})
+    ratings.end_period(ia_players)
+    state_store.mark_dirty()
 
-    with open("ia_state.json", "w") as f:
-        json.dump(state_to_save, f, indent=4)
-        print("Estado de las IA guardado en ia_state.json")
-
-def load_ia_state():
+def save_ia_state(state_store):
     """
-    Carga el estado de las IA desde un archivo JSON si existe.
+    Guarda el estado de las IA que haya cambiado desde la última escritura.
     """
-    if os.path.exists("ia_state.json"):
-        with open("ia_state.json", "r") as f:
-            return json.load(f)
-    return {}
-    
+    state_store.flush()
+    print(f"Estado de las IA guardado en {state_store.path}")
+
 def create_ia_players_from_state(ia_states):
     """
     Crea las instancias de IA a partir de los datos guardados.
     """
-    player_map = {"IAD": IAD, "IAA": IAA, "IAJ": IAJ, "IAF": IAF, "IAC": IAC, "IAL": IAL, "IAM": IAM, "IAR": IAR}
     ia_players = {}
-    for name in player_map:
-        if name in ia_states:
-            if name == "IAF":
-                ia_players[name] = player_map[name](600, initial_state=ia_states[name])
-            else:
-                ia_players[name] = player_map[name](600, 100, initial_state=ia_states[name])
-        else:
-            ia_players[name] = player_map[name](600, 100) if name != "IAF" else player_map[name](600)
+    for name in ["IAD", "IAA", "IAJ", "IAF", "IAC", "IAL", "IAM", "IAR"]:
+        ia_players[name] = create_ia(name, ia_states.get(name))
     return ia_players
 
-def start_tournament(ia_players):
+def start_tournament(ia_players, state_store, ratings):
     rival_options = ["IAD", "IAA", "IAJ", "IAF", "IAC", "IAL", "IAM", "IAR"]
     tournament_victories = {name: 0 for name in rival_options}
     tournament_winner = None
@@ -423,7 +251,8 @@ def start_tournament(ia_players):
 
             winner, _, _ = start_game(champion, challenger, champion_name, challenger_name, time_limit=60, consecutive_score_limit=2, point_score_limit=5)
             
-            save_ia_state(ia_players)
+            ratings.record(champion_name, challenger_name, winner)
+            state_store.mark_dirty(champion_name, challenger_name)
             
             if winner == champion_name:
                 tournament_victories[champion_name] += 1
@@ -436,6 +265,11 @@ def start_tournament(ia_players):
                 break
             else: # Empate
                 print("La partida ha terminado en un empate. El campeon se mantiene.")
+
+        # Cada ronda de retadores (hasta que cae el campeón o los vence a todos) es un
+        # periodo de rating, como los lotes de start_tournament_parallel
+        ratings.end_period(ia_players)
+        state_store.mark_dirty()
         
         if all_challengers_defeated:
              if tournament_victories[champion_name] >= len(rival_options) - 1:
@@ -451,10 +285,11 @@ def start_tournament(ia_players):
         ia_players[ia_name].final_iq = ia_players[ia_name].get_iq()
         
     print("\n¡Torneo completado!")
-    generate_tournament_report(ia_players, tournament_victories, total_tournament_time)
-    save_ia_state(ia_players)
+    save_ratings(ratings, ia_players, state_store)
+    generate_tournament_report(ia_players, tournament_victories, total_tournament_time, ratings)
+    save_ia_state(state_store)
 
-def start_diablo_mode(ia_players):
+def start_diablo_mode(ia_players, state_store, ratings):
     rival_options = ["IAD", "IAA", "IAJ", "IAF", "IAC", "IAL", "IAM", "IAR"]
     diablo_points = {name: 0 for name in rival_options}
     diablo_victories = {name: 0 for name in rival_options}
@@ -499,7 +334,8 @@ def start_diablo_mode(ia_players):
                                       diablo_mode=True, diablo_round=round_num, diablo_points=diablo_points, diablo_victories=diablo_victories,
                                       ball_speed=current_ball_speed)
             
-            save_ia_state(ia_players)
+            state_store.mark_dirty(player1_name, player2_name)
+            ratings.record(player1_name, player2_name, winner)
             
             if winner and winner != "Empate":
                 diablo_points[winner] += 3
@@ -517,6 +353,10 @@ def start_diablo_mode(ia_players):
                     print(f"🎉 ¡La {diablo_winner} gana el Modo Diablo con 10 victorias! 🎉")
                     break
 
+        # Cada ronda es un periodo de rating
+        ratings.end_period(ia_players)
+        state_store.mark_dirty()
+
     if not diablo_winner:
         final_ranking = sorted(diablo_points.items(), key=lambda item: item[1], reverse=True)
         top_score = final_ranking[0][1]
@@ -536,30 +376,108 @@ def start_diablo_mode(ia_players):
         ia_players[ia_name].final_iq = ia_players[ia_name].get_iq()
 
     print("\n¡Modo Diablo completado!")
-    generate_diablo_report(diablo_points, diablo_victories, diablo_winner, ia_players, round_num, total_diablo_time)
-    save_ia_state(ia_players)
+    save_ratings(ratings, ia_players, state_store)
+    generate_diablo_report(diablo_points, diablo_victories, diablo_winner, ia_players, round_num, total_diablo_time, ratings)
+    save_ia_state(state_store)
+
+def start_tournament_parallel(ia_players, state_store, ratings):
+    """
+    Torneo sin ventana con las partidas repartidas entre todos los núcleos.
+    """
+    for ia_name in ia_players:
+        ia_players[ia_name].initial_iq = ia_players[ia_name].get_iq()
+
+    logger = ExperienceLogger()
+    tournament_victories, _, total_tournament_time = run_tournament(
+        ia_players, logger=logger, on_batch_end=state_store.mark_dirty, ratings=ratings)
+
+    for ia_name in ia_players:
+        ia_players[ia_name].final_iq = ia_players[ia_name].get_iq()
+
+    print("\n¡Torneo completado!")
+    logger.close()
+    save_ratings(ratings, ia_players, state_store)
+    generate_tournament_report(ia_players, tournament_victories, total_tournament_time, ratings)
+    save_ia_state(state_store)
+
+def start_diablo_mode_parallel(ia_players, state_store, ratings):
+    """
+    Modo Diablo sin ventana con las partidas de cada ronda repartidas entre todos los núcleos.
+    """
+    for ia_name in ia_players:
+        ia_players[ia_name].initial_iq = ia_players[ia_name].get_iq()
+
+    logger = ExperienceLogger()
+    diablo_points, diablo_victories, diablo_winner, final_round, total_diablo_time = run_diablo_mode(
+        ia_players, logger=logger, on_round_end=state_store.mark_dirty, ratings=ratings)
+
+    for ia_name in ia_players:
+        ia_players[ia_name].final_iq = ia_players[ia_name].get_iq()
+
+    print("\n¡Modo Diablo completado!")
+    logger.close()
+    save_ratings(ratings, ia_players, state_store)
+    generate_diablo_report(diablo_points, diablo_victories, diablo_winner, ia_players, final_round, total_diablo_time, ratings)
+    save_ia_state(state_store)
+
+def start_rated_league_parallel(ia_players, state_store, ratings):
+    """
+    Liga sin ventana con emparejamientos por cercanía de rating, en paralelo.
+    """
+    for ia_name in ia_players:
+        ia_players[ia_name].initial_iq = ia_players[ia_name].get_iq()
+
+    logger = ExperienceLogger()
+    league_victories, total_league_time = run_rated_league(
+        ia_players, ratings, logger=logger, on_round_end=state_store.mark_dirty)
+
+    for ia_name in ia_players:
+        ia_players[ia_name].final_iq = ia_players[ia_name].get_iq()
+
+    print("\n¡Liga completada!")
+    print("".join(ratings.report_lines()))
+    logger.close()
+    save_ratings(ratings, ia_players, state_store)
+    generate_tournament_report(ia_players, league_victories, total_league_time, ratings,
+                               filename="informe_liga.txt", title="INFORME FINAL DE LA LIGA")
+    save_ia_state(state_store)
 
 # --- Interfaz de seleccion de rivales y manejo de errores ---
 if __name__ == "__main__":
+    state_store = IAStateStore("ia_state.json")
     try:
         rival_options = ["IAD", "IAA", "IAJ", "IAF", "IAC", "IAL", "IAM", "IAR"]
         
         print("Selecciona un modo de juego:")
         print(f"1. Torneo")
         print(f"2. Modo Diablo")
+        print(f"3. Torneo rapido (sin ventana, en paralelo)")
+        print(f"4. Modo Diablo rapido (sin ventana, en paralelo)")
+        print(f"5. Liga por rating (sin ventana, en paralelo)")
         
-        ia_states = load_ia_state()
+        ia_states = state_store.load()
         ia_players = create_ia_players_from_state(ia_states)
+        state_store.attach(ia_players)
+        ratings = RatingTable.from_players(ia_players)
         
         while True:
             try:
                 choice = int(input("Introduce el numero de tu opcion: "))
                 
                 if choice == 1:
-                    start_tournament(ia_players)
+                    start_tournament(ia_players, state_store, ratings)
                     break
                 elif choice == 2:
-                    start_diablo_mode(ia_players)
+                    start_diablo_mode(ia_players, state_store, ratings)
+                    break
+                elif choice == 3:
+                    start_tournament_parallel(ia_players, state_store, ratings)
+                    break
+                elif choice == 4:
+                    start_diablo_mode_parallel(ia_players, state_store, ratings)
+                    break
+                elif choice == 5:
+                    start_rated_league_parallel(ia_players, state_store, ratings)
                     break
                 else:
                     print("Opcion no valida. Intentalo de nuevo.")
@@ -577,4 +495,7 @@ if __name__ == "__main__":
             f.write("--- Traceback ---\n")
             f.write(traceback.format_exc())
         
-        print("\n¡Ha ocurrido un error inesperado! Se ha generado un archivo 'errorespong.txt' con los detalles.")
\ No newline at end of file
+        print("\n¡Ha ocurrido un error inesperado! Se ha generado un archivo 'errorespong.txt' con los detalles.")
+    finally:
+        # Se guarda lo que quede pendiente, también si ha habido un error
+        state_store.close()
\ No newline at end of file
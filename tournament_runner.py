@@ -0,0 +1,265 @@
+import random
+import time
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+from ia_players import IAD, IAA, IAJ, IAF, IAC, IAL, IAM, IAR
+from pong_core import PongMatch
+
+# Torneos y Modo Diablo sin ventana, repartiendo las partidas entre varios procesos.
+#
+# Las partidas independientes (todas las de una ronda del Modo Diablo, o todos los
+# retos a un mismo campeón en el torneo) se juegan en paralelo, cada una con su propia
+# semilla, a partir de una copia del estado de las IA al empezar el lote. Después los
+# resultados se procesan en el orden en que se habrían jugado: los cambios de estado de
+# cada partida se suman al estado maestro en ese orden y, si el lote termina antes (un
+# campeón derrotado o una IA que llega a 10 victorias), los resultados posteriores se
+# descartan. Con la misma semilla, el resultado es siempre el mismo. Si se pasa una
+# RatingTable, cada resultado aplicado se apunta en ella y al final de cada lote (un
+# periodo de rating) se actualiza y se copia al estado de las IA, antes de on_round_end
+# / on_batch_end.
+
+RIVAL_OPTIONS = ["IAD", "IAA", "IAJ", "IAF", "IAC", "IAL", "IAM", "IAR"]
+PLAYER_MAP = {"IAD": IAD, "IAA": IAA, "IAJ": IAJ, "IAF": IAF, "IAC": IAC, "IAL": IAL, "IAM": IAM, "IAR": IAR}
+
+
+def create_ia(name, state=None):
+    """
+    Crea una IA por su nombre, con su estado guardado si lo hay.
+    """
+    if name == "IAF":
+        return PLAYER_MAP[name](600, initial_state=state)
+    return PLAYER_MAP[name](600, 100, initial_state=state)
+
+
+class MatchRecorder:
+    """
+    Sustituto de ExperienceLogger dentro de los procesos: guarda los registros en memoria
+    para devolverlos al proceso principal.
+    """
+    def __init__(self):
+        self.records = []
+
+    def log(self, ia_name, experience_data):
+        self.records.append((ia_name, experience_data))
+
+    def save_log(self):
+        pass
+
+
+def _play_match(task):
+    player1_name, player2_name, state1, state2, match_kwargs, seed = task
+    random.seed(seed)
+    player1 = create_ia(player1_name, state1)
+    player2 = create_ia(player2_name, state2)
+    recorder = MatchRecorder()
+    match = PongMatch(player1, player2, player1_name, player2_name, logger=recorder, verbose=False, **match_kwargs)
+    winner, score1, score2 = match.run()
+    return winner, score1, score2, player1.state.to_dict(), player2.state.to_dict(), recorder.records
+
+
+def _merge_state(ia_obj, before, after):
+    """
+    Suma al estado de la IA los cambios que hizo una partida (de `before` a `after`).
+    """
+    for key, value in after.items():
+        if key == "iq":
+            # Se recalcula a partir de los rasgos sumados
+            continue
+        previous = before.get(key)
+        if isinstance(value, (int, float)) and isinstance(previous, (int, float)) and not isinstance(value, bool):
+            ia_obj.state[key] = ia_obj.state.get(key, previous) + (value - previous)
+        elif value != previous:
+            ia_obj.state[key] = value
+
+
+class ParallelRunner:
+    """
+    Reparte lotes de partidas sin ventana en un pool de procesos.
+    """
+    def __init__(self, ia_players, workers=None, seed=0, logger=None, ratings=None):
+        self.ia_players = ia_players
+        self.workers = workers or cpu_count()
+        self.rng = random.Random(seed)
+        self.logger = logger
+        self.ratings = ratings
+        self.pool = None
+
+    def __enter__(self):
+        self.pool = Pool(self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.close()
+        self.pool.join()
+
+    def play_batch(self, pairings, match_kwargs):
+        """
+        Juega en paralelo una lista de emparejamientos a partir del estado actual de las
+        IA. Devuelve un iterador que aplica cada resultado al estado maestro en orden;
+        si se deja de consumir, los resultados restantes no se aplican.
+        """
+        snapshots = {name: ia_obj.state.to_dict() for name, ia_obj in self.ia_players.items()}
+        tasks = [(p1, p2, snapshots[p1], snapshots[p2], match_kwargs, self.rng.getrandbits(32)) for p1, p2 in pairings]
+        results = self.pool.map(_play_match, tasks)
+
+        for (p1, p2), (winner, score1, score2, state1, state2, records) in zip(pairings, results):
+            _merge_state(self.ia_players[p1], snapshots[p1], state1)
+            _merge_state(self.ia_players[p2], snapshots[p2], state2)
+            if self.logger is not None:
+                for ia_name, experience in records:
+                    self.logger.log(ia_name, experience)
+            if self.ratings is not None:
+                self.ratings.record(p1, p2, winner)
+            yield p1, p2, winner, score1, score2
+
+    def end_period(self):
+        if self.ratings is not None:
+            self.ratings.end_period(self.ia_players)
+
+
+def run_diablo_mode(ia_players, workers=None, seed=0, logger=None, on_round_end=None, ratings=None):
+    """
+    Modo Diablo sin ventana: 20 rondas de todos contra todos, con las partidas de cada
+    ronda en paralelo. Devuelve (puntos, victorias, ganador, ronda final, tiempo total).
+    """
+    diablo_points = {name: 0 for name in RIVAL_OPTIONS}
+    diablo_victories = {name: 0 for name in RIVAL_OPTIONS}
+    diablo_winner = None
+
+    initial_time_limit = 30
+    initial_ball_speed = 5
+
+    match_list = []
+    for i in range(len(RIVAL_OPTIONS)):
+        for j in range(i + 1, len(RIVAL_OPTIONS)):
+            match_list.append((RIVAL_OPTIONS[i], RIVAL_OPTIONS[j]))
+
+    diablo_mode_start_time = time.time()
+
+    with ParallelRunner(ia_players, workers, seed, logger, ratings) as runner:
+        for round_num in range(1, 21):
+            if diablo_winner:
+                break
+
+            current_time_limit = max(5, initial_time_limit - (round_num - 1))
+            current_ball_speed = initial_ball_speed + (round_num - 1)
+
+            print(f"\n--- RONDA {round_num}/20 ---")
+            print(f"Tiempo de la partida: {current_time_limit} segundos | Velocidad de la bola: {current_ball_speed}")
+            runner.rng.shuffle(match_list)
+
+            match_kwargs = {"time_limit": current_time_limit, "consecutive_score_limit": 1, "point_score_limit": 1,
+                            "diablo_mode": True, "ball_speed": current_ball_speed}
+            for player1_name, player2_name, winner, _, _ in runner.play_batch(match_list, match_kwargs):
+                if winner and winner != "Empate":
+                    diablo_points[winner] += 3
+                    diablo_victories[winner] += 1
+                    print(f"{player1_name} vs {player2_name}: gana {winner}")
+                else:
+                    diablo_points[player1_name] += 1
+                    diablo_points[player2_name] += 1
+                    print(f"{player1_name} vs {player2_name}: empate")
+
+                for ia_name, victories in diablo_victories.items():
+                    if victories >= 10:
+                        diablo_winner = ia_name
+                        print(f"🎉 ¡La {diablo_winner} gana el Modo Diablo con 10 victorias! 🎉")
+                        break
+                if diablo_winner:
+                    break
+
+            runner.end_period()
+            if on_round_end is not None:
+                on_round_end()
+
+    if not diablo_winner:
+        final_ranking = sorted(diablo_points.items(), key=lambda item: item[1], reverse=True)
+        top_score = final_ranking[0][1]
+        winners = [name for name, score in final_ranking if score == top_score]
+
+        if len(winners) > 1:
+            diablo_winner = f"Empate entre: {', '.join(winners)}"
+        else:
+            diablo_winner = winners[0]
+
+        print(f"🎉 ¡{diablo_winner} gana el Modo Diablo despues de 20 rondas! 🎉")
+
+    total_diablo_time = time.time() - diablo_mode_start_time
+    return diablo_points, diablo_victories, diablo_winner, round_num, total_diablo_time
+
+
+def run_tournament(ia_players, workers=None, seed=0, logger=None, on_batch_end=None, ratings=None):
+    """
+    Torneo de campeón contra retadores sin ventana. Los retos al campeón actual se
+    juegan en paralelo y se aplican en orden hasta la primera derrota del campeón.
+    Devuelve (victorias, ganador, tiempo total).
+    """
+    tournament_victories = {name: 0 for name in RIVAL_OPTIONS}
+    tournament_winner = None
+    tournament_start_time = time.time()
+    match_kwargs = {"time_limit": 60, "consecutive_score_limit": 2, "point_score_limit": 5}
+
+    with ParallelRunner(ia_players, workers, seed, logger, ratings) as runner:
+        champion_name = runner.rng.choice(RIVAL_OPTIONS)
+        print(f"El campeon inicial es: {champion_name}")
+
+        while not tournament_winner:
+            print(f"\n--- CAMPEON: {champion_name} ({tournament_victories[champion_name]} victorias) ---")
+            challengers = [name for name in RIVAL_OPTIONS if name != champion_name]
+            pairings = [(champion_name, challenger_name) for challenger_name in challengers]
+
+            new_champion = None
+            for _, challenger_name, winner, _, _ in runner.play_batch(pairings, match_kwargs):
+                if winner == champion_name:
+                    tournament_victories[champion_name] += 1
+                    print(f"¡El campeon {champion_name} defiende su titulo ante {challenger_name}! Victorias: {tournament_victories[champion_name]}")
+                    if tournament_victories[champion_name] >= len(RIVAL_OPTIONS) - 1:
+                        break
+                elif winner == challenger_name:
+                    print(f"¡El retador {challenger_name} ha derrotado al campeon {champion_name}!")
+                    tournament_victories[challenger_name] += 1
+                    new_champion = challenger_name
+                    break
+                else:
+                    print(f"{champion_name} vs {challenger_name}: empate. El campeon se mantiene.")
+
+            if new_champion:
+                champion_name = new_champion
+            elif tournament_victories[champion_name] >= len(RIVAL_OPTIONS) - 1:
+                tournament_winner = champion_name
+                print(f"🎉 ¡{tournament_winner} gana el torneo derrotando a todos los rivales! 🎉")
+
+            runner.end_period()
+            if on_batch_end is not None:
+                on_batch_end()
+
+    return tournament_victories, tournament_winner, time.time() - tournament_start_time
+
+
+def run_rated_league(ia_players, ratings, rounds=20, draws_per_round=4, workers=None, seed=0, logger=None, on_round_end=None):
+    """
+    Liga sin ventana emparejada por rating: en cada ronda se sortean `draws_per_round`
+    emparejamientos por cercanía de rating Glicko-2, se juegan en paralelo y los
+    resultados se aplican como un periodo de rating. Devuelve (victorias, tiempo total).
+    """
+    league_victories = {name: 0 for name in ia_players}
+    rng = np.random.default_rng(seed)
+    match_kwargs = {"time_limit": 60, "consecutive_score_limit": 2, "point_score_limit": 5}
+    league_start_time = time.time()
+
+    with ParallelRunner(ia_players, workers, seed, logger, ratings) as runner:
+        for round_num in range(1, rounds + 1):
+            pairings = [pair for _ in range(draws_per_round) for pair in ratings.proximity_pairings(rng)]
+            print(f"\n--- RONDA {round_num}/{rounds} ({len(pairings)} partidas) ---")
+            for _, _, winner, _, _ in runner.play_batch(pairings, match_kwargs):
+                if winner in league_victories:
+                    league_victories[winner] += 1
+            runner.end_period()
+            leader = ratings.names[ratings.ranking()[0]]
+            print(f"Lider: {leader} (Glicko-2 {ratings.glicko_rating[ratings.index[leader]]:.0f})")
+            if on_round_end is not None:
+                on_round_end()
+
+    return league_victories, time.time() - league_start_time
@@ -1,41 +1,25 @@
-import gymnasium as gym
 from stable_baselines3 import DQN
-from stable_baselines3.common.env_util import make_vec_env
 import os
 
 # Importar tu entorno personalizado de Cuatro en Raya
-from connect_four_env import ConnectFourEnv
-
-# --- Configuración del entorno ---
-ROWS = 6
-COLS = 7
-
-# Registrar el entorno con Gymnasium.
-try:
-    gym.register(
-        id="ConnectFour-v0",
-        entry_point="connect_four_env:ConnectFourEnv",
-        max_episode_steps=ROWS * COLS,
-        reward_threshold=10.0,
-        nondeterministic=False,
-    )
-except gym.error.AlreadyRegistered:
-    pass
+from connect_four_vec_env import ConnectFourVecEnv
 
 # --- Configuración del entrenamiento ---
 log_dir = "./connect_four_dqn_logs/"
 os.makedirs(log_dir, exist_ok=True)
 
-env_id = "ConnectFour-v0"
+# Pasos totales, contando cada tablero: con 256 tableros son unos 7.800 pasos del entorno
+# vectorizado.
+total_timesteps = 2000000
 
-# Vamos a entrenar por 50,000 pasos.
-total_timesteps = 50000
+# Número de tableros que se juegan a la vez en el mismo proceso (64-1024).
+n_envs = 256
 
-print(f"Preparando el entrenamiento para el entorno: {env_id}")
+print(f"Preparando el entrenamiento de Cuatro en Raya con {n_envs} tableros en paralelo")
 print(f"Los logs y modelos se guardarán en: {log_dir}")
 
-# 1. Crear el entorno
-vec_env = make_vec_env(env_id, n_envs=1, seed=0)
+# 1. Crear el entorno: todos los tableros avanzan juntos en un único step de NumPy
+vec_env = ConnectFourVecEnv(n_envs)
 
 # 2. Definir el modelo DQN
 model = DQN(
@@ -43,7 +27,11 @@ model = DQN(
     vec_env, 
     verbose=1, 
     learning_rate=0.0005, 
-    buffer_size=10000, 
+    buffer_size=200000, 
+    # Cada paso del entorno aporta n_envs transiciones: se entrena en todos los pasos y
+    # con más actualizaciones cuantos más tableros haya
+    train_freq=1,
+    gradient_steps=max(1, n_envs // 64),
     tensorboard_log=log_dir
 )
 
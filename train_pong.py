@@ -0,0 +1,40 @@
+import argparse
+import os
+
+from stable_baselines3 import DQN, PPO
+from stable_baselines3.common.vec_env import VecMonitor
+
+from pong_vec_env import PongVecEnv
+from tournament_runner import RIVAL_OPTIONS
+
+# Entrena un agente de Pong contra una de las IA de ia_players con stable-baselines3.
+# Todas las partidas avanzan juntas en un único PongVecEnv, sin procesos ni pantalla.
+
+log_dir = "./pong_logs/"
+total_timesteps = 1000000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrenamiento de un agente de Pong contra las IA")
+    parser.add_argument("--opponent", choices=RIVAL_OPTIONS, default="IAL", help="IA rival")
+    parser.add_argument("--algo", choices=("ppo", "dqn"), default="ppo", help="Algoritmo de stable-baselines3")
+    parser.add_argument("--envs", type=int, default=256, help="Partidas en paralelo")
+    parser.add_argument("--frame-skip", type=int, default=4, help="Fotogramas por acción")
+    parser.add_argument("--steps", type=int, default=total_timesteps, help="Pasos totales")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla")
+    args = parser.parse_args()
+
+    os.makedirs(log_dir, exist_ok=True)
+    # VecMonitor lleva la cuenta de recompensa y duración de cada partida (ep_rew_mean, ep_len_mean)
+    vec_env = VecMonitor(PongVecEnv(args.envs, opponent=args.opponent, frame_skip=args.frame_skip, seed=args.seed))
+    if args.algo == "ppo":
+        model = PPO("MlpPolicy", vec_env, verbose=1, n_steps=128, batch_size=4096, seed=args.seed, tensorboard_log=log_dir)
+    else:
+        model = DQN("MlpPolicy", vec_env, verbose=1, learning_rate=0.0005, buffer_size=100000, train_freq=1,
+                    gradient_steps=max(1, args.envs // 64), seed=args.seed, tensorboard_log=log_dir)
+
+    print(f"Entrenando {args.algo.upper()} contra {args.opponent} con {args.envs} partidas en paralelo...")
+    model.learn(total_timesteps=args.steps)
+
+    model_path = f"{log_dir}pong_{args.algo}_{args.opponent}"
+    model.save(model_path)
+    print(f"Modelo guardado en {model_path}.zip")